@@ -8,7 +8,20 @@ a = Analysis(
         ('gito/config.toml', 'gito'),
         ('gito/tpl', 'gito/tpl'),
     ],
-    hiddenimports=['tiktoken_ext.openai_public', 'tiktoken_ext'],
+    hiddenimports=[
+        'tiktoken_ext.openai_public',
+        'tiktoken_ext',
+        # CLI command modules are imported on demand (see gito.cli_base.LAZY_COMMANDS)
+        'gito.commands.deploy',
+        'gito.commands.fix',
+        'gito.commands.gh_post_review_comment',
+        'gito.commands.gh_react_to_comment',
+        'gito.commands.gitlab_post_review_comment',
+        'gito.commands.repl',
+        'gito.commands.review_batch',
+        'gito.commands.serve',
+        'gito.commands.version',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,253 @@
+"""
+Batch review of many repositories / pull requests in a single process (`gito review-batch`).
+Reviews run concurrently in one event loop sharing the LLM scheduler,
+so the concurrency and rate limit budget is global and split fairly between repositories.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import tomllib
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import dataclass, field, asdict, fields
+from pathlib import Path
+
+from git import Repo
+from microcore import ui
+
+from .cli_base import args_to_target, consider_arg_all, get_repo_context, make_review_target
+from .constants import JSON_REPORT_FILE_NAME
+from .core import review
+from .llm_scheduler import LLMScheduler, tenant
+from .utils.git_blobs import close_blob_reader
+from .utils.git_platform.platform_types import PlatformType, identify_git_platform_from_remotes
+
+BATCH_SUMMARY_FILE_NAME = "batch-summary.json"
+
+
+@dataclass
+class BatchTarget:
+    """Review target of the batch manifest."""
+
+    url: str | None = None
+    path: str | None = None
+    """Local repository path (used if url is not set), defaults to the current folder."""
+    refs: str | None = None
+    what: str | None = None
+    against: str | None = None
+    filters: str = ""
+    merge_base: bool = True
+    all: bool = False
+    pr: int | str | None = None
+    """
+    Pull / merge request number: reported with the review; if no refs are given, its head
+    is fetched from the remote (url targets only) and reviewed against the base branch.
+    """
+    name: str | None = None
+    """Name of the target report folder."""
+
+    @property
+    def pr_only(self) -> bool:
+        """Only the pull request is given, its head is fetched and reviewed."""
+        return bool(self.pr) and not (self.refs or self.what or self.all)
+
+    @property
+    def repo_key(self) -> str:
+        return self.url or str(Path(self.path or ".").resolve())
+
+    def default_name(self) -> str:
+        repo = "-".join(re.split(r"[/:]", self.repo_key.removesuffix(".git"))[-2:])
+        suffix = f"pr{self.pr}" if self.pr else self.refs or self.what or "all"
+        return re.sub(r"[^\w.-]+", "-", f"{repo}-{suffix}").strip("-")
+
+
+@dataclass
+class BatchResult:
+    name: str
+    repo: str
+    what: str | None
+    against: str | None
+    pr: str | None
+    status: str = "failed"
+    """reviewed, no_changes or failed"""
+    issues: int = 0
+    report_file: str | None = None
+    error: str = ""
+
+
+def load_manifest(file_name: str | Path) -> list[BatchTarget]:
+    """
+    Read review targets from the TOML (`[[targets]]` tables) or JSON manifest
+    (list of objects or an object with the "targets" list).
+    """
+    file_name = Path(file_name)
+    with open(file_name, "rb") as f:
+        if file_name.suffix.lower() == ".json":
+            data = json.load(f)
+        else:
+            data = tomllib.load(f)
+    entries = data.get("targets", []) if isinstance(data, dict) else data
+    known = {f.name for f in fields(BatchTarget)}
+    targets = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Manifest target #{i + 1} must be a table / object")
+        if unknown := set(entry) - known:
+            raise ValueError(f"Unknown fields of manifest target #{i + 1}: {', '.join(unknown)}")
+        target = BatchTarget(**entry)
+        if target.pr_only and not target.url:
+            raise ValueError(
+                f"Manifest target #{i + 1} gives only the pull request of the local repository: "
+                "set refs / what to review, pull requests are fetched for url targets only"
+            )
+        targets.append(target)
+    return targets
+
+
+def _fetch_pull_request(repo: Repo, url: str, pr: int | str) -> str:
+    """
+    Fetch the head commit of the pull / merge request (e.g. from a fork) without creating refs,
+    returns its SHA.
+    """
+    ref = (
+        f"refs/merge-requests/{pr}/head"
+        if identify_git_platform_from_remotes([url]) == PlatformType.GITLAB
+        else f"refs/pull/{pr}/head"
+    )
+    repo.git.fetch("origin", ref)
+    # FETCH_HEAD is specific to the worktree
+    return repo.git.rev_parse("FETCH_HEAD")
+
+
+def _checkout(repo: Repo, what: str | None):
+    """
+    Check out the reviewed ref in the worktree (the review reads files from HEAD),
+    detached: branches can't be checked out in several worktrees of the cached repository.
+    """
+    if what:
+        repo.git.checkout("--detach", what)
+        # Reviews of the previous targets must not see the contents read at their HEAD
+        close_blob_reader(repo)
+
+
+@dataclass
+class BatchReview:
+    targets: list[BatchTarget]
+    out_folder: Path
+    max_repos: int = 4
+    """Number of repositories cloned and reviewed concurrently."""
+    scheduler: LLMScheduler = field(default_factory=LLMScheduler.from_config)
+    results: list[BatchResult] = field(default_factory=list, init=False)
+
+    def __post_init__(self):
+        self.out_folder = Path(self.out_folder)
+        names = Counter()
+        self.results = []
+        for target in self.targets:
+            name = target.name or target.default_name()
+            names[name] += 1
+            if names[name] > 1:
+                name = f"{name}-{names[name]}"
+            refs, _ = consider_arg_all(target.all, target.refs, target.merge_base)
+            what, against = args_to_target(refs, target.what, target.against)
+            self.results.append(
+                BatchResult(
+                    name=name,
+                    repo=target.repo_key,
+                    what=what,
+                    against=against,
+                    pr=str(target.pr) if target.pr else None,
+                )
+            )
+
+    async def _review_repo(self, repo_key: str, items: list[tuple[BatchTarget, BatchResult]]):
+        """Review the targets of the repository one by one in a single worktree."""
+        first = items[0][0]
+        with ExitStack() as stack, tenant(repo_key):
+            try:
+                repo, _ = await asyncio.to_thread(
+                    stack.enter_context, get_repo_context(first.url, None, first.path)
+                )
+            except Exception as e:
+                logging.error(f"Can't access the repository {repo_key}: {e}")
+                for _, result in items:
+                    result.error = f"[{type(e).__name__}] {e}"
+                return
+            for target, result in items:
+                out_folder = self.out_folder / result.name
+                try:
+                    if target.pr_only:
+                        result.what = await asyncio.to_thread(
+                            _fetch_pull_request, repo, target.url, target.pr
+                        )
+                    if target.url:
+                        await asyncio.to_thread(_checkout, repo, result.what)
+                    _, merge_base = consider_arg_all(target.all, target.refs, target.merge_base)
+                    report = await review(
+                        target=make_review_target(
+                            repo, result.what, result.against, target.filters, merge_base, target.pr
+                        ),
+                        repo=repo,
+                        out_folder=out_folder,
+                        scheduler=self.scheduler,
+                    )
+                except Exception as e:
+                    logging.exception(f"Review of {result.name} failed")
+                    result.error = f"[{type(e).__name__}] {e}"
+                    continue
+                if report is None:
+                    result.status = "no_changes"
+                    continue
+                result.status = "reviewed"
+                result.issues = report.total_issues
+                result.report_file = str(out_folder / JSON_REPORT_FILE_NAME)
+
+    async def run(self) -> list[BatchResult]:
+        by_repo: dict[str, list[tuple[BatchTarget, BatchResult]]] = {}
+        for target, result in zip(self.targets, self.results):
+            by_repo.setdefault(target.repo_key, []).append((target, result))
+        repo_slots = asyncio.Semaphore(self.max_repos)
+
+        async def review_repo(repo_key, items):
+            async with repo_slots:
+                await self._review_repo(repo_key, items)
+
+        with self.scheduler.install():
+            await asyncio.gather(*[review_repo(k, items) for k, items in by_repo.items()])
+        self.save_summary()
+        return self.results
+
+    @property
+    def summary(self) -> dict:
+        totals = Counter(result.status for result in self.results)
+        return {
+            "totals": {
+                "targets": len(self.results),
+                "reviewed": totals["reviewed"],
+                "no_changes": totals["no_changes"],
+                "failed": totals["failed"],
+                "issues": sum(result.issues for result in self.results),
+            },
+            "llm_scheduler": self.scheduler.stats,
+            "targets": [asdict(result) for result in self.results],
+        }
+
+    def save_summary(self):
+        self.out_folder.mkdir(parents=True, exist_ok=True)
+        file_name = self.out_folder / BATCH_SUMMARY_FILE_NAME
+        file_name.write_text(json.dumps(self.summary, indent=2), encoding="utf-8")
+        logging.info(f"Batch review summary saved to {file_name}")
+
+    def to_cli(self):
+        status_colors = {"reviewed": ui.green, "no_changes": ui.gray, "failed": ui.red}
+        for result in self.results:
+            details = f"{result.issues} issue(s)" if result.status == "reviewed" else result.error
+            print(f"{status_colors[result.status](result.status)}  {result.name}  {details}")
+        totals = self.summary["totals"]
+        print(
+            f"{totals['targets']} target(s): {totals['reviewed']} reviewed, "
+            f"{totals['no_changes']} without changes, {totals['failed']} failed, "
+            f"{totals['issues']} issue(s) found."
+        )
@@ -7,7 +7,7 @@ import logging
 from datetime import datetime
 from pathlib import Path
 
-import microcore as mc
+from colorama import Fore
 
 from .utils.git_platform.gitlab import is_running_in_gitlab_ci
 from .utils.git_platform.github import is_running_in_github_action
@@ -22,12 +22,13 @@ def setup_logging(log_level: int = logging.INFO):
         def format(self, record):
             dt = datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S")
             message, level_name = record.getMessage(), record.levelname
+            # Plain ANSI colors: microcore is not imported by the commands that don't use it
             if record.levelno == logging.WARNING:
-                message = mc.ui.yellow(message)
-                level_name = mc.ui.yellow(level_name)
+                message = f"{Fore.YELLOW}{message}{Fore.RESET}"
+                level_name = f"{Fore.YELLOW}{level_name}{Fore.RESET}"
             if record.levelno >= logging.ERROR:
-                message = mc.ui.red(message)
-                level_name = mc.ui.red(level_name)
+                message = f"{Fore.RED}{message}{Fore.RESET}"
+                level_name = f"{Fore.RED}{level_name}{Fore.RESET}"
 
             formatted_message = f"{dt} {level_name}: {message}"
             if record.exc_info:
@@ -39,7 +40,9 @@ def setup_logging(log_level: int = logging.INFO):
     logging.basicConfig(level=log_level, handlers=[handler])
 
 
-def bootstrap(verbosity: int = 1, require_llm_config: bool = True):
+def bootstrap(
+    verbosity: int = 1, require_llm_config: bool = True, configure_microcore: bool = True
+):
     """
     Bootstrap the application with the environment configuration.
 
@@ -48,6 +51,8 @@ def bootstrap(verbosity: int = 1, require_llm_config: bool = True):
         require_llm_config: When False, configure with no LLM backend so that
             commands that don't perform inference (e.g. `gito deploy`) can run
             without LLM API credentials configured.
+        configure_microcore: When False, only logging and output are set up,
+            microcore is neither imported nor configured (e.g. for `gito version`).
     """
     log_levels_by_verbosity = {
         0: logging.CRITICAL,
@@ -59,12 +64,17 @@ def bootstrap(verbosity: int = 1, require_llm_config: bool = True):
     Env.logging_level = log_levels_by_verbosity.get(verbosity, logging.INFO)
     setup_logging(Env.logging_level)
     logging.info(
-        f"Bootstrapping Gito v{Env.gito_version}... " + mc.ui.gray(f"[verbosity={verbosity}]")
+        f"Bootstrapping Gito v{Env.gito_version}... "
+        f"{Fore.LIGHTBLACK_EX}[verbosity={verbosity}]{Fore.RESET}"
     )
 
     # cp1251 is used on Windows when redirecting output
     if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+    if not configure_microcore:
+        return
+
+    import microcore as mc
 
     try:
         configure_kwargs = dict(
@@ -4,17 +4,8 @@ import logging
 import sys
 import textwrap
 
-import microcore as mc
 import typer
-from gito.utils.git_platform.shared import get_repo_base_web_url
-
-from .core import (
-    review,
-    answer,
-    get_target_diff,
-    get_base_branch,
-    NoChangesInContextError,
-)
+
 from .cli_base import (
     app,
     args_to_target,
@@ -25,25 +16,20 @@ from .cli_base import (
     arg_against,
     arg_all,
     get_repo_context,
+    consider_arg_all,
+    make_review_target,
     command_requires_llm,
+    command_uses_microcore,
     runs_without_llm,
+    LAZY_COMMANDS,
 )
-from .report_struct import Report, ReviewTarget
-from .constants import HOME_ENV_PATH, GITHUB_MD_REPORT_FILE_NAME, REFS_VALUE_ALL
-from .bootstrap import bootstrap
+from .constants import HOME_ENV_PATH, GITHUB_MD_REPORT_FILE_NAME
 from .utils.cli import no_subcommand, logo
 from .utils.html import remove_html_comments
 from .utils.git_platform.shared import get_repo_domain_and_path
-from .utils.git_platform.platform_types import PlatformType, identify_git_platform
-from .project_config import ProjectConfig
-
-from .commands.gh_post_review_comment import post_github_cr_comment
-from .commands.gitlab_post_review_comment import post_gitlab_cr_comment
-from .commands.linear_comment import linear_comment
-
-# Imported for registering commands
-from .commands import fix, gh_react_to_comment, repl, deploy, version  # noqa
+from .utils.git_platform.platform_types import PlatformType
 
+# LLM client, review logic and integrations (slow to import) are imported by the commands using them
 app_no_subcommand = typer.Typer(pretty_exceptions_show_locals=False)
 
 
@@ -54,7 +40,9 @@ def main():
     if len(sys.argv) > 1 and sys.argv[1] == "help":
         sys.argv = [sys.argv[0]] + sys.argv[2:] + ["--help"]
 
-    if no_subcommand(app):
+    if no_subcommand(app, LAZY_COMMANDS):
+        from .bootstrap import bootstrap
+
         bootstrap()
         app_no_subcommand()
     else:
@@ -97,26 +85,16 @@ def cli(
         verbosity = 1
 
     if ctx.invoked_subcommand != "setup":
+        from .bootstrap import bootstrap
+
         # Commands marked with @runs_without_llm (e.g. `deploy`) only manipulate
         # local/CI files and must run without LLM API credentials configured.
-        bootstrap(verbosity, require_llm_config=command_requires_llm(ctx))
-
-
-def _consider_arg_all(all: bool, refs: str, merge_base: bool) -> tuple[str, bool]:
-    """
-    Handle the --all option logic for commands.
-    Returns:
-        Updated (refs, merge_base) tuple.
-    """
-    if all:
-        if refs and refs != REFS_VALUE_ALL:
-            raise typer.BadParameter(
-                "The --all option overrides the refs argument. "
-                "Please remove the refs argument if you want to review all codebase."
-            )
-        refs = REFS_VALUE_ALL
-        merge_base = False
-    return refs, merge_base
+        # Microcore (slow to import) isn't loaded at all for `version` and the help of commands.
+        bootstrap(
+            verbosity,
+            require_llm_config=command_requires_llm(ctx),
+            configure_microcore=command_uses_microcore(ctx),
+        )
 
 
 @app_no_subcommand.command(name="review", help="Perform code review")
@@ -129,7 +107,7 @@ def cmd_review(
     filters: str = arg_filters(),
     merge_base: bool = typer.Option(default=True, help="Use merge base for comparison"),
     url: str = typer.Option("", "--url", help="Git repository URL"),
-    path: str = typer.Option("", "--path", help="Git repository path"),  # @todo: implement
+    path: str = typer.Option("", "--path", help="Git repository path"),
     post_comment: bool = typer.Option(
         default=False, help="Post review comment to git platform (GitHub, GitLab, etc.)"
     ),
@@ -145,35 +123,56 @@ def cmd_review(
     ),
     out: str = arg_out(),
     all: bool = arg_all(),
+    incremental: bool = typer.Option(
+        default=False,
+        help="Review only files changed since the commit reviewed in the previous JSON report "
+        "(found in the output folder, e.g. restored from the CI cache), "
+        "carrying forward issues from unchanged files",
+    ),
+    remote: bool = typer.Option(
+        False,
+        "--remote",
+        help="Review the GitHub pull request / GitLab merge request (--url, --pr) "
+        "fetching the diff and changed files via the platform API, without cloning",
+    ),
+    patch: str = typer.Option(
+        "",
+        "--patch",
+        help="Review the unified diff from the file ('-' for stdin) without a git repository",
+    ),
+    files_from: str = typer.Option(
+        None,
+        "--files-from",
+        help="Directory or tarball with the changed files after the change (used with --patch), "
+        "the diff alone is reviewed if omitted",
+    ),
 ):
-    refs, merge_base = _consider_arg_all(all, refs, merge_base)
+    if patch:
+        from .patch_review import review_patch
+
+        asyncio.run(review_patch(patch, files_from, out_folder=out or ".", filters=filters))
+        return
+    if remote:
+        review_remote_pr(url, pr, filters, out, post_comment)
+        return
+    from .core import review
+
+    refs, merge_base = consider_arg_all(all, refs, merge_base)
     _what, _against = args_to_target(refs, what, against)
     pr = pr or os.getenv("PR_NUMBER_FROM_WORKFLOW_DISPATCH")
-    with get_repo_context(url, _what) as (repo, out_folder):
-        commit_sha = repo.head.commit.hexsha
-        try:
-            active_branch = repo.active_branch.name
-        except TypeError:
-            active_branch = None
-        review_target = ReviewTarget(
-            git_platform_type=identify_git_platform(repo),
-            repo_url=get_repo_base_web_url(repo),
-            pull_request_id=str(pr) if pr else None,
-            what=_what,
-            against=_against,
-            filters=filters,
-            use_merge_base=merge_base,
-            commit_sha=commit_sha,
-            active_branch=active_branch,
-        )
+    with get_repo_context(url, _what, path) as (repo, out_folder):
+        review_target = make_review_target(repo, _what, _against, filters, merge_base, pr)
         asyncio.run(
             review(
                 repo=repo,
                 target=review_target,
                 out_folder=out or out_folder,
+                incremental=incremental,
             )
         )
         if post_comment:
+            from .commands.gh_post_review_comment import post_github_cr_comment
+            from .commands.gitlab_post_review_comment import post_gitlab_cr_comment
 
             md_report_file = os.path.join(out or out_folder, GITHUB_MD_REPORT_FILE_NAME)
             if review_target.git_platform_type == PlatformType.GITHUB:
@@ -201,6 +200,22 @@ def cmd_review(
                 raise typer.Exit(code=1)
 
 
+def review_remote_pr(url: str, pr: int | None, filters: str, out: str, post_comment: bool):
+    """Review the pull / merge request via the platform API (`gito review --remote`)."""
+    from .remote_review import RemotePullRequest, post_remote_review_comment, review_remote
+
+    if not url or not pr:
+        raise typer.BadParameter("--remote requires the repository --url and the --pr number")
+    try:
+        pull = RemotePullRequest.from_url(url, pr)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from e
+    out_folder = out or "."
+    report = asyncio.run(review_remote(pull, out_folder=out_folder, filters=filters))
+    if post_comment and report:
+        post_remote_review_comment(pull, out_folder)
+
+
 @app.command(name="ask", help="Answer questions about the target codebase changes.")
 @app.command(name="answer", hidden=True)
 def cmd_answer(
@@ -221,7 +236,9 @@ def cmd_answer(
     ),
     all: bool = arg_all(),
 ):
-    refs, merge_base = _consider_arg_all(all, refs, merge_base)
+    from .core import answer
+
+    refs, merge_base = consider_arg_all(all, refs, merge_base)
     _what, _against = args_to_target(refs, what, against)
     pr = pr or os.getenv("PR_NUMBER_FROM_WORKFLOW_DISPATCH")
     if str(question).startswith("tpl:"):
@@ -244,12 +261,16 @@ def cmd_answer(
         logging.warning("No answer produced, nothing to post or save.")
         return None
     if post_to == "linear":
+        from .commands.linear_comment import linear_comment
+
         logging.info("Posting answer to Linear...")
         linear_comment(remove_html_comments(out))
     if save_to:
+        from microcore.utils import file_link
+
         with open(save_to, "w", encoding="utf-8") as f:
             f.write(out)
-        logging.info(f"Answer saved to {mc.utils.file_link(save_to)}")
+        logging.info(f"Answer saved to {file_link(save_to)}")
 
     return out
 
@@ -262,6 +283,8 @@ def setup():
         "choose a provider, enter your API key, and pick a model. "
         "Settings are saved to ~/.gito/.env."
     )
+    import microcore as mc
+
     mc.interactive_setup(HOME_ENV_PATH)
 
 
@@ -270,12 +293,14 @@ def setup():
 @runs_without_llm
 def render(
     format: str = typer.Argument(
-        default=Report.Format.CLI, help="Report format: md (Markdown), cli (terminal)"
+        default="cli", help="Report format: md (Markdown), cli (terminal)"
     ),
     source: str = typer.Option(
         "", "--src", "--source", help="Source file (json) to load the report from"
     ),
 ):
+    from .report_struct import Report
+
     Report.load(file_name=source).to_cli(report_format=format)
 
 
@@ -294,7 +319,11 @@ def files(
     diff: bool = typer.Option(default=False, help="Show diff content"),
     all: bool = arg_all(),
 ):
-    refs, merge_base = _consider_arg_all(all, refs, merge_base)
+    from microcore import ui
+    from .core import get_target_diff, get_base_branch, NoChangesInContextError
+    from .project_config import ProjectConfig
+
+    refs, merge_base = consider_arg_all(all, refs, merge_base)
     _what, _against = args_to_target(refs, what, against)
     with get_repo_context(url=None, branch=_what) as (repo, out_folder):
         cfg = ProjectConfig.load_for_repo(repo)
@@ -313,19 +342,19 @@ def files(
 
         print(
             f"Changed files: "
-            f"{mc.ui.green(_what or 'INDEX')} vs "
-            f"{mc.ui.yellow(_against or get_base_branch(repo))}"
-            f"{' filtered by ' + mc.ui.cyan(filters) if filters else ''} --> "
-            f"{mc.ui.cyan(len(patch_set))} file(s)."
+            f"{ui.green(_what or 'INDEX')} vs "
+            f"{ui.yellow(_against or get_base_branch(repo))}"
+            f"{' filtered by ' + ui.cyan(filters) if filters else ''} --> "
+            f"{ui.cyan(len(patch_set))} file(s)."
         )
 
         for patch in patch_set:
             if patch.is_added_file:
-                color = mc.ui.green
+                color = ui.green
             elif patch.is_removed_file:
-                color = mc.ui.red
+                color = ui.red
             else:
-                color = mc.ui.blue
+                color = ui.blue
             print(f"- {color(patch.path)}")
             if diff:
-                print(mc.ui.gray(textwrap.indent(str(patch), "  ")))
+                print(ui.gray(textwrap.indent(str(patch), "  ")))
@@ -3,23 +3,89 @@ Common CLI arguments and utilities for Gito commands.
 """
 
 import contextlib
+import importlib
 import logging
 import tempfile
-from typing import Iterator
+from typing import Iterator, TYPE_CHECKING
 
-import microcore as mc
+import click
 import typer
-from git import Repo, InvalidGitRepositoryError
+from typer.core import TyperGroup
+from typer.main import get_command_from_info, get_command_name
+from git import Repo, InvalidGitRepositoryError, NoSuchPathError
 
 from .constants import REFS_VALUE_ALL
+from .utils.git_platform.platform_types import identify_git_platform
+from .utils.git_platform.shared import get_repo_base_web_url
 from .utils.string import parse_refs_pair
-from .env import Env
+from .utils.git_blobs import close_blob_reader
 
+if TYPE_CHECKING:
+    from .report_struct import ReviewTarget
 
-app = typer.Typer(pretty_exceptions_show_locals=False)
+
+# Commands registered by modules imported on the first use of the command
+# (or when the list of commands is shown), keeping the CLI startup fast
+LAZY_COMMANDS = {
+    "fix": "gito.commands.fix",
+    "react-to-comment": "gito.commands.gh_react_to_comment",
+    "repl": "gito.commands.repl",
+    "deploy": "gito.commands.deploy",
+    "init": "gito.commands.deploy",
+    "connect": "gito.commands.deploy",
+    "ci": "gito.commands.deploy",
+    "version": "gito.commands.version",
+    "github-comment": "gito.commands.gh_post_review_comment",
+    "gitlab-comment": "gito.commands.gitlab_post_review_comment",
+    "post-gitlab-comment": "gito.commands.gitlab_post_review_comment",
+    "serve": "gito.commands.serve",
+    "review-batch": "gito.commands.review_batch",
+}
+
+
+class LazyCommandsGroup(TyperGroup):
+    """
+    Click group of the Gito CLI app, importing the modules of LAZY_COMMANDS on demand.
+    """
+
+    def _load_commands(self, *module_names: str):
+        for module_name in module_names:
+            importlib.import_module(module_name)
+        # Commands registered after the group was created
+        for command_info in app.registered_commands:
+            name = command_info.name or get_command_name(command_info.callback.__name__)
+            if name not in self.commands:
+                self.add_command(
+                    get_command_from_info(
+                        command_info,
+                        pretty_exceptions_short=app.pretty_exceptions_short,
+                        rich_markup_mode=self.rich_markup_mode,
+                    ),
+                    name,
+                )
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in LAZY_COMMANDS:
+            self._load_commands(LAZY_COMMANDS[cmd_name])
+        return super().get_command(ctx, cmd_name)
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        self._load_commands(*dict.fromkeys(LAZY_COMMANDS.values()))
+        return super().list_commands(ctx)
+
+    def resolve_command(self, ctx: click.Context, args: list[str]):
+        name, command, remaining = super().resolve_command(ctx, args)
+        # Resolved before the root callback runs, which doesn't get the subcommand arguments
+        ctx.meta[_SUBCOMMAND_ARGS_META_KEY] = remaining
+        return name, command, remaining
+
+
+app = typer.Typer(cls=LazyCommandsGroup, pretty_exceptions_show_locals=False)
 
 
 _RUNS_WITHOUT_LLM_ATTR = "_gito_runs_without_llm"
+_RUNS_WITHOUT_MICROCORE_ATTR = "_gito_runs_without_microcore"
+_SUBCOMMAND_ARGS_META_KEY = "gito.subcommand_args"
 
 
 def runs_without_llm(func):
@@ -37,10 +103,87 @@ def command_requires_llm(ctx: typer.Context) -> bool:
     subcommand = ctx.invoked_subcommand
     if not subcommand:
         return True
-    command = ctx.command.commands.get(subcommand)
+    command = ctx.command.get_command(ctx, subcommand)
     return not getattr(getattr(command, "callback", None), _RUNS_WITHOUT_LLM_ATTR, False)
 
 
+def runs_without_microcore(func):
+    """
+    Mark a CLI command as not using microcore at all (neither LLM nor prompt templates),
+    e.g. `version`. The root callback skips importing and configuring it,
+    the slowest part of the CLI startup. Implies @runs_without_llm.
+    """
+    setattr(func, _RUNS_WITHOUT_MICROCORE_ATTR, True)
+    return runs_without_llm(func)
+
+
+def command_uses_microcore(ctx: typer.Context) -> bool:
+    """
+    Return whether the invoked subcommand needs microcore configured:
+    not for the commands marked with @runs_without_microcore and the help of any command.
+    """
+    subcommand = ctx.invoked_subcommand
+    if not subcommand:
+        return True
+    command = ctx.command.get_command(ctx, subcommand)
+    if command is None:
+        return True
+    if getattr(command.callback, _RUNS_WITHOUT_MICROCORE_ATTR, False):
+        return False
+    args = ctx.meta.get(_SUBCOMMAND_ARGS_META_KEY, [])
+    if "--" in args:
+        args = args[:args.index("--")]
+    return not set(command.get_help_option_names(ctx)).intersection(args)
+
+
+def consider_arg_all(all: bool, refs: str, merge_base: bool) -> tuple[str, bool]:
+    """
+    Handle the --all option logic for commands.
+    Returns:
+        Updated (refs, merge_base) tuple.
+    """
+    if all:
+        if refs and refs != REFS_VALUE_ALL:
+            raise typer.BadParameter(
+                "The --all option overrides the refs argument. "
+                "Please remove the refs argument if you want to review all codebase."
+            )
+        refs = REFS_VALUE_ALL
+        merge_base = False
+    return refs, merge_base
+
+
+def make_review_target(
+    repo: Repo,
+    what: str | None,
+    against: str | None,
+    filters: str | list[str] | None,
+    use_merge_base: bool = True,
+    pr: int | str | None = None,
+) -> "ReviewTarget":
+    """Describe the review of the repository changes, including the git platform details."""
+    from .report_struct import ReviewTarget
+
+    try:
+        active_branch = repo.active_branch.name
+    except TypeError:
+        # Branches of remote repositories are checked out detached (see get_repo_context)
+        active_branch = (
+            what if what in repo.heads and repo.heads[what].commit == repo.head.commit else None
+        )
+    return ReviewTarget(
+        git_platform_type=identify_git_platform(repo),
+        repo_url=get_repo_base_web_url(repo),
+        pull_request_id=str(pr) if pr else None,
+        what=what,
+        against=against,
+        filters=filters,
+        use_merge_base=use_merge_base,
+        commit_sha=repo.head.commit.hexsha,
+        active_branch=active_branch,
+    )
+
+
 def args_to_target(refs, what, against) -> tuple[str | None, str | None]:
     """Convert CLI arguments to target WHAT and AGAINST refs."""
     if refs == REFS_VALUE_ALL:
@@ -106,37 +249,60 @@ def arg_all() -> typer.Option:
 
 
 @contextlib.contextmanager
-def get_repo_context(url: str | None, branch: str | None) -> Iterator[tuple[Repo, str]]:
+def get_repo_context(
+    url: str | None,
+    branch: str | None,
+    path: str | None = None,
+    git_env: dict[str, str] | None = None,
+) -> Iterator[tuple[Repo, str]]:
     """
     Context manager for handling both local and remote repositories.
     Yields a tuple of (Repo object, path to the repository)
     Args:
         url (str): URL of the remote repository. If empty, uses the local repository.
-        branch (str): Branch to checkout when cloning the remote repository.
+        branch (str): Branch (or other revision) of the remote repository to check out,
+            defaults to the default branch.
+        path (str): Path of the local repository, defaults to the current folder.
+        git_env (dict[str, str]): Environment of the Git commands accessing the remote
+            repository (e.g. credentials, see gito.utils.git_mirror.http_auth_env),
+            defaults to passing the credentials of the URL.
     """
     if branch == REFS_VALUE_ALL:
         branch = None
     if url:
-        with tempfile.TemporaryDirectory() as temp_dir:
+        from microcore import ui, utils
+        from .utils.git_mirror import add_worktree, remove_worktree, update_mirror
+        from .utils.git_mirror import credentials_env, without_credentials
+
+        if git_env is None:
+            git_env = credentials_env(url)
+        # The repository is cached (see gito.utils.git_mirror), reviews work in its worktrees
+        mirror = update_mirror(url, git_env)
+        # Removing the worktree removes the folder
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temp_dir:
             logging.info(
                 f"get_repo_context: "
-                f"Cloning [{mc.ui.green(url)}] to {mc.utils.file_link(temp_dir)} ..."
+                f"Checking out [{ui.green(without_credentials(url))}] "
+                f"to {utils.file_link(temp_dir)} ..."
             )
-            repo = Repo.clone_from(url, branch=branch, to_path=temp_dir)
-            prev_folder = Env.working_folder
-            Env.working_folder = temp_dir
+            add_worktree(mirror, temp_dir, branch)
+            repo = Repo(temp_dir)
+            # Partial clones fetch file contents on demand
+            repo.git.update_environment(**git_env)
             try:
                 yield repo, temp_dir
             finally:
+                close_blob_reader(repo)
                 repo.close()
-                Env.working_folder = prev_folder
+                remove_worktree(mirror, temp_dir)
     else:
         logging.info("get_repo_context: Using local repo...")
         try:
-            repo = Repo(".")
-        except InvalidGitRepositoryError:
-            raise typer.BadParameter("Current folder is not a git repository.")
+            repo = Repo(path or ".")
+        except (InvalidGitRepositoryError, NoSuchPathError):
+            raise typer.BadParameter(f"{path or 'Current folder'} is not a git repository.")
         try:
-            yield repo, "."
+            yield repo, path or "."
         finally:
+            close_blob_reader(repo)
             repo.close()
@@ -73,7 +73,8 @@ def fix(
     # Load the report
     report_path = report_path or JSON_REPORT_FILE_NAME
     try:
-        report = Report.load(report_path)
+        # Only the issues to fix are validated
+        report = Report.load(report_path, lazy=True)
     except (FileNotFoundError, json.JSONDecodeError) as e:
         logging.error(f"Failed to load report from {report_path}: {e}")
         raise typer.Exit(code=1)
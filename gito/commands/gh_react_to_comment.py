@@ -10,7 +10,6 @@ from typing import Optional
 from urllib.error import HTTPError
 import zipfile
 
-import requests
 import typer
 from fastcore.basics import AttrDict
 from microcore import ui
@@ -24,6 +23,7 @@ from ..project_config import ProjectConfig
 from ..utils.git_platform.github import is_running_in_github_action
 from ..utils.git_platform.shared import get_repo_owner_and_name
 from ..utils.git import get_cwd_repo_or_fail
+from ..utils.http_session import http_session
 from .fix import fix
 
 
@@ -203,7 +203,7 @@ def download_latest_code_review_artifact(
     headers = {"Authorization": f"token {gh_token}"} if gh_token else {}
     zip_path = "artifact.zip"
     try:
-        with requests.get(url, headers=headers, stream=True) as r:
+        with http_session().get(url, headers=headers, stream=True) as r:
             r.raise_for_status()
             with open(zip_path, "wb") as f:
                 for chunk in r.iter_content(chunk_size=8192):
@@ -8,6 +8,7 @@ import typer
 from ..cli_base import app, runs_without_llm
 from ..issue_trackers import resolve_issue_key
 from ..utils.git import get_cwd_repo_or_fail
+from ..utils.http_session import http_session
 
 
 class LinearAPIError(Exception):
@@ -27,7 +28,7 @@ def post_linear_comment(issue_key: str, text: str, api_key: str) -> dict:
         LinearAPIError: If the API request fails for any reason.
     """
     try:
-        response = requests.post(
+        response = http_session().post(
             "https://api.linear.app/graphql",
             headers={"Authorization": api_key, "Content-Type": "application/json"},
             json={
@@ -0,0 +1,48 @@
+"""Batch review of many repositories / pull requests."""
+
+import asyncio
+
+import typer
+
+from ..batch import BatchReview, load_manifest, BATCH_SUMMARY_FILE_NAME
+from ..cli_base import app
+from ..llm_scheduler import LLMScheduler
+
+
+@app.command(
+    name="review-batch",
+    help="\bReview many repositories / pull requests listed in the manifest in one process."
+    "\nReviews run concurrently with a shared LLM concurrency and rate limit budget "
+    "split fairly between repositories."
+    "\nThe manifest is a TOML file with \\[\\[targets]] tables (or a JSON list) having the fields: "
+    "url or path, refs (or what / against), filters, merge_base, all, pr, name."
+    "\nTargets giving only the pr (and url) review the pull request head fetched from the remote."
+    "\nReports are saved to <OUT>/<name>/, "
+    f"the aggregate summary to <OUT>/{BATCH_SUMMARY_FILE_NAME}.",
+)
+def review_batch(
+    manifest: str = typer.Argument(help="Manifest file (.toml or .json)"),
+    out: str = typer.Option(
+        "gito-batch", "--out", "-o", "--output", help="Output folder for the reports"
+    ),
+    max_repos: int = typer.Option(4, help="Number of repositories reviewed concurrently"),
+    max_llm_concurrency: int = typer.Option(
+        None,
+        help="Concurrent LLM requests of all reviews (default: MAX_CONCURRENT_TASKS setting)",
+    ),
+    rpm_limit: int = typer.Option(0, help="LLM requests per minute of all reviews, 0: unlimited"),
+    tpm_limit: int = typer.Option(0, help="LLM tokens per minute of all reviews, 0: unlimited"),
+):
+    try:
+        targets = load_manifest(manifest)
+    except (OSError, ValueError) as e:
+        raise typer.BadParameter(f"Can't read the manifest {manifest}: {e}")
+    scheduler = LLMScheduler.from_config(rpm_limit, tpm_limit)
+    if max_llm_concurrency:
+        scheduler.max_concurrency = max_llm_concurrency
+        scheduler.concurrency = min(scheduler.concurrency, max_llm_concurrency)
+    batch = BatchReview(targets, out_folder=out, max_repos=max_repos, scheduler=scheduler)
+    asyncio.run(batch.run())
+    batch.to_cli()
+    if batch.summary["totals"]["failed"]:
+        raise typer.Exit(1)
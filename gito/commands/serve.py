@@ -0,0 +1,74 @@
+"""Long-running review server command."""
+
+import asyncio
+
+import typer
+
+from ..cli_base import app
+from ..job_queue import JobQueue
+from ..server import ReviewServer, DEFAULT_PORT
+from ..webhooks import WebhookReceiver
+
+
+@app.command(
+    help="\bRun a long-running server accepting review / ask jobs over HTTP "
+    "(localhost port or Unix socket)."
+    "\nThe LLM is configured once and the LLM request concurrency is shared between jobs. "
+    "\nEndpoints: POST /review, POST /ask, GET /health."
+    "\nWith --queue-db, also reviews pull requests on GitHub / GitLab webhook events "
+    "(POST /webhook/github, POST /webhook/gitlab)."
+)
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Interface to listen on"),
+    port: int = typer.Option(DEFAULT_PORT, help="Port to listen on"),
+    socket: str = typer.Option(
+        None, "--socket", help="Listen on the Unix socket instead of the TCP port"
+    ),
+    max_jobs: int = typer.Option(4, help="Number of jobs running concurrently"),
+    max_llm_concurrency: int = typer.Option(
+        None,
+        help="Concurrent LLM requests of all jobs (default: MAX_CONCURRENT_TASKS setting)",
+    ),
+    queue_db: str = typer.Option(
+        None, help="SQLite file of the webhook job queue, enables the webhook endpoints"
+    ),
+    workers: int = typer.Option(2, help="Number of pull requests reviewed concurrently"),
+    webhook_secret: str = typer.Option(
+        None,
+        envvar="GITO_WEBHOOK_SECRET",
+        help="Secret for verifying webhook deliveries (required with --queue-db)",
+    ),
+    post_comments: bool = typer.Option(
+        True, help="Post the reviews of the webhook jobs to the pull requests"
+    ),
+    root: list[str] = typer.Option(
+        None,
+        "--root",
+        help="Folder containing the repositories and the output folders of the jobs "
+        "(repeatable, default: current folder)",
+    ),
+):
+    if queue_db and not webhook_secret:
+        raise typer.BadParameter(
+            "--webhook-secret (or GITO_WEBHOOK_SECRET env var) is required to accept webhooks"
+        )
+    queue = JobQueue(queue_db) if queue_db else None
+    server = ReviewServer(
+        max_jobs=max_jobs,
+        max_llm_concurrency=max_llm_concurrency,
+        roots=root or None,
+        webhooks=(
+            WebhookReceiver(
+                queue, workers=workers, secret=webhook_secret, post_comments=post_comments
+            )
+            if queue
+            else None
+        ),
+    )
+    try:
+        asyncio.run(server.serve(host=host, port=port, socket_path=socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if queue:
+            queue.close()
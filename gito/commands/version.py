@@ -1,11 +1,11 @@
 """Show Gito version command."""
 
-from ..cli_base import app, runs_without_llm
+from ..cli_base import app, runs_without_microcore
 from ..env import Env
 
 
 @app.command(name="version", help="Show Gito version.")
-@runs_without_llm
+@runs_without_microcore
 def version():
     print(Env.gito_version)
     return Env.gito_version
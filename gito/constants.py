@@ -12,6 +12,8 @@ PROJECT_CONFIG_FILE_PATH = Path(".gito") / PROJECT_CONFIG_FILE_NAME
 PROJECT_CONFIG_BUNDLED_DEFAULTS_FILE = Path(__file__).resolve().parent / PROJECT_CONFIG_FILE_NAME
 HOME_ENV_PATH = Path("~/.gito/.env").expanduser()
 JSON_REPORT_FILE_NAME = "code-review-report.json"
+# JSON-lines report of the files reviewed so far, removed when the review completes
+PARTIAL_REPORT_FILE_NAME = "code-review-report.partial.jsonl"
 GITHUB_MD_REPORT_FILE_NAME = "code-review-report.md"
 EXECUTABLE = "gito"
 TEXT_ICON_URL = "https://raw.githubusercontent.com/Nayjest/Gito/main/press-kit/logo/gito-bot-1_64top.png"  # noqa: E501
@@ -20,3 +22,5 @@ HTML_CR_COMMENT_MARKER = "<!-- GITO_COMMENT:CODE_REVIEW_REPORT -->"
 HTML_INLINE_CR_COMMENT_MARKER = "<!-- GITO_COMMENT:INLINE_ISSUE -->"
 REFS_VALUE_ALL = "!all"
 DEFAULT_MAX_CONCURRENT_TASKS = 40
+# Same prefix size as Git uses to detect binary files
+BINARY_FILE_SNIFF_SIZE = 8000
@@ -15,5 +15,6 @@ class Context:
     report: "Report"
     config: "ProjectConfig"
     diff: PatchSet | Iterable[PatchedFile]
-    repo: git.Repo
+    repo: git.Repo | None
+    """None for the changes reviewed without a repository (see gito.review_changes)."""
     pipeline_out: dict = field(default_factory=dict)
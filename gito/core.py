@@ -3,9 +3,14 @@ Gito core business logic.
 """
 
 import os
+import time
+import asyncio
+import codecs
 import fnmatch
 import logging
-from typing import Iterable
+from collections import Counter
+from dataclasses import asdict
+from typing import Callable, Iterable, TYPE_CHECKING
 from pathlib import Path
 from functools import partial
 
@@ -17,51 +22,93 @@ from unidiff import PatchSet, PatchedFile
 from unidiff.constants import DEV_NULL
 
 from .context import Context
+from .diff_chunks import (
+    merge_issue_lists,
+    num_tokens,
+    numbered_lines_window,
+    pack_review_inputs,
+    split_file_diff,
+    split_packed_issues,
+    target_line_range,
+)
 from .project_config import ProjectConfig
-from .report_struct import ProcessingWarning, Report, ReviewTarget, RawIssue
-from .constants import JSON_REPORT_FILE_NAME, REFS_VALUE_ALL
+from .report_struct import PartialReport, ProcessingWarning, Report, ReviewTarget, RawIssue
+from .constants import (
+    JSON_REPORT_FILE_NAME,
+    PARTIAL_REPORT_FILE_NAME,
+    REFS_VALUE_ALL,
+    BINARY_FILE_SNIFF_SIZE,
+)
 from .utils.cli import make_streaming_function
+from .utils.git_blobs import get_blob_reader
+from .utils.git_mirror import deepen_to_merge_base, prefetch_diff_blobs
+from .llm_scheduler import LLMScheduler, estimate_makespan
 from .pipeline import Pipeline
+from .review_cache import ReviewCache
 from .env import Env
 from .gh_api import gh_api
 
+if TYPE_CHECKING:
+    from .review_changes import ReviewChanges
+
 
 def review_subject_is_index(what):
     return not what or what == "INDEX"
 
 
-def is_binary_file(repo: Repo, file_path: str, ref: str | None = None) -> bool:
+def is_binary_content(prefix: bytes) -> bool:
     """
-    Check if a file is binary by attempting to read it as text.
-    Returns True if the file is binary, False otherwise.
+    Check if the beginning of a file (BINARY_FILE_SNIFF_SIZE bytes)
+    contains a NUL byte or invalid UTF-8.
     """
+    if b"\0" in prefix:
+        return True
     try:
-        # Attempt to read the file content from the requested repository tree.
-        tree = repo.commit(ref).tree if ref else repo.tree()
-        content = tree[file_path].data_stream.read()
-        # Try decoding as UTF-8; if it fails, it's likely binary
-        content.decode("utf-8")
+        # Incremental decoding tolerates a multibyte character cut at the prefix boundary,
+        # shorter prefixes are whole files
+        codecs.getincrementaldecoder("utf-8")().decode(
+            prefix, final=len(prefix) < BINARY_FILE_SNIFF_SIZE
+        )
         return False
-    except KeyError:
-        try:
-            fs_path = Path(repo.working_tree_dir) / file_path
-            fs_path.read_text(encoding="utf-8")
-            return False
-        except FileNotFoundError:
-            logging.error(f"File {file_path} not found in the repository.")
-            return True
-        except UnicodeDecodeError:
-            return True
-        except Exception as e:
-            logging.error(f"Error reading file {file_path}: {e}")
-            return True
     except UnicodeDecodeError:
         return True
+
+
+def is_binary_file(repo: Repo, file_path: str, ref: str | None = None) -> bool:
+    """
+    Check if a file is binary by sniffing the beginning of its content.
+    Returns True if the file is binary, False otherwise.
+    """
+    try:
+        # Read only the beginning of the file from the requested repository tree.
+        prefix = get_blob_reader(repo).read_many(
+            [(ref or "HEAD", file_path)], limit=BINARY_FILE_SNIFF_SIZE
+        )[(ref or "HEAD", file_path)]
+        if prefix is None:
+            return is_binary_working_tree_file(repo, file_path)
+        return is_binary_content(prefix)
     except Exception as e:
         logging.warning(f"Error checking if file {file_path} is binary: {e}")
         return True  # Conservatively treat errors as binary to avoid issues
 
 
+def is_binary_working_tree_file(repo: Repo, file_path: str) -> bool:
+    """
+    Check if a working copy file is binary by sniffing only its beginning:
+    a NUL byte or invalid UTF-8 within the first BINARY_FILE_SNIFF_SIZE bytes.
+    Returns True if the file is binary, False otherwise.
+    """
+    try:
+        with open(Path(repo.working_tree_dir) / file_path, "rb") as f:
+            return is_binary_content(f.read(BINARY_FILE_SNIFF_SIZE))
+    except FileNotFoundError:
+        logging.error(f"File {file_path} not found in the repository.")
+        return True
+    except Exception as e:
+        logging.error(f"Error reading file {file_path}: {e}")
+        return True
+
+
 def commit_in_branch(repo: Repo, commit: Commit, target_branch: str) -> bool:
     try:
         repo.git.merge_base("--is-ancestor", commit.hexsha, target_branch)
@@ -136,14 +183,26 @@ class MergeBaseError(RuntimeError):
     """Raised when Git cannot construct a merge-base comparison."""
 
 
-def get_diff(
-    repo: Repo = None,
+def run_git_diff(
+    repo: Repo,
     what: str = None,
     against: str = None,
     use_merge_base: bool = True,
     pr: str | int = None,
-) -> PatchSet | list[PatchedFile]:
-    repo = repo or Repo(".")
+    options: list[str] = None,
+    pathspecs: list[str] = None,
+) -> tuple[str, str | None, str]:
+    """
+    Run `git diff` between the reviewed ref (or the working copy) and the base ref.
+    Args:
+        options (list[str], optional): Additional `git diff` options, e.g. ["--numstat"].
+        pathspecs (list[str], optional): Git pathspecs limiting the files to diff.
+    Returns:
+        tuple[str, str | None, str]: Git output, resolved reviewed ref
+            (None for the working copy) and the ref used as the comparison base.
+    """
+    options = options or []
+    pathspec_args = ["--", *pathspecs] if pathspecs else []
     if what == REFS_VALUE_ALL:
         what = get_base_branch(repo, pr=pr)
         # Git's canonical empty tree hash
@@ -160,6 +219,8 @@ def get_diff(
     )
     if use_merge_base:
         try:
+            # Cached remote repositories are shallow
+            deepen_to_merge_base(repo, against, what or "HEAD")
             comparison_base = repo.git.merge_base(against, what or "HEAD")
             closed_review_base = None
             if not review_subject_is_index(what) and comparison_base == repo.commit(what).hexsha:
@@ -170,13 +231,15 @@ def get_diff(
                     f"Reviewing merged ref {ui.green(what)} from its pre-merge base "
                     f"{ui.cyan(comparison_base[:8])}"
                 )
-                diff_content = repo.git.diff(comparison_base, what)
+                prefetch_diff_blobs(repo, comparison_base, what, pathspecs)
+                output = repo.git.diff(*options, comparison_base, what, *pathspec_args)
             elif review_subject_is_index(what):
                 # With one commit, Git compares the working tree to the merge
                 # base of that commit and HEAD. This preserves local changes.
-                diff_content = repo.git.diff("--merge-base", against)
+                output = repo.git.diff(*options, "--merge-base", against, *pathspec_args)
             else:
-                diff_content = repo.git.diff("--merge-base", against, what)
+                prefetch_diff_blobs(repo, comparison_base, what, pathspecs)
+                output = repo.git.diff(*options, "--merge-base", against, what, *pathspec_args)
         except GitCommandError as e:
             raise MergeBaseError(
                 f"Cannot determine a merge base between '{against}' and '{what or 'HEAD'}'. "
@@ -184,28 +247,101 @@ def get_diff(
             ) from e
     else:
         comparison_base = against
-        diff_content = repo.git.diff(against, what)
+        if what:
+            prefetch_diff_blobs(repo, against, what, pathspecs)
+        output = repo.git.diff(*options, against, what, *pathspec_args)
+    return output, what, comparison_base
+
+
+def get_diff(
+    repo: Repo = None,
+    what: str = None,
+    against: str = None,
+    use_merge_base: bool = True,
+    pr: str | int = None,
+    pathspecs: list[str] = None,
+) -> PatchSet | list[PatchedFile]:
+    """
+    Get the diff between the reviewed ref (or the working copy) and the base ref,
+    excluding binary files.
+    Args:
+        pathspecs (list[str], optional): Git pathspecs limiting the files to diff.
+    """
+    repo = repo or Repo(".")
+    diff_content, what, comparison_base = run_git_diff(
+        repo=repo,
+        what=what,
+        against=against,
+        use_merge_base=use_merge_base,
+        pr=pr,
+        pathspecs=pathspecs,
+    )
     diff = PatchSet.from_string(diff_content)
+    working_copy = review_subject_is_index(what)
 
-    # Filter out binary files
     non_binary_diff = PatchSet([])
     for patched_file in diff:
-        # Check if the file is binary using the source or target file path
-        file_path = patched_file.target_file
-        file_ref = what
-        if file_path == DEV_NULL:
-            file_path = patched_file.source_file
-            file_ref = comparison_base
-        if file_path == DEV_NULL:
+        if patched_file.is_binary_file:
+            # Git already reported the file as binary ("Binary files ... differ"),
+            # no need to read its content
+            logging.info(f"Skipping binary file: {patched_file.path}")
             continue
-        path_in_repo = file_path.removeprefix("a/").removeprefix("b/")
-        if is_binary_file(repo, path_in_repo, ref=file_ref):
+        # Git's detection covers the committed contents; files of the working copy
+        # are also sniffed for invalid UTF-8 (only the beginning of each file is read)
+        if (
+            working_copy
+            and patched_file.target_file != DEV_NULL
+            and is_binary_working_tree_file(repo, patched_file.path)
+        ):
             logging.info(f"Skipping binary file: {patched_file.path}")
             continue
         non_binary_diff.append(patched_file)
     return non_binary_diff
 
 
+def parse_filters(filters: str | list[str]) -> list[str]:
+    """
+    Normalize fnmatch filters given as a comma-separated string or a list of strings.
+    """
+    if not isinstance(filters, (list, str)):
+        raise ValueError("Filters must be a string or a list of strings")
+    if not isinstance(filters, list):
+        filters = [f.strip() for f in filters.split(",") if f.strip()]
+    return filters
+
+
+def filters_to_pathspecs(filters: str | list[str], exclude: bool = False) -> list[str]:
+    """
+    Translate fnmatch filters to Git pathspecs, so `git diff` skips unneeded files early.
+
+    Git's default pathspec matching is fnmatch without FNM_PATHNAME (`*` matches `/`),
+    like fnmatch.fnmatch(), but a pattern without wildcards also matches the contents
+    of the directory it names, and backslashes / `[^...]` are treated differently.
+    Inclusions are translated only if all of them are safe (the result is a superset),
+    exclusions only for safe wildcard patterns; filter_diff() must still be applied.
+    Args:
+        filters (str | list[str]): The fnmatch patterns.
+        exclude (bool): If True, produce `:(exclude)` pathspecs.
+    Returns:
+        list[str]: Git pathspecs (empty list means "no restriction").
+    """
+
+    def translatable(pattern: str) -> bool:
+        return not pattern.startswith(":") and "\\" not in pattern and "[^" not in pattern
+
+    filters = parse_filters(filters)
+    if exclude:
+        filters = [f for f in filters if translatable(f) and any(c in f for c in "*?[")]
+    elif not all(translatable(f) for f in filters):
+        return []
+    magic = ["exclude"] if exclude else []
+    if os.path.normcase("A") == "a":
+        # fnmatch.fnmatch() is case-insensitive on this platform
+        magic.append("icase")
+    prefix = f":({','.join(magic)})" if magic else ""
+    return [prefix + f for f in filters]
+
+
 def filter_diff(
     patch_set: PatchSet | Iterable[PatchedFile],
     filters: str | list[str],
@@ -220,10 +356,7 @@ def filter_diff(
     Returns:
         PatchSet | Iterable[PatchedFile]: The filtered diff.
     """
-    if not isinstance(filters, (list, str)):
-        raise ValueError("Filters must be a string or a list of strings")
-    if not isinstance(filters, list):
-        filters = [f.strip() for f in filters.split(",") if f.strip()]
+    filters = parse_filters(filters)
     if not filters:
         return patch_set
     files = [
@@ -247,22 +380,34 @@ def read_file(repo: Repo, file: str, use_local_files: bool = False) -> str:
             logging.warning(f"Could not read file {file} from working directory: {e}")
 
     # Read from HEAD (committed version)
-    return repo.tree()[file].data_stream.read().decode("utf-8")
+    content = get_blob_reader(repo).read("HEAD", file)
+    if content is None:
+        raise KeyError(file)
+    # Binary files are detected by the beginning of the content only (see is_binary_content)
+    return content.decode("utf-8", errors="replace")
 
 
-def file_lines(repo: Repo, file: str, max_tokens: int = None, use_local_files: bool = False) -> str:
+def file_lines(
+    repo: Repo | None,
+    file: str,
+    max_tokens: int = None,
+    use_local_files: bool = False,
+    read: Callable[[str], str] | None = None,
+) -> str:
     """
     Read file content and return it with line numbers.
     If max_tokens is specified, trims the content to fit within the token limit.
     Args:
-        repo (Repo): The git repository.
+        repo (Repo | None): The git repository.
         file (str): The file path to read.
         max_tokens (int, optional): Maximum number of tokens to return. Defaults to None.
         use_local_files (bool): Whether to read from local working directory first.
+        read (Callable[[str], str], optional): Reads the file instead of the repository
+            (e.g. file contents fetched via the platform API).
     Returns:
         str: The file content with line numbers.
     """
-    text = read_file(repo=repo, file=file, use_local_files=use_local_files)
+    text = read(file) if read else read_file(repo=repo, file=file, use_local_files=use_local_files)
     lines = [f"{i + 1}: {line}\n" for i, line in enumerate(text.splitlines())]
     if max_tokens:
         lines, removed_qty = mc.tokenizing.fit_to_token_size(lines, max_tokens)
@@ -328,45 +473,109 @@ def get_target_diff(
     """
     Get the target diff for review or answering questions.
     Applies filtering based on the provided filters and project configuration.
+    Filters are passed to git as pathspecs, so excluded files are not even diffed.
     Raises NoChangesInContextError if no changes are found after filtering.
     Returns:
         PatchSet | Iterable[PatchedFile]: The filtered diff.
     """
+    include_pathspecs = filters_to_pathspecs(filters)
+    exclude_pathspecs = filters_to_pathspecs(config.exclude_files, exclude=True)
     diff = get_diff(
         repo=repo,
         what=what,
         against=against,
         use_merge_base=use_merge_base,
         pr=pr,
+        pathspecs=include_pathspecs + exclude_pathspecs,
     )
     diff = filter_diff(diff, filters)
-    has_changes_before_exclude = bool(diff)
     if config.exclude_files:
         diff = filter_diff(diff, config.exclude_files, exclude=True)
     if not diff:
-        if has_changes_before_exclude:
+        if config.exclude_files and has_text_changes(
+            repo=repo,
+            what=what,
+            against=against,
+            filters=filters,
+            use_merge_base=use_merge_base,
+            pr=pr,
+        ):
             raise AllChangesExcludedError()
         raise NoChangesInContextError()
     return diff
 
 
-def get_target_lines(
+def has_text_changes(
     repo: Repo,
+    what: str = None,
+    against: str = None,
+    filters: str | list[str] = "",
+    use_merge_base: bool = True,
+    pr: str | int = None,
+) -> bool:
+    """
+    Check whether there are changed non-binary files matching the filters,
+    using `git diff --numstat` instead of building the full diff.
+    """
+    filters = parse_filters(filters)
+    output, _, _ = run_git_diff(
+        repo=repo,
+        what=what,
+        against=against,
+        use_merge_base=use_merge_base,
+        pr=pr,
+        options=["--numstat", "-z"],
+        pathspecs=filters_to_pathspecs(filters),
+    )
+    # -z format: "<added>\t<deleted>\t<path>\0",
+    # or "<added>\t<deleted>\t\0<old_path>\0<new_path>\0" for renames
+    entries = output.split("\0")
+    i = 0
+    while i < len(entries):
+        added, _, deleted_and_path = entries[i].partition("\t")
+        deleted, _, path = deleted_and_path.partition("\t")
+        i += 1
+        if not added:
+            continue
+        if not path:
+            path = entries[i + 1] if i + 1 < len(entries) else ""
+            i += 2
+        is_binary = added == "-" and deleted == "-"
+        if not is_binary and (not filters or any(fnmatch.fnmatch(path, f) for f in filters)):
+            return True
+    return False
+
+
+def uses_local_files(what: str = None) -> bool:
+    """Whether the reviewed file contents are read from the working tree instead of HEAD."""
+    return review_subject_is_index(what) or what == REFS_VALUE_ALL
+
+
+def get_target_lines(
+    repo: Repo | None,
     config: ProjectConfig,
     diff: PatchSet | Iterable[PatchedFile],
     what: str = None,
+    read: Callable[[str], str] | None = None,
 ) -> dict[str, str]:
     """
     Get the lines of code for each file in the diff.
     Returns a dictionary mapping file paths to their respective lines of code.
+    Files are read with the `read` callable if provided, otherwise from the repository.
     """
+    use_local_files = uses_local_files(what)
+    if not use_local_files and not read:
+        get_blob_reader(repo).prefetch(
+            ("HEAD", file_diff.path) for file_diff in diff if file_diff.target_file != DEV_NULL
+        )
     lines = {
         file_diff.path: (
             file_lines(
                 repo,
                 file_diff.path,
                 config.max_code_tokens - mc.tokenizing.num_tokens_from_string(str(file_diff)),
-                use_local_files=review_subject_is_index(what) or what == REFS_VALUE_ALL,
+                use_local_files=use_local_files,
+                read=read,
             )
             if file_diff.target_file != DEV_NULL or what == REFS_VALUE_ALL
             else ""
@@ -399,7 +608,28 @@ def _prepare(
     return repo, cfg, diff, lines
 
 
-def get_affected_code_block(repo: Repo, file: str, start_line: int, end_line: int) -> str | None:
+def _prepare_changes(changes: "ReviewChanges", filters: str | list[str] = ""):
+    """Same as _prepare() for the changes provided without a repository."""
+    cfg = changes.config
+    diff = filter_diff(changes.diff, filters)
+    if cfg.exclude_files:
+        included = filter_diff(diff, cfg.exclude_files, exclude=True)
+        if diff and not included:
+            raise AllChangesExcludedError()
+        diff = included
+    if not diff:
+        raise NoChangesInContextError()
+    lines = get_target_lines(repo=None, config=cfg, diff=diff, read=changes.read_file)
+    return cfg, diff, lines
+
+
+def get_affected_code_block(
+    repo: Repo | None,
+    file: str,
+    start_line: int,
+    end_line: int,
+    read: Callable[[str], str] | None = None,
+) -> str | None:
     if not start_line or not end_line:
         return None
     try:
@@ -407,7 +637,7 @@ def get_affected_code_block(repo: Repo, file: str, start_line: int, end_line: in
             start_line = int(start_line)
         if isinstance(end_line, str):
             end_line = int(end_line)
-        lines = file_lines(repo, file, max_tokens=None, use_local_files=True)
+        lines = file_lines(repo, file, max_tokens=None, use_local_files=True, read=read)
         if lines:
             lines = [""] + lines.splitlines()
             return "\n".join(lines[start_line : end_line + 1])
@@ -418,18 +648,38 @@ def get_affected_code_block(repo: Repo, file: str, start_line: int, end_line: in
     return None
 
 
-def provide_affected_code_blocks(issues: dict, repo: Repo, processing_warnings: list = None):
+def provide_affected_code_blocks(
+    issues: dict,
+    repo: Repo | None,
+    processing_warnings: list = None,
+    read: Callable[[str], str] | None = None,
+):
     """
     For each issue, fetch the affected code text block
     and add it to the issue data.
+    Files are read with the `read` callable if provided, otherwise from the repository.
     """
+    if not read:
+        # Files missing in the working copy are read from HEAD, fetch them in one batch
+        files = {
+            i.get("file", issue.get("file", file))
+            for file, file_issues in issues.items()
+            for issue in file_issues
+            for i in issue.get("affected_lines") or []
+            if isinstance(i, dict)
+        }
+        get_blob_reader(repo).prefetch(
+            ("HEAD", f)
+            for f in files
+            if isinstance(f, str) and not (Path(repo.working_tree_dir) / f).is_file()
+        )
     for file, file_issues in issues.items():
         for issue in file_issues:
             try:
                 for i in issue.get("affected_lines", []):
                     file_name = i.get("file", issue.get("file", file))
                     if block := get_affected_code_block(
-                        repo, file_name, i.get("start_line"), i.get("end_line")
+                        repo, file_name, i.get("start_line"), i.get("end_line"), read
                     ):
                         i["affected_code"] = block
             except Exception as e:
@@ -444,135 +694,547 @@ def provide_affected_code_blocks(issues: dict, repo: Repo, processing_warnings:
                 )
 
 
+def needs_escalation(res_or_error: list[dict] | Exception | None, max_severity: int) -> bool:
+    """
+    Whether the file reviewed by the triage model should be reviewed by the main model:
+    the triage failed, or found issues with severity up to max_severity (1 is the highest).
+    """
+    if not isinstance(res_or_error, list):
+        return True
+    for issue in res_or_error:
+        try:
+            if int(issue.get("severity")) <= max_severity:
+                return True
+        except (TypeError, ValueError):
+            continue
+    return False
+
+
+def _response_warning(
+    res_or_error: Exception | None, file: str, file_label: str = None
+) -> ProcessingWarning:
+    """Describe the failed LLM review request of the file."""
+    file_label = file_label or file
+    if res_or_error is None:
+        # JSON parsing or validation failed (allow_failures=True returns None,
+        # not an Exception). Surface this silently-dropped failure as a warning
+        # so the report doesn't misleadingly show 0 issues.
+        message = (
+            f"File {file_label} was skipped: "
+            f"LLM response failed JSON parsing or validation. "
+            f"The model output was malformed or did not pass the response validator."
+        )
+    elif isinstance(res_or_error, mc.LLMContextLengthExceededError):
+        message = f'File "{file_label}" was skipped due to large size: {str(res_or_error)}.'
+    else:
+        message = (
+            f"File {file_label} was skipped due to error: "
+            f"[{type(res_or_error).__name__}] {res_or_error}"
+        )
+        if not message.endswith("."):
+            message += "."
+    return ProcessingWarning(message=message, file=file)
+
+
+def make_review_inputs(
+    repo: Repo | None,
+    cfg: ProjectConfig,
+    file_diff: PatchedFile,
+    lines: dict[str, str],
+    input_is_diff: bool,
+    what: str = None,
+    read: Callable[[str], str] | None = None,
+) -> list[tuple[PatchedFile | str, str | None]]:
+    """
+    Build the (input, file_lines) prompt arguments for reviewing the file.
+    Diffs exceeding max_code_tokens are split into chunks of hunks fitting the limit,
+    each provided with the surrounding file lines instead of the full file.
+    """
+    path = file_diff.path
+    if num_tokens(file_diff) <= cfg.max_code_tokens:
+        if input_is_diff:
+            return [(file_diff, lines[path])]
+        return [(str(path) + ":\n" + lines[path], None)]
+
+    text_lines = []
+    if file_diff.target_file != DEV_NULL or what == REFS_VALUE_ALL:
+        try:
+            text = read(path) if read else read_file(repo, path, uses_local_files(what))
+            text_lines = text.splitlines()
+        except KeyError:
+            logging.warning(f"Could not read file {path}")
+    if input_is_diff:
+        chunks = split_file_diff(file_diff, cfg.max_code_tokens // 2)
+        inputs = [
+            (
+                chunk,
+                numbered_lines_window(
+                    text_lines,
+                    chunk,
+                    cfg.chunk_context_lines,
+                    cfg.max_code_tokens - num_tokens(chunk),
+                ),
+            )
+            for chunk in chunks
+        ]
+    else:
+        chunks = split_file_diff(file_diff, cfg.max_code_tokens)
+        inputs = []
+        for chunk in chunks:
+            start, end = target_line_range(chunk)
+            numbered = "".join(
+                f"{i}: {text_lines[i - 1]}\n" for i in range(start, min(end, len(text_lines)) + 1)
+            )
+            inputs.append((str(path) + ":\n" + numbered, None))
+    logging.info(
+        f"Diff of {ui.cyan(path)} exceeds max_code_tokens, reviewing in {len(inputs)} chunks"
+    )
+    return inputs
+
+
 def _llm_response_validator(parsed_response: list[dict]):
     """
     Validate that the LLM response is a list of dicts that can be converted to RawIssue.
+    Issues of the packed multi-file requests additionally contain the "file" field.
     """
     if not isinstance(parsed_response, list):
         raise ValueError("Response is not a list")
     for item in parsed_response:
         if not isinstance(item, dict):
             raise ValueError("Response item is not a dict")
-        RawIssue(**item)
+        RawIssue(**{k: v for k, v in item.items() if k != "file"})
     return True
 
 
+def get_reviewed_sha(repo: Repo, what: str = None) -> str | None:
+    """
+    Resolve the commit SHA of the reviewed ref.
+    Returns None for the working copy and full codebase reviews.
+    """
+    if review_subject_is_index(what) or what == REFS_VALUE_ALL:
+        return None
+    try:
+        return repo.commit(what).hexsha
+    except Exception as e:
+        logging.warning(f"Could not resolve commit SHA of {what}: {e}")
+        return None
+
+
+def load_previous_report(file_name: str | os.PathLike) -> Report | None:
+    """Load the report of the previous review run, if available."""
+    try:
+        return Report.load(file_name)
+    except FileNotFoundError:
+        logging.warning(f"Previous review report not found at {mc.utils.file_link(file_name)}")
+    except Exception as e:
+        logging.warning(f"Could not load previous review report: {e}")
+    return None
+
+
+def plan_incremental_review(
+    repo: Repo,
+    diff: PatchSet | Iterable[PatchedFile],
+    previous_report: Report,
+    head_sha: str | None,
+    filters: str | list[str] | None = None,
+) -> tuple[list[PatchedFile], dict[str, list[dict]]] | None:
+    """
+    Split the diff into files changed since the commit reviewed in the previous report
+    and files whose issues can be carried forward from that report.
+    Carried forward files have the same content as in the previous review,
+    so their issue line numbers stay valid; renamed files are followed.
+    Returns:
+        Files to review and carried forward issues by file,
+        or None if an incremental review is not possible.
+    """
+    last_sha = previous_report.head_sha
+    if not last_sha or not head_sha:
+        logging.warning("Previous reviewed commit is unknown, performing full review")
+        return None
+    previous_filters = previous_report.target.filters if previous_report.target else None
+    if parse_filters(previous_filters or "") != parse_filters(filters or ""):
+        logging.warning("File filters differ from the previous review, performing full review")
+        return None
+    try:
+        # -z format: "<status>\0<path>\0" or "<R|C><score>\0<old_path>\0<new_path>\0"
+        entries = repo.git.diff("--name-status", "-z", "-M", last_sha, head_sha).split("\0")
+    except GitCommandError as e:
+        logging.warning(f"Can't compare with previously reviewed commit {last_sha}: {e}")
+        return None
+    changed, renamed_from = set(), {}
+    i = 0
+    while i < len(entries):
+        status = entries[i]
+        if not status:
+            i += 1
+        elif status[0] in "RC":
+            old_path, new_path = entries[i + 1], entries[i + 2]
+            if status == "R100":
+                renamed_from[new_path] = old_path
+            else:
+                changed.add(new_path)
+            i += 3
+        else:
+            changed.add(entries[i + 1])
+            i += 2
+
+    failed = {w.file for w in previous_report.processing_warnings if w.file}
+    to_review, carried_issues = [], {}
+    for file in diff:
+        previous_path = renamed_from.get(file.path, file.path)
+        if file.path in changed or previous_path in failed:
+            to_review.append(file)
+            continue
+        file_issues = []
+        for issue in previous_report.issues.get(previous_path, []):
+            data = asdict(issue)
+            data.pop("id")
+            data["file"] = file.path
+            for block in data["affected_lines"]:
+                if block.get("file") == previous_path:
+                    block["file"] = file.path
+            file_issues.append(data)
+        if file_issues:
+            carried_issues[file.path] = file_issues
+    logging.info(
+        f"Incremental review since {ui.cyan(last_sha[:8])}: "
+        f"{ui.green(len(to_review))} file(s) to review, "
+        f"{ui.yellow(len(diff) - len(to_review))} file(s) unchanged"
+    )
+    return to_review, carried_issues
+
+
 async def review(
     target: ReviewTarget,
     repo: Repo = None,
     out_folder: str | os.PathLike | None = None,
-):
+    incremental: bool = False,
+    scheduler: LLMScheduler | None = None,
+    changes: "ReviewChanges | None" = None,
+) -> Report | None:
     """
     Conducts a code review.
     Prints the review report to the console and saves it to a file.
+    Args:
+        incremental (bool): Review only files changed since the commit reviewed
+            in the previous JSON report (from the output folder), carrying forward other issues.
+            The previous report must be available locally (e.g. restored from the CI cache).
+        scheduler (LLMScheduler | None): Scheduler shared with other reviews (e.g. batch review),
+            its limits apply instead of the llm_rpm_limit / llm_tpm_limit settings.
+        changes (ReviewChanges | None): Changes provided without a repository
+            (patch, changes fetched via the platform API, see gito.patch_review,
+            gito.remote_review), reviewed instead of the local repository changes.
+    Returns:
+        Report | None: The review report, None if there are no changes to review.
     """
+    if changes and incremental:
+        raise ValueError("Incremental review requires a local repository")
+    read = changes.read_file if changes else None
     try:
-        repo, cfg, diff, lines = _prepare(
-            repo=repo,
-            what=target.what,
-            against=target.against,
-            filters=target.filters,
-            use_merge_base=target.use_merge_base,
-            pr=target.pull_request_id,
-        )
+        if changes:
+            cfg, diff, lines = _prepare_changes(changes, target.filters)
+        else:
+            # Git commands and file reads block, keep the event loop serving concurrent reviews
+            repo, cfg, diff, lines = await asyncio.to_thread(
+                _prepare,
+                repo=repo,
+                what=target.what,
+                against=target.against,
+                filters=target.filters,
+                use_merge_base=target.use_merge_base,
+                pr=target.pull_request_id,
+            )
     except AllChangesExcludedError:
         ui.warning("All changes belong to excluded files, nothing to review.")
         return
     except NoChangesInContextError:
         logging.error("No changes to review")
         return
+    out_folder = Path(out_folder or (repo.working_tree_dir if repo else "."))
+    head_sha = changes.head_sha if changes else await asyncio.to_thread(
+        get_reviewed_sha, repo, target.what
+    )
+    review_diff, carried_issues, previous_report = diff, {}, None
+    if incremental:
+        previous_report = load_previous_report(out_folder / JSON_REPORT_FILE_NAME)
+    if previous_report:
+        if plan := plan_incremental_review(repo, diff, previous_report, head_sha, target.filters):
+            review_diff, carried_issues = plan
+        else:
+            previous_report = None
 
     def input_is_diff(file_diff: PatchedFile) -> bool:
         """
         In case of reviewing all changes, or added files,
         we provide full file content as input.
         Otherwise, we provide the diff and additional file lines separately.
+        Without file contents (diff-only review), the diff is the only input.
         """
+        if changes and not changes.has_file_contents:
+            return True
         return not target.is_full_codebase_review() and not file_diff.is_added_file
 
-    responses = await mc.llm_parallel(
-        [
+    review_inputs = [
+        make_review_inputs(
+            repo, cfg, file_diff, lines, input_is_diff(file_diff), target.what, read
+        )
+        for file_diff in review_diff
+    ]
+    packs = pack_review_inputs(review_inputs, cfg.pack_files_max_tokens)
+    packed_files = {file_index for pack in packs for file_index in pack}
+    prompts = []
+    # Indices of the reviewed files (in review_diff) for each prompt:
+    # files exceeding max_code_tokens are reviewed in several chunks,
+    # small files may be packed into a single prompt
+    prompt_files: list[list[int]] = []
+    for file_index, inputs in enumerate(review_inputs):
+        if file_index in packed_files:
+            continue
+        for code_input, file_lines_input in inputs:
+            prompts.append(
+                mc.prompt(
+                    cfg.prompt, input=code_input, file_lines=file_lines_input, **cfg.prompt_vars
+                )
+            )
+            prompt_files.append([file_index])
+    for pack in packs:
+        prompts.append(
             mc.prompt(
                 cfg.prompt,
-                input=(
-                    file_diff
-                    if input_is_diff(file_diff)
-                    else str(file_diff.path) + ":\n" + lines[file_diff.path]
+                input="\n".join(str(review_inputs[i][0][0]) for i in pack),
+                file_lines="\n".join(
+                    f"{review_diff[i].path}:\n{review_inputs[i][0][1]}"
+                    for i in pack
+                    if review_inputs[i][0][1]
                 ),
-                file_lines=lines[file_diff.path] if input_is_diff(file_diff) else None,
+                packed_files=[review_diff[i].path for i in pack],
                 **cfg.prompt_vars,
             )
-            for file_diff in diff
-        ],
-        retries=cfg.retries,
-        parse_json={"validator": _llm_response_validator},
-        allow_failures=True,
-    )
-    processing_warnings: list[ProcessingWarning] = []
-    for i, (res_or_error, file) in enumerate(zip(responses, diff)):
-        if res_or_error is None:
-            # JSON parsing or validation failed (allow_failures=True returns None,
-            # not an Exception). Surface this silently-dropped failure as a warning
-            # so the report doesn't misleadingly show 0 issues.
-            message = (
-                f"File {file.path} was skipped: "
-                f"LLM response failed JSON parsing or validation. "
-                f"The model output was malformed or did not pass the response validator."
-            )
-            processing_warnings.append(
-                ProcessingWarning(
-                    message=message,
-                    file=file.path,
-                )
-            )
-            responses[i] = []
-        elif isinstance(res_or_error, Exception):
-            if isinstance(res_or_error, mc.LLMContextLengthExceededError):
-                message = f'File "{file.path}" was skipped due to large size: {str(res_or_error)}.'
-            else:
-                message = (
-                    f"File {file.path} was skipped due to error: "
-                    f"[{type(res_or_error).__name__}] {res_or_error}"
-                )
-                if not message.endswith("."):
-                    message += "."
-            processing_warnings.append(
-                ProcessingWarning(
-                    message=message,
-                    file=file.path,
-                )
-            )
-            responses[i] = []
-
-    issues = {file.path: issues for file, issues in zip(diff, responses) if issues}
-    provide_affected_code_blocks(issues, repo, processing_warnings)
-    exec(cfg.post_process, {"mc": mc, **locals()})
-    out_folder = Path(out_folder or repo.working_tree_dir)
-    out_folder.mkdir(parents=True, exist_ok=True)
-    report = Report(
-        target=target,
-        number_of_processed_files=len(diff),
-        processing_warnings=processing_warnings,
+        )
+        prompt_files.append(pack)
+    if packs:
+        logging.info(
+            f"{ui.green(len(packed_files))} small files packed into {ui.green(len(packs))} requests"
+        )
+    chunks_per_file = Counter(files[0] for files in prompt_files if len(files) == 1)
+    cache = (
+        ReviewCache.for_git_dir(repo.common_dir, cfg.review_cache_max_size_mb * 2**20)
+        if cfg.review_cache and repo
+        else None
     )
-    report.register_issues(issues)
+    cache_model = ReviewCache.current_model()
+    if cfg.triage_model:
+        # Results of the model cascade differ from results of the main model alone
+        cache_model += f" (triage: {cfg.triage_model})"
+    cache_keys = [ReviewCache.make_key(p, cache_model) for p in prompts] if cache else []
+    responses = [cache.get(key) for key in cache_keys] if cache else [None] * len(prompts)
+    pending = [i for i, res in enumerate(responses) if res is None]
+    if cache:
+        logging.info(
+            f"LLM review cache: {ui.green(cache.hits)} hit(s), {ui.yellow(cache.misses)} miss(es)"
+        )
+    report = Report(target=target, number_of_processed_files=len(diff), head_sha=head_sha)
     ctx = Context(
         report=report,
         config=cfg,
         diff=diff,
         repo=repo,
     )
-    if cfg.pipeline_steps:
-        pipe = Pipeline(ctx=ctx, steps=cfg.pipeline_steps)
-        pipe.run()
+    pipe = Pipeline(ctx=ctx, steps=cfg.pipeline_steps) if cfg.pipeline_steps else None
+    scheduler = scheduler or LLMScheduler.from_config(cfg.llm_rpm_limit, cfg.llm_tpm_limit)
+    deadline_exceeded = 0
+    cascade_stats = Counter(triaged=0, escalated=0)
+    # Warnings are collected per prompt to keep them in the prompt order
+    prompt_warnings: list[list[ProcessingWarning]] = [[] for _ in prompts]
+    file_responses: list[list[list[dict]]] = [[] for _ in review_diff]
+    # Prompts of each file and the number of prompts left to complete its review
+    file_prompts: list[list[int]] = [[] for _ in review_diff]
+    chunk_numbers = {}
+    for i, files in enumerate(prompt_files):
+        for file_index in files:
+            file_prompts[file_index].append(i)
+        if len(files) == 1:
+            chunk_numbers[i] = len(file_prompts[files[0]])
+    prompts_left = Counter({file_index: len(p) for file_index, p in enumerate(file_prompts)})
+    issues = {}
+    code_block_warnings: list[ProcessingWarning] = []
+    out_folder.mkdir(parents=True, exist_ok=True)
+    partial_report = PartialReport(out_folder / PARTIAL_REPORT_FILE_NAME)
+
+    def handle_response(i: int, res_or_error: list[dict] | Exception | None):
+        """
+        Process the response to the prompt as soon as it is received,
+        completely reviewed files are written to the partial report.
+        """
+        files = prompt_files[i]
+        if not isinstance(res_or_error, list):
+            for file_index in files:
+                file_label = review_diff[file_index].path
+                if len(files) == 1 and chunks_per_file[file_index] > 1:
+                    file_label += f" (part {chunk_numbers[i]} of {chunks_per_file[file_index]})"
+                prompt_warnings[i].append(
+                    _response_warning(res_or_error, review_diff[file_index].path, file_label)
+                )
+            res_or_error = []
+        if len(files) == 1:
+            file_responses[files[0]].append(res_or_error)
+        else:
+            for file_index, file_issues in zip(
+                files, split_packed_issues(res_or_error, [review_diff[f].path for f in files])
+            ):
+                file_responses[file_index].append(file_issues)
+        for file_index in files:
+            prompts_left[file_index] -= 1
+            if prompts_left[file_index]:
+                continue
+            path = review_diff[file_index].path
+            results = file_responses[file_index]
+            file_issues = merge_issue_lists(results) if len(results) > 1 else results[0]
+            file_warnings = []
+            if file_issues:
+                issues[path] = file_issues
+                provide_affected_code_blocks({path: file_issues}, repo, file_warnings, read)
+                code_block_warnings.extend(file_warnings)
+            partial_report.add_file(
+                path,
+                file_issues,
+                [w for p in file_prompts[file_index] for w in prompt_warnings[p]] + file_warnings,
+            )
+
+    # Steps using only the review input run concurrently with the LLM requests
+    input_only_steps = asyncio.create_task(pipe.arun(input_only=True)) if pipe else None
+    try:
+        with partial_report:
+            for i, res in enumerate(responses):
+                if res is not None:
+                    handle_response(i, res)
+            if pending:
+                prompt_tokens = {i: num_tokens(prompts[i]) for i in pending}
+                diff_order = list(pending)
+                # Longest-processing-time first: the largest requests are submitted first,
+                # so that none of them is left running alone at the end of the review
+                pending.sort(key=lambda i: prompt_tokens[i], reverse=True)
+                started_at = time.monotonic()
+
+                async def send(i: int, model: str = None):
+                    # Each prompt is sent separately to process responses as they arrive,
+                    # llm_parallel handles retries, JSON validation and failures of the request
+                    responses = await mc.llm_parallel(
+                        [prompts[i]],
+                        retries=cfg.retries,
+                        parse_json={"validator": _llm_response_validator},
+                        allow_failures=True,
+                        **({"model": model} if model else {}),
+                    )
+                    return responses[0]
+
+                def is_valid(res) -> bool:
+                    return isinstance(res, list)
+
+                async def request(i: int):
+                    if cfg.triage_model:
+                        # Model cascade: the triage model reviews first,
+                        # the main model reviews only files with severe findings
+                        res_or_error = await scheduler.run_hedged(
+                            partial(send, i, cfg.triage_model), cfg.hedge_after, is_valid
+                        )
+                        cascade_stats["triaged"] += 1
+                        if not needs_escalation(res_or_error, cfg.triage_escalation_severity):
+                            return i, res_or_error
+                        cascade_stats["escalated"] += 1
+                    res_or_error = await scheduler.run_hedged(
+                        partial(send, i), cfg.hedge_after, is_valid
+                    )
+                    return i, res_or_error
+
+                completed = set()
+                with scheduler.install():
+                    tasks = [asyncio.ensure_future(request(i)) for i in pending]
+                    try:
+                        for next_completed in asyncio.as_completed(
+                            tasks, timeout=cfg.review_deadline or None
+                        ):
+                            i, res_or_error = await next_completed
+                            completed.add(i)
+                            if cache and isinstance(res_or_error, list):
+                                cache.put(cache_keys[i], res_or_error)
+                            handle_response(i, res_or_error)
+                    except asyncio.TimeoutError:
+                        outstanding = [i for i in pending if i not in completed]
+                        deadline_exceeded = len(outstanding)
+                        logging.warning(
+                            f"Review deadline ({cfg.review_deadline}s) exceeded, "
+                            f"abandoning {ui.yellow(deadline_exceeded)} outstanding LLM request(s)"
+                        )
+                        error = TimeoutError(f"review deadline of {cfg.review_deadline}s exceeded")
+                        for i in outstanding:
+                            handle_response(i, error)
+                    finally:
+                        for task in tasks:
+                            task.cancel()
+                if Env.verbosity > 1 and scheduler.seconds_per_token:
+                    workers = scheduler.peak_concurrency
+                    predicted, predicted_in_diff_order = (
+                        estimate_makespan(
+                            [prompt_tokens[i] * scheduler.seconds_per_token for i in order], workers
+                        )
+                        for order in (pending, diff_order)
+                    )
+                    logging.info(
+                        f"LLM requests makespan with {workers} parallel requests: "
+                        f"predicted {ui.green(f'{predicted:.1f}s')} "
+                        f"(in diff order: {predicted_in_diff_order:.1f}s), "
+                        f"actual {ui.green(f'{time.monotonic() - started_at:.1f}s')}"
+                    )
+                if cache:
+                    cache.evict()
+        processing_warnings: list[ProcessingWarning] = [
+            w for warnings in prompt_warnings for w in warnings
+        ] + code_block_warnings
+        # Keep the diff order of files
+        issues = {file.path: issues[file.path] for file in review_diff if file.path in issues}
+        exec(cfg.post_process, {"mc": mc, **locals()})
+        if carried_issues:
+            # Keep the diff order of files
+            order = {file.path: i for i, file in enumerate(diff)}
+            merged = carried_issues | issues
+            issues = dict(sorted(merged.items(), key=lambda item: order.get(item[0], len(order))))
+        report.processing_warnings = processing_warnings
+        if cache:
+            report.stats["review_cache"] = cache.stats
+        if scheduler.requests or scheduler.rate_limited:
+            report.stats["llm_scheduler"] = scheduler.stats
+        if deadline_exceeded:
+            report.stats["deadline_exceeded_requests"] = deadline_exceeded
+        if cascade_stats["triaged"]:
+            report.stats["model_cascade"] = dict(cascade_stats)
+        if previous_report:
+            report.stats["incremental"] = {
+                "since_sha": previous_report.head_sha,
+                "reviewed_files": len(review_diff),
+                "unchanged_files": len(diff) - len(review_diff),
+            }
+        report.register_issues(issues)
+        if pipe:
+            await input_only_steps
+    finally:
+        if input_only_steps and not input_only_steps.done():
+            # The review failed or was cancelled: don't leave the steps running
+            input_only_steps.cancel()
+            await asyncio.gather(input_only_steps, return_exceptions=True)
+    if pipe:
+        await pipe.arun(input_only=False)
     else:
         logging.info("No pipeline steps defined, skipping pipeline execution")
 
     report.summary = await make_cr_summary(ctx)
-    report.save(file_name=out_folder / JSON_REPORT_FILE_NAME)
+    report.save(file_name=out_folder / JSON_REPORT_FILE_NAME, compact=cfg.compact_json_report)
+    partial_report.remove()
     report_text = report.render(cfg, Report.Format.MARKDOWN)
     text_report_path = out_folder / "code-review-report.md"
     text_report_path.write_text(report_text, encoding="utf-8")
     report.to_cli()
+    return report
 
 
 def answer(
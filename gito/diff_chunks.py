@@ -0,0 +1,186 @@
+"""
+Shaping of per-file review inputs into LLM requests:
+splitting oversized file diffs into chunks that fit the context window
+and packing small ones into shared requests.
+"""
+
+import logging
+
+import microcore as mc
+from unidiff import Hunk, PatchedFile
+from unidiff.patch import LINE_TYPE_ADDED, LINE_TYPE_CONTEXT, LINE_TYPE_REMOVED
+
+
+def num_tokens(text) -> int:
+    return mc.tokenizing.num_tokens_from_string(str(text))
+
+
+def _empty_copy(file_diff: PatchedFile) -> PatchedFile:
+    return PatchedFile(
+        patch_info=file_diff.patch_info,
+        source=file_diff.source_file,
+        target=file_diff.target_file,
+        source_timestamp=file_diff.source_timestamp,
+        target_timestamp=file_diff.target_timestamp,
+    )
+
+
+def split_hunk(hunk: Hunk, max_tokens: int) -> list[Hunk]:
+    """
+    Split the hunk into smaller hunks with consistent headers, each fitting max_tokens
+    (except single lines exceeding the limit).
+    """
+    if num_tokens(hunk) <= max_tokens:
+        return [hunk]
+    parts = []
+    source_line, target_line = hunk.source_start, hunk.target_start
+    part, part_tokens = None, 0
+    for line in hunk:
+        line_tokens = num_tokens(line)
+        if part is None or (part and part_tokens + line_tokens > max_tokens):
+            part = Hunk(source_line, 0, target_line, 0, hunk.section_header)
+            parts.append(part)
+            part_tokens = num_tokens(part)
+        part.append(line)
+        part_tokens += line_tokens
+        if line.line_type in (LINE_TYPE_CONTEXT, LINE_TYPE_REMOVED):
+            part.source_length += 1
+            source_line += 1
+        if line.line_type in (LINE_TYPE_CONTEXT, LINE_TYPE_ADDED):
+            part.target_length += 1
+            target_line += 1
+    return parts
+
+
+def split_file_diff(file_diff: PatchedFile, max_tokens: int) -> list[PatchedFile]:
+    """
+    Split the file diff into several diffs of the same file containing groups of hunks,
+    each fitting max_tokens.
+    Hunks exceeding the limit are split into smaller ones.
+    """
+    header_tokens = num_tokens(_empty_copy(file_diff))
+    hunk_budget = max(max_tokens - header_tokens, 1)
+    chunks = []
+    chunk, chunk_tokens = None, 0
+    for hunk in file_diff:
+        for part in split_hunk(hunk, hunk_budget):
+            part_tokens = num_tokens(part)
+            if chunk is None or chunk_tokens + part_tokens > hunk_budget:
+                chunk, chunk_tokens = _empty_copy(file_diff), 0
+                chunks.append(chunk)
+            chunk.append(part)
+            chunk_tokens += part_tokens
+    return chunks
+
+
+def target_line_range(file_diff: PatchedFile) -> tuple[int, int]:
+    """First and last line of the target file covered by the (non-empty) file diff."""
+    start = file_diff[0].target_start
+    end = file_diff[-1].target_start + file_diff[-1].target_length - 1
+    return start, max(start, end)
+
+
+def numbered_lines_window(
+    lines: list[str],
+    file_diff: PatchedFile,
+    context_lines: int,
+    max_tokens: int,
+) -> str:
+    """
+    Return target file lines surrounding the hunks of the file diff with line numbers,
+    trimmed to fit max_tokens.
+    Args:
+        lines (list[str]): Target file lines.
+        file_diff (PatchedFile): Diff (chunk) of the file.
+        context_lines (int): Number of lines to include before and after each hunk.
+        max_tokens (int): Maximum number of tokens to return.
+    """
+    ranges = []
+    for hunk in file_diff:
+        start = max(hunk.target_start - context_lines, 1)
+        end = min(hunk.target_start + hunk.target_length - 1 + context_lines, len(lines))
+        if ranges and start <= ranges[-1][1] + 1:
+            ranges[-1][1] = max(ranges[-1][1], end)
+        elif start <= end:
+            ranges.append([start, end])
+    out = []
+    for start, end in ranges:
+        if out or start > 1:
+            out.append("...\n")
+        out.extend(f"{i}: {lines[i - 1]}\n" for i in range(start, end + 1))
+    out, removed_qty = mc.tokenizing.fit_to_token_size(out, max(max_tokens, 0))
+    if removed_qty:
+        out.append(f"(!) DISPLAYING ONLY {len(out)} LINES DUE TO LARGE FILE SIZE\n")
+    return "".join(out)
+
+
+def merge_issue_lists(issue_lists: list[list[dict]]) -> list[dict]:
+    """Merge issues reported for chunks of the same file, dropping duplicates."""
+    merged, seen = [], set()
+    for issues in issue_lists:
+        for issue in issues:
+            key = (
+                str(issue.get("title", "")).strip().lower(),
+                tuple(
+                    (i.get("start_line"), i.get("end_line"))
+                    for i in issue.get("affected_lines") or []
+                    if isinstance(i, dict)
+                ),
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(issue)
+    return merged
+
+
+def pack_review_inputs(
+    review_inputs: list[list[tuple]],
+    max_tokens: int,
+) -> list[list[int]]:
+    """
+    Bin-pack the review inputs of small files into groups fitting max_tokens
+    (first-fit decreasing), files reviewed in chunks are never packed.
+    Args:
+        review_inputs (list[list[tuple]]): (input, file_lines) pairs for each file.
+        max_tokens (int): Token budget of a packed request, 0 disables packing.
+    Returns:
+        list[list[int]]: Groups of indices of packed files (two or more files in each group).
+    """
+    if not max_tokens:
+        return []
+    sizes = {
+        i: num_tokens(inputs[0][0]) + num_tokens(inputs[0][1] or "")
+        for i, inputs in enumerate(review_inputs)
+        if len(inputs) == 1
+    }
+    bins: list[tuple[int, list[int]]] = []
+    for i in sorted(sizes, key=lambda i: -sizes[i]):
+        if sizes[i] > max_tokens:
+            continue
+        for b, (used, items) in enumerate(bins):
+            if used + sizes[i] <= max_tokens:
+                bins[b] = (used + sizes[i], items + [i])
+                break
+        else:
+            bins.append((sizes[i], [i]))
+    return sorted((sorted(items) for _, items in bins if len(items) > 1), key=lambda g: g[0])
+
+
+def split_packed_issues(issues: list[dict], paths: list[str]) -> list[list[dict]]:
+    """
+    Distribute issues of a packed multi-file request between the files by their "file" field.
+    Returns issue lists in the order of paths.
+    """
+    out = {path: [] for path in paths}
+    for issue in issues:
+        file = str(issue.get("file") or "").strip()
+        if file not in out and file[:2] in ("a/", "b/"):
+            file = file[2:]
+        if file not in out:
+            logging.warning(
+                f"Dropping issue \"{issue.get('title')}\" reported for unknown file \"{file}\""
+            )
+            continue
+        out[file].append({k: v for k, v in issue.items() if k != "file"})
+    return list(out.values())
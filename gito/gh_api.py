@@ -1,20 +1,28 @@
 import os
 import logging
+from typing import TYPE_CHECKING
+from urllib.parse import quote
 
 import requests
 import git
-from fastcore.basics import AttrDict  # objects returned by ghapi
-from ghapi.core import GhApi
 
 from .project_config import ProjectConfig
 from .utils.git_platform.shared import get_repo_owner_and_name
+from .utils.http_session import http_session
+
+if TYPE_CHECKING:
+    from fastcore.basics import AttrDict  # objects returned by ghapi
+    from ghapi.core import GhApi
 
 
 def gh_api(
     repo: git.Repo = None,  # used to resolve owner/repo
     config: ProjectConfig | None = None,  # used to resolve owner/repo
     token: str | None = None,
-) -> GhApi:
+) -> "GhApi":
+    # ghapi is imported on first use to keep the CLI startup fast
+    from ghapi.core import GhApi
+
     if repo:
         # resolve owner/repo from repo.remotes.origin.url
         owner, repo_name = get_repo_owner_and_name(repo)
@@ -40,6 +48,82 @@ def resolve_gh_token(token_or_none: str | None = None) -> str | None:
     return token_or_none or os.getenv("GITHUB_TOKEN", None) or os.getenv("GH_TOKEN", None)
 
 
+def gh_api_url(api_url: str | None = None) -> str:
+    """
+    GitHub REST API base URL.
+    GITHUB_API_URL env var is set by GitHub Actions (also on GitHub Enterprise Server).
+    """
+    return (api_url or os.getenv("GITHUB_API_URL") or "https://api.github.com").rstrip("/")
+
+
+def _gh_get(
+    path: str,
+    token: str | None,
+    accept: str = "application/vnd.github+json",
+    api_url: str | None = None,
+    params: dict | None = None,
+) -> requests.Response:
+    headers = {"Accept": accept}
+    if token:
+        headers["Authorization"] = f"token {token}"
+    return http_session().get(f"{gh_api_url(api_url)}{path}", headers=headers, params=params)
+
+
+def get_gh_pr_info(
+    gh_repository: str, pr: int | str, token: str | None = None, api_url: str | None = None
+) -> dict:
+    """
+    Fetch GitHub pull request metadata (incl. head / base commits).
+    Raises:
+        requests.HTTPError: If the request fails.
+    """
+    resp = _gh_get(f"/repos/{gh_repository}/pulls/{pr}", token, api_url=api_url)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def get_gh_pr_diff(
+    gh_repository: str, pr: int | str, token: str | None = None, api_url: str | None = None
+) -> str:
+    """
+    Fetch the unified diff of the GitHub pull request.
+    Raises:
+        requests.HTTPError: If the request fails.
+    """
+    resp = _gh_get(
+        f"/repos/{gh_repository}/pulls/{pr}", token, "application/vnd.github.diff", api_url
+    )
+    resp.raise_for_status()
+    return resp.content.decode("utf-8", errors="replace")
+
+
+def get_gh_file_content(
+    gh_repository: str,
+    path: str,
+    ref: str,
+    token: str | None = None,
+    api_url: str | None = None,
+) -> bytes | None:
+    """
+    Fetch the raw content of the file at the given ref (commit SHA, branch or tag).
+    Returns:
+        bytes | None: The file content, None if the file does not exist at the ref.
+    Raises:
+        requests.HTTPError: If the request fails.
+    """
+    resp = _gh_get(
+        f"/repos/{gh_repository}/contents/{quote(path)}",
+        token,
+        "application/vnd.github.raw",
+        api_url,
+        params={"ref": ref},
+    )
+    if resp.status_code == 404:
+        return None
+    resp.raise_for_status()
+    return resp.content
+
+
 def post_gh_comment(
     gh_repository: str,  # e.g. "owner/repo"
     pr_or_issue_number: int,
@@ -63,7 +147,7 @@ def post_gh_comment(
     }
     data = {"body": text}
 
-    resp = requests.post(api_url, headers=headers, json=data)
+    resp = http_session().post(api_url, headers=headers, json=data)
     if 200 <= resp.status_code < 300:
         logging.info(f"Posted review comment to #{pr_or_issue_number} in {gh_repository}")
         return True
@@ -73,7 +157,7 @@ def post_gh_comment(
 
 
 def hide_gh_comment(
-    comment: dict | str | AttrDict, token: str = None, reason: str = "OUTDATED"
+    comment: "dict | str | AttrDict", token: str = None, reason: str = "OUTDATED"
 ) -> bool:
     """
     Hide a GitHub comment using GraphQL API with specified reason.
@@ -85,6 +169,8 @@ def hide_gh_comment(
         token (str): GitHub personal access token with permissions to minimize comments.
         reason (str): The reason for hiding the comment, e.g., "OUTDATED".
     """
+    from fastcore.basics import AttrDict
+
     comment_node_id = comment.node_id if isinstance(comment, AttrDict) else comment
     token = resolve_gh_token(token)
     mutation = """
@@ -94,7 +180,7 @@ def hide_gh_comment(
         }
     }"""
 
-    response = requests.post(
+    response = http_session().post(
         "https://api.github.com/graphql",
         headers={"Authorization": f"Bearer {token}"},
         json={"query": mutation, "variables": {"commentId": comment_node_id, "reason": reason}},
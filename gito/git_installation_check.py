@@ -5,8 +5,6 @@ Checks if Git is installed; if not, provides installation instructions.
 import platform
 import sys
 
-from microcore import ui
-
 
 def ensure_git_installed() -> None:
     """Ensures that Git is installed on the system."""
@@ -18,6 +16,9 @@ def ensure_git_installed() -> None:
 
 def _exit_with_git_instructions() -> None:
     """Exits the program with instructions to install Git."""
+    # Imported only when needed: microcore is slow to import and most CLI commands don't use it
+    from microcore import ui
+
     cmd = _get_git_install_command()
     app_name = f"{ui.bright}Gito AI Code Reviewer{ui.reset}{ui.red}"
     msg_begin = (
@@ -7,11 +7,11 @@ import logging
 import os
 import re
 from typing import List, Dict, Optional, Tuple
-
-import requests
+from urllib.parse import quote
 
 from .constants import HTML_INLINE_CR_COMMENT_MARKER
 from .report_struct import Issue
+from .utils.http_session import http_session
 
 
 def resolve_gl_token(token: str | None) -> Optional[str]:
@@ -49,7 +49,7 @@ def _gl_paginated_get(
             f"{_gl_mr_url(project_id, merge_request_iid, base_url)}/{resource}"
             f"?per_page=100&page={page}"
         )
-        resp = requests.get(url, headers=_gl_headers(token), timeout=30)
+        resp = http_session().get(url, headers=_gl_headers(token))
         if resp.status_code != 200:
             logging.error(
                 "Failed to list GitLab MR %s: %s %s", resource, resp.status_code, resp.text
@@ -72,7 +72,7 @@ def post_gl_comment(
 ) -> bool:
     """Create a note on a GitLab Merge Request."""
     url = f"{_gl_mr_url(project_id, merge_request_iid, base_url)}/notes"
-    resp = requests.post(url, headers=_gl_headers(token), json={"body": body}, timeout=30)
+    resp = http_session().post(url, headers=_gl_headers(token), json={"body": body})
     if resp.status_code != 201:
         logging.error("Failed to post GitLab MR note: %s %s", resp.status_code, resp.text)
         return False
@@ -101,7 +101,7 @@ def update_gl_mr_note(
 ) -> bool:
     """Update a GitLab MR note with new body content."""
     url = f"{_gl_mr_url(project_id, merge_request_iid, base_url)}/notes/{note_id}"
-    resp = requests.put(url, headers=_gl_headers(token), json={"body": new_body}, timeout=30)
+    resp = http_session().put(url, headers=_gl_headers(token), json={"body": new_body})
     if resp.status_code != 200:
         logging.error(
             "Failed to update GitLab MR note %s: %s %s",
@@ -121,7 +121,7 @@ def get_gl_mr_info(
 ) -> Optional[Dict]:
     """Fetch GitLab MR metadata (incl. diff_refs needed for inline comment positions)."""
     url = _gl_mr_url(project_id, merge_request_iid, base_url)
-    resp = requests.get(url, headers=_gl_headers(token), timeout=30)
+    resp = http_session().get(url, headers=_gl_headers(token))
     if resp.status_code != 200:
         logging.error("Failed to fetch GitLab MR info: %s %s", resp.status_code, resp.text)
         return None
@@ -138,6 +138,54 @@ def get_gl_mr_diffs(
     return _gl_paginated_get("diffs", project_id, merge_request_iid, token, base_url)
 
 
+def gl_mr_diffs_to_unified(diffs: List[Dict]) -> str:
+    """
+    Join the MR diffs (hunks only, as returned by the API) into a unified diff
+    with file headers, parseable by unidiff.
+    Files without textual changes (binary, mode changes, pure renames) are omitted.
+    """
+    parts = []
+    for d in diffs:
+        if not d.get("diff"):
+            continue
+        old_path, new_path = d["old_path"], d["new_path"]
+        header = f"diff --git a/{old_path} b/{new_path}\n"
+        source, target = f"a/{old_path}", f"b/{new_path}"
+        # unidiff recognizes added / deleted files by the mode lines
+        if d.get("new_file"):
+            header += f"new file mode {d.get('b_mode') or '100644'}\n"
+            source = "/dev/null"
+        elif d.get("deleted_file"):
+            header += f"deleted file mode {d.get('a_mode') or '100644'}\n"
+            target = "/dev/null"
+        hunks = d["diff"] if d["diff"].endswith("\n") else d["diff"] + "\n"
+        parts.append(f"{header}--- {source}\n+++ {target}\n{hunks}")
+    return "".join(parts)
+
+
+def get_gl_file_raw(
+    project_id: str,
+    path: str,
+    ref: str,
+    token: str,
+    base_url: Optional[str] = None,
+) -> Optional[bytes]:
+    """
+    Fetch the raw content of the repository file at the given ref.
+    Returns None if the file does not exist at the ref.
+    Raises requests.HTTPError on other failures.
+    """
+    url = (
+        f"{_gl_base_url(base_url)}/api/v4/projects/{project_id}"
+        f"/repository/files/{quote(path, safe='')}/raw"
+    )
+    resp = http_session().get(url, headers=_gl_headers(token), params={"ref": ref})
+    if resp.status_code == 404:
+        return None
+    resp.raise_for_status()
+    return resp.content
+
+
 def list_gl_mr_discussions(
     project_id: str,
     merge_request_iid: int,
@@ -158,11 +206,10 @@ def create_gl_draft_note(
 ) -> bool:
     """Create a draft (pending) inline note on a GitLab MR diff."""
     url = f"{_gl_mr_url(project_id, merge_request_iid, base_url)}/draft_notes"
-    resp = requests.post(
+    resp = http_session().post(
         url,
         headers=_gl_headers(token),
         json={"note": body, "position": position},
-        timeout=30,
     )
     if resp.status_code != 201:
         logging.error("Failed to create GitLab draft note: %s %s", resp.status_code, resp.text)
@@ -178,7 +225,7 @@ def publish_gl_draft_notes(
 ) -> bool:
     """Publish all pending draft notes of a GitLab MR at once (single review)."""
     url = f"{_gl_mr_url(project_id, merge_request_iid, base_url)}/draft_notes/bulk_publish"
-    resp = requests.post(url, headers=_gl_headers(token), timeout=30)
+    resp = http_session().post(url, headers=_gl_headers(token))
     if resp.status_code not in (200, 204):
         logging.error("Failed to publish GitLab draft notes: %s %s", resp.status_code, resp.text)
         return False
@@ -207,7 +254,7 @@ def resolve_gl_outdated_inline_discussions(
             f"{_gl_mr_url(project_id, merge_request_iid, base_url)}"
             f"/discussions/{discussion['id']}"
         )
-        resp = requests.put(url, headers=_gl_headers(token), json={"resolved": True}, timeout=30)
+        resp = http_session().put(url, headers=_gl_headers(token), json={"resolved": True})
         if resp.status_code != 200:
             logging.warning(
                 "Failed to resolve outdated Gito discussion %s: %s %s",
@@ -35,7 +35,13 @@ def extract_issue_key(branch_name: str, min_len=2, max_len=10) -> str | None:
     return match.group(1) if match else None
 
 
-def get_branch(repo: git.Repo):
+def get_branch(repo: git.Repo, reviewed_branch: str | None = None):
+    """
+    Args:
+        repo: Local repository.
+        reviewed_branch: Branch of the review target, used when it is checked out
+            with a detached HEAD (e.g. remote repositories).
+    """
     if is_running_in_github_action():
         return gh_ci_src_branch()
     elif is_running_in_gitlab_ci():
@@ -49,12 +55,14 @@ def get_branch(repo: git.Repo):
         branch_name = repo.active_branch.name
         return branch_name
     except Exception as e:  # @todo: specify more precise exception
+        if reviewed_branch:
+            return reviewed_branch
         logging.error("Could not determine the active branch name: %s", e)
         return None
 
 
-def resolve_issue_key(repo: git.Repo):
-    branch_name = get_branch(repo)
+def resolve_issue_key(repo: git.Repo, reviewed_branch: str | None = None):
+    branch_name = get_branch(repo, reviewed_branch)
     if not branch_name:
         logging.error("No active branch found in the repository, cannot determine issue key.")
         return None
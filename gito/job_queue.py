@@ -0,0 +1,146 @@
+"""
+Durable queue of review jobs stored in a local SQLite database.
+"""
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+
+
+class JobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    SUPERSEDED = "superseded"
+    """A newer revision of the same pull request was queued."""
+
+
+@dataclass
+class QueuedJob:
+    id: int
+    key: str
+    """Jobs with the same key (e.g. pull request) supersede each other."""
+    head_sha: str
+    payload: dict
+    status: JobStatus
+    error: str = ""
+
+
+class JobQueue:
+    """
+    FIFO queue of jobs surviving process restarts.
+    Queuing a job with a new head SHA supersedes queued and running jobs with the same key.
+    """
+
+    def __init__(self, file_name: str | Path):
+        self.db = sqlite3.connect(file_name, isolation_level=None, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL,
+                head_sha TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT NOT NULL DEFAULT '',
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, status)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> QueuedJob:
+        return QueuedJob(
+            id=row["id"],
+            key=row["key"],
+            head_sha=row["head_sha"],
+            payload=json.loads(row["payload"]),
+            status=JobStatus(row["status"]),
+            error=row["error"],
+        )
+
+    def enqueue(self, key: str, head_sha: str, payload: dict) -> tuple[int | None, list[int]]:
+        """
+        Queue the job unless the same revision is already queued, running or done.
+        Returns:
+            tuple[int | None, list[int]]: ID of the new job (None if it is a duplicate)
+                and IDs of the superseded jobs that were running.
+        """
+        now = time.time()
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            duplicate = self.db.execute(
+                "SELECT id FROM jobs WHERE key = ? AND head_sha = ? AND status IN (?, ?, ?)",
+                (key, head_sha, JobStatus.QUEUED, JobStatus.RUNNING, JobStatus.DONE),
+            ).fetchone()
+            if duplicate:
+                return None, []
+            running = [
+                row["id"]
+                for row in self.db.execute(
+                    "SELECT id FROM jobs WHERE key = ? AND status = ?", (key, JobStatus.RUNNING)
+                )
+            ]
+            self.db.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE key = ? AND status IN (?, ?)",
+                (JobStatus.SUPERSEDED, now, key, JobStatus.QUEUED, JobStatus.RUNNING),
+            )
+            cursor = self.db.execute(
+                "INSERT INTO jobs (key, head_sha, payload, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, head_sha, json.dumps(payload), JobStatus.QUEUED, now, now),
+            )
+        return cursor.lastrowid, running
+
+    def claim(self) -> QueuedJob | None:
+        """Take the oldest queued job, marking it as running."""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            row = self.db.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (JobStatus.QUEUED,)
+            ).fetchone()
+            if not row:
+                return None
+            self.db.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?",
+                (JobStatus.RUNNING, time.time(), row["id"]),
+            )
+        job = self._job(row)
+        job.status = JobStatus.RUNNING
+        return job
+
+    def complete(self, job_id: int, status: JobStatus, error: str = ""):
+        """Record the result of the running job (superseded jobs keep their status)."""
+        self.db.execute(
+            "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ? AND status = ?",
+            (status, error, time.time(), job_id, JobStatus.RUNNING),
+        )
+
+    def get(self, job_id: int) -> QueuedJob | None:
+        row = self.db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def recover(self) -> int:
+        """Queue again the jobs left running by a stopped process, returns their number."""
+        return self.db.execute(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+            (JobStatus.QUEUED, time.time(), JobStatus.RUNNING),
+        ).rowcount
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs by status."""
+        return {
+            row["status"]: row["n"]
+            for row in self.db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+        }
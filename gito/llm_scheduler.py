@@ -0,0 +1,396 @@
+"""
+Adaptive, rate-limit-aware scheduling of concurrent LLM requests.
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable
+
+import microcore as mc
+from microcore import ui
+
+# Assumed size of the LLM response when admitting requests against the tokens-per-minute budget
+OUTPUT_TOKENS_ESTIMATE = 1000
+# Weight of the latest request in the moving averages of the LLM latency
+LATENCY_SMOOTHING = 0.2
+# Requests slower (per token) than this multiple of the average signal provider-side queueing
+QUEUEING_LATENCY_FACTOR = 3
+
+# Scheduler of the current context (review), concurrent reviews may use different schedulers
+_current_scheduler: ContextVar["LLMScheduler | None"] = ContextVar(
+    "gito_llm_scheduler", default=None
+)
+# Number of active install() contexts and the LLM function replaced by the first of them
+_installed = {"count": 0, "original": None}
+# Requester sharing the scheduler with others (e.g. repository in batch reviews)
+_current_tenant: ContextVar[str | None] = ContextVar("gito_llm_tenant", default=None)
+
+
+@contextmanager
+def tenant(name: str):
+    """
+    Attribute LLM requests made within the context (including tasks started in it)
+    to the tenant; schedulers share their request slots fairly between tenants.
+    """
+    token = _current_tenant.set(name)
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
+
+
+def is_rate_limit_error(e: Exception) -> bool:
+    """Detect HTTP 429 / rate limit errors raised by LLM API clients."""
+    status = getattr(e, "status_code", None)
+    if status is None:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    if status == 429:
+        return True
+    return "ratelimit" in type(e).__name__.lower() or "rate limit" in str(e).lower()
+
+
+def get_retry_after(e: Exception) -> float | None:
+    """Read the delay (seconds) requested by the retry-after(-ms) response headers, if any."""
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if value := headers.get("retry-after-ms"):
+            return float(value) / 1000
+        if value := headers.get("retry-after"):
+            try:
+                return float(value)
+            except ValueError:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError, AttributeError):
+        return None
+    return None
+
+
+def _moving_average(average: float | None, value: float) -> float:
+    return value if average is None else average + LATENCY_SMOOTHING * (value - average)
+
+
+def estimate_makespan(costs: list[float], workers: int) -> float:
+    """
+    Estimate the completion time of jobs with given costs submitted in the given order
+    to the pool of workers (each job starts on the first worker that becomes free).
+    """
+    if not costs:
+        return 0
+    finish_times = [0.0] * max(min(workers, len(costs)), 1)
+    for cost in costs:
+        heapq.heappush(finish_times, heapq.heappop(finish_times) + cost)
+    return max(finish_times)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at rate_per_minute, holding up to one minute of budget.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds to wait until the amount is available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return max(amount - self.tokens, 0) / self.rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class LLMScheduler:
+    """
+    Admits LLM requests against requests-per-minute and tokens-per-minute budgets
+    and adapts the number of concurrent requests AIMD-style:
+    the limit grows while requests succeed with stable latency per token
+    (doubling each round until the first rate limit error, then by one per round),
+    and is halved on rate limit errors, which also pause new requests
+    for the time requested by the provider (retry-after).
+    Rate-limited requests are retried by the scheduler without consuming LLM retries.
+    Request slots are shared fairly between tenants: a request is admitted only if
+    its tenant has no more requests in flight than any other tenant waiting for a slot
+    (ties go to the tenant admitted least recently).
+
+    Usage:
+        with LLMScheduler(max_concurrency=40, rpm_limit=500).install():
+            await mc.llm_parallel(prompts, max_concurrent_tasks=len(prompts))
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        rpm_limit: int = 0,
+        tpm_limit: int = 0,
+        initial_concurrency: int = 4,
+        max_rate_limit_retries: int = 8,
+    ):
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.concurrency = float(min(initial_concurrency, self.max_concurrency))
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.rpm_bucket = TokenBucket(rpm_limit) if rpm_limit else None
+        self.tpm_bucket = TokenBucket(tpm_limit) if tpm_limit else None
+        self.slow_start = True
+        # Moving averages of the request latency (seconds)
+        # and of the latency per token (comparable between requests of different sizes)
+        self.latency: float | None = None
+        self.latency_per_token: float | None = None
+        self.in_flight = 0
+        # Requests in flight and waiting for admission by tenant
+        self.tenant_in_flight: dict[str | None, int] = {}
+        self.tenant_waiting: dict[str | None, int] = {}
+        # Sequence number of the last admitted request by tenant
+        self.tenant_admitted: dict[str | None, int] = {}
+        self.admissions = 0
+        self.resume_at = 0.0
+        self.last_decrease_at = 0.0
+        self._condition: asyncio.Condition | None = None
+        self.requests = 0
+        self.rate_limited = 0
+        self.peak_concurrency = 0
+        # Total duration and size (tokens) of successful requests
+        self.busy_time = 0.0
+        self.busy_tokens = 0
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
+    @staticmethod
+    def from_config(rpm_limit: int = 0, tpm_limit: int = 0) -> "LLMScheduler":
+        """
+        Create the scheduler bounded by the MAX_CONCURRENT_TASKS setting of the LLM configuration.
+        """
+        return LLMScheduler(
+            max_concurrency=int(mc.config().MAX_CONCURRENT_TASKS or 0) or 1024,
+            rpm_limit=rpm_limit,
+            tpm_limit=tpm_limit,
+        )
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _tenant_priority(self, tenant: str | None) -> tuple[int, int]:
+        return self.tenant_in_flight.get(tenant, 0), self.tenant_admitted.get(tenant, -1)
+
+    def _is_turn_of(self, tenant: str | None) -> bool:
+        priority = self._tenant_priority(tenant)
+        return all(priority <= self._tenant_priority(t) for t in self.tenant_waiting)
+
+    async def _acquire(self, tokens: int):
+        tenant = _current_tenant.get()
+        async with self.condition:
+            self.tenant_waiting[tenant] = self.tenant_waiting.get(tenant, 0) + 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = self.resume_at - now
+                    if delay <= 0:
+                        delay = max(
+                            self.rpm_bucket.wait_time(1) if self.rpm_bucket else 0,
+                            self.tpm_bucket.wait_time(tokens) if self.tpm_bucket else 0,
+                        )
+                    if (
+                        delay <= 0
+                        and self.in_flight < int(self.concurrency)
+                        and self._is_turn_of(tenant)
+                    ):
+                        break
+                    try:
+                        await asyncio.wait_for(self.condition.wait(), timeout=delay or None)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self.tenant_waiting[tenant] -= 1
+                if not self.tenant_waiting[tenant]:
+                    del self.tenant_waiting[tenant]
+                # The turn may have passed to other tenants
+                self.condition.notify_all()
+            self.in_flight += 1
+            self.tenant_in_flight[tenant] = self.tenant_in_flight.get(tenant, 0) + 1
+            self.admissions += 1
+            self.tenant_admitted[tenant] = self.admissions
+            self.peak_concurrency = max(self.peak_concurrency, self.in_flight)
+            if self.rpm_bucket:
+                self.rpm_bucket.consume(1)
+            if self.tpm_bucket:
+                self.tpm_bucket.consume(tokens)
+
+    async def _release(self):
+        tenant = _current_tenant.get()
+        async with self.condition:
+            self.in_flight -= 1
+            self.tenant_in_flight[tenant] -= 1
+            if not self.tenant_in_flight[tenant]:
+                del self.tenant_in_flight[tenant]
+            self.condition.notify_all()
+
+    def _on_success(self, latency: float, tokens: int):
+        latency_per_token = latency / max(tokens, 1)
+        average = self.latency_per_token
+        self.latency = _moving_average(self.latency, latency)
+        self.latency_per_token = _moving_average(average, latency_per_token)
+        # Growing latency signals provider-side queueing: hold the current limit
+        if average is not None and latency_per_token > QUEUEING_LATENCY_FACTOR * average:
+            return
+        increment = 1 if self.slow_start else 1 / self.concurrency
+        self.concurrency = min(self.concurrency + increment, self.max_concurrency)
+
+    def _on_rate_limited(self, retry_after: float | None, attempt: int) -> float:
+        self.rate_limited += 1
+        self.slow_start = False
+        now = time.monotonic()
+        # Errors of requests sent before the previous decrease refer to the same congestion
+        if now - self.last_decrease_at > (self.latency or 1):
+            self.concurrency = max(self.concurrency / 2, 1)
+            self.last_decrease_at = now
+            logging.warning(
+                "LLM rate limit reached, reducing concurrency to "
+                f"{ui.yellow(int(self.concurrency))}"
+            )
+        if retry_after is None:
+            # Exponential backoff with jitter
+            delay = min(2**attempt, 60) * random.uniform(0.5, 1)
+        else:
+            delay = retry_after
+        self.resume_at = max(self.resume_at, now + delay)
+        return delay
+
+    async def run(self, llm_async_function: Callable, prompt: Any, **kwargs):
+        """Call the LLM function once the request is admitted, retrying on rate limit errors."""
+        tokens = mc.tokenizing.num_tokens_from_string(str(prompt)) + int(
+            kwargs.get("max_tokens") or OUTPUT_TOKENS_ESTIMATE
+        )
+        attempt = 0
+        while True:
+            await self._acquire(tokens)
+            started_at = time.monotonic()
+            try:
+                response = await llm_async_function(prompt, **kwargs)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.max_rate_limit_retries:
+                    raise
+                delay = self._on_rate_limited(get_retry_after(e), attempt)
+                logging.info(f"Retrying rate-limited LLM request in {delay:.1f}s...")
+                attempt += 1
+                continue
+            finally:
+                await self._release()
+            latency = time.monotonic() - started_at
+            self.requests += 1
+            self.busy_time += latency
+            self.busy_tokens += tokens
+            self._on_success(latency, tokens)
+            return response
+
+    @property
+    def has_spare_capacity(self) -> bool:
+        """Whether a new request would be sent without waiting for a free slot."""
+        return self.in_flight < int(self.concurrency) and time.monotonic() >= self.resume_at
+
+    async def run_hedged(
+        self,
+        make_attempt: Callable[[], Awaitable],
+        hedge_after: float,
+        is_valid: Callable[[Any], bool] = lambda result: True,
+    ):
+        """
+        Await the attempt; if it takes longer than hedge_after seconds,
+        start a duplicate (hedged) attempt and return the first valid result.
+        Duplicates are not started while all request slots are busy,
+        they would only wait in the queue.
+        If no attempt returns a valid result, the result of the last completed one is returned.
+        """
+        first = asyncio.ensure_future(make_attempt())
+        attempts = {first}
+        result = None
+        try:
+            while attempts:
+                done, attempts = await asyncio.wait(
+                    attempts,
+                    timeout=hedge_after if hedge_after and len(attempts) == 1 else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if self.has_spare_capacity:
+                        attempts.add(asyncio.ensure_future(make_attempt()))
+                        self.hedged_requests += 1
+                    continue
+                for attempt in done:
+                    result = attempt.result()
+                    if is_valid(result):
+                        if attempt is not first:
+                            self.hedge_wins += 1
+                        return result
+                # Do not hedge again after a failed attempt, failures are retried by the caller
+                hedge_after = 0
+            return result
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    @property
+    def seconds_per_token(self) -> float | None:
+        """Observed average request duration per token of the request size."""
+        return self.busy_time / self.busy_tokens if self.busy_tokens else None
+
+    @contextmanager
+    def install(self):
+        """
+        Route all LLM requests made within the context
+        (including tasks started in it) through the scheduler.
+        Schedulers installed concurrently (e.g. by parallel reviews in `gito serve`)
+        handle only the requests of their own context.
+        """
+        env = mc.env()
+        if not _installed["count"]:
+            original = env.llm_async_function
+
+            async def scheduled_llm_async_function(prompt, **kwargs):
+                scheduler = _current_scheduler.get()
+                if scheduler is None:
+                    return await original(prompt, **kwargs)
+                return await scheduler.run(original, prompt, **kwargs)
+
+            _installed["original"] = original
+            env.llm_async_function = scheduled_llm_async_function
+        _installed["count"] += 1
+        token = _current_scheduler.set(self)
+        try:
+            yield self
+        finally:
+            _current_scheduler.reset(token)
+            _installed["count"] -= 1
+            if not _installed["count"]:
+                env.llm_async_function = _installed["original"]
+                _installed["original"] = None
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "peak_concurrency": self.peak_concurrency,
+            "final_concurrency": int(self.concurrency),
+            "hedged_requests": self.hedged_requests,
+            "hedge_wins": self.hedge_wins,
+        }
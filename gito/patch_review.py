@@ -0,0 +1,138 @@
+"""
+Review of a unified diff (patch file or stdin) without a git repository,
+e.g. in pre-receive hooks or patch queues already holding the diff.
+Contents of the changed files may be provided by a directory or a tarball,
+otherwise the diff alone is reviewed.
+"""
+
+import logging
+import os
+import sys
+import tarfile
+from pathlib import Path
+from typing import IO
+
+from unidiff import PatchSet
+from unidiff.constants import DEV_NULL
+
+from .constants import PROJECT_CONFIG_FILE_PATH
+from .core import review
+from .project_config import ProjectConfig
+from .report_struct import Report, ReviewTarget
+from .review_changes import ReviewChanges
+
+STDIN = "-"
+
+
+def read_patch(source: str | os.PathLike | IO[str]) -> PatchSet:
+    """
+    Parse the unified diff from the file, text stream or stdin ("-"),
+    streaming it into the PatchSet line by line.
+    """
+    if isinstance(source, (str, os.PathLike)) and str(source) == STDIN:
+        source = sys.stdin
+    if not isinstance(source, (str, os.PathLike)):
+        return PatchSet(source)
+    with open(source, encoding="utf-8", errors="replace") as f:
+        return PatchSet(f)
+
+
+def _read_tarball(file_name: Path, paths: list[str]) -> dict[str, bytes | None]:
+    """
+    Read the files from the tarball (any compression supported by tarfile).
+    Files may be placed in a single top-level folder, as in source archives.
+    """
+    with tarfile.open(file_name) as tar:
+        members = {m.name.removeprefix("./"): m for m in tar.getmembers() if m.isfile()}
+        in_top_folder = {
+            name.split("/", 1)[1]: m for name, m in members.items() if "/" in name
+        }
+        out = {}
+        for path in paths:
+            member = members.get(path) or in_top_folder.get(path)
+            out[path] = tar.extractfile(member).read() if member else None
+        return out
+
+
+def _read_folder(folder: Path, paths: list[str]) -> dict[str, bytes | None]:
+    folder = folder.resolve()
+    out = {}
+    for path in paths:
+        file = (folder / path).resolve()
+        # Paths of the patch may point outside the folder ("../")
+        if not file.is_relative_to(folder) or not file.is_file():
+            out[path] = None
+            continue
+        out[path] = file.read_bytes()
+    return out
+
+
+def load_patch_changes(
+    patch: str | os.PathLike | IO[str] | PatchSet,
+    files_from: str | os.PathLike | None = None,
+    config: ProjectConfig | None = None,
+) -> ReviewChanges:
+    """
+    Prepare the patch for review.
+    Args:
+        patch: The patch file, text stream, "-" for stdin or the parsed PatchSet.
+        files_from: Directory or tarball with the files after the change,
+            if not provided, the diff alone is reviewed.
+        config: Project configuration, by default read from files_from
+            (the current project if files_from is not provided).
+    """
+    diff = patch if isinstance(patch, PatchSet) else read_patch(patch)
+    text_diff = PatchSet([])
+    for file_diff in diff:
+        if file_diff.is_binary_file:
+            logging.info(f"Skipping binary file: {file_diff.path}")
+        else:
+            text_diff.append(file_diff)
+    if files_from is None:
+        return ReviewChanges(diff=text_diff, config=config or ProjectConfig.load())
+
+    files_from = Path(files_from)
+    paths = [file_diff.path for file_diff in text_diff if file_diff.target_file != DEV_NULL]
+    config_path = PROJECT_CONFIG_FILE_PATH.as_posix()
+    read = _read_folder if files_from.is_dir() else _read_tarball
+    contents = read(files_from, paths + [config_path])
+    files = {}
+    for path in paths:
+        content = contents[path]
+        if content is None:
+            logging.warning(f"File {path} not found in {files_from}, skipping")
+            continue
+        try:
+            files[path] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            logging.info(f"Skipping binary file: {path}")
+    if config is None:
+        config_content = contents[config_path]
+        config = ProjectConfig.loads(config_content.decode("utf-8") if config_content else "")
+    reviewed_diff = PatchSet([])
+    reviewed_diff.extend(
+        file_diff
+        for file_diff in text_diff
+        if file_diff.target_file == DEV_NULL or file_diff.path in files
+    )
+    return ReviewChanges(diff=reviewed_diff, config=config, files=files)
+
+
+async def review_patch(
+    patch: str | os.PathLike | IO[str] | PatchSet,
+    files_from: str | os.PathLike | None = None,
+    out_folder: str | os.PathLike | None = None,
+    filters: str | list[str] = "",
+    config: ProjectConfig | None = None,
+) -> Report | None:
+    """
+    Review the unified diff without a git repository, see load_patch_changes() for the arguments.
+    Returns:
+        Report | None: The review report, None if there are no changes to review.
+    """
+    changes = load_patch_changes(patch, files_from, config)
+    return await review(
+        target=ReviewTarget(filters=filters),
+        changes=changes,
+        out_folder=out_folder,
+    )
@@ -1,5 +1,8 @@
+import asyncio
+import inspect
 import logging
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from enum import StrEnum
 from dataclasses import dataclass, field
 
@@ -43,6 +46,19 @@ class PipelineStep:
     call: str
     envs: list[PipelineEnv] = field(default_factory=PipelineEnv.all)
     enabled: bool = field(default=True)
+    depends_on: list[str] | None = field(default=None)
+    """
+    Names of the steps that must complete before this one,
+    their outputs are available to this step in pipeline_out.
+    Steps without dependencies between them run concurrently.
+    If not set, the step depends on all previously declared steps
+    (previous input-only steps for input-only steps), as in sequential execution.
+    """
+    input_only: bool = field(default=False)
+    """
+    The step uses only the review input (repository, diff, configuration), not the review results,
+    so it may run concurrently with the LLM review requests.
+    """
 
     def get_callable(self):
         """
@@ -53,6 +69,16 @@ class PipelineStep:
     def run(self, *args, **kwargs):
         return self.get_callable()(*args, **kwargs)
 
+    async def arun(self, *args, **kwargs):
+        """
+        Run the step without blocking the event loop:
+        synchronous callables are executed in a thread pool, coroutines are awaited.
+        """
+        result = await asyncio.to_thread(self.run, *args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
 
 @dataclass
 class Pipeline:
@@ -64,29 +90,125 @@ class Pipeline:
     def enabled_steps(self):
         return {k: v for k, v in self.steps.items() if v.enabled}
 
+    def _direct_dependencies(self, step_name: str) -> list[str]:
+        step = self.steps[step_name]
+        if step.depends_on is not None:
+            return step.depends_on
+        previous = list(self.steps)[: list(self.steps).index(step_name)]
+        return [
+            name for name in previous if not step.input_only or self.steps[name].input_only
+        ]
+
+    def _check_dependencies(self):
+        steps = self.enabled_steps
+        for step_name, step in steps.items():
+            for dependency in self._direct_dependencies(step_name):
+                if dependency not in self.steps:
+                    raise ValueError(
+                        f'Pipeline step "{step_name}" depends on unknown step "{dependency}"'
+                    )
+                if step.input_only and not self.steps[dependency].input_only:
+                    raise ValueError(
+                        f'Input-only pipeline step "{step_name}" can\'t depend on '
+                        f'step "{dependency}" using the review results'
+                    )
+        visited, in_path = set(), set()
+
+        def visit(name):
+            if name in in_path:
+                raise ValueError(f'Circular dependency in pipeline steps involving "{name}"')
+            if name in visited or name not in steps:
+                return
+            in_path.add(name)
+            for dependency in self._direct_dependencies(name):
+                visit(dependency)
+            in_path.remove(name)
+            visited.add(name)
+
+        for step_name in steps:
+            visit(step_name)
+
+    def _dependencies(self, step_name: str) -> list[str]:
+        """All (transitive) dependencies of the step in declaration order."""
+        found, stack = set(), list(self._direct_dependencies(step_name))
+        while stack:
+            if (name := stack.pop()) not in found:
+                found.add(name)
+                stack.extend(self._direct_dependencies(name))
+        return [name for name in self.steps if name in found]
+
     def run(self, *args, **kwargs):
+        """
+        Run the pipeline synchronously, see arun().
+        Called from a running event loop (e.g. by synchronous code of an async application),
+        the pipeline runs in a worker thread with its own event loop, blocking the caller.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.arun(*args, **kwargs))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.arun(*args, **kwargs)).result()
+
+    async def arun(self, *args, input_only: bool | None = None, **kwargs):
+        """
+        Run enabled pipeline steps for the current environment.
+        Each step starts as soon as the steps it depends on are completed,
+        independent steps run concurrently.
+        Step outputs are merged into pipeline_out in the declaration order of the steps.
+        Args:
+            input_only (bool | None): Run only input-only steps (True),
+                only steps using the review results (False), or all steps (None, default).
+        """
+        self._check_dependencies()
         cur_env = PipelineEnv.current()
         logging.info("Running pipeline... [env: %s]", ui.yellow(cur_env))
+        initial_out = dict(self.ctx.pipeline_out)
+        outputs: dict = {}
+        tasks: dict[str, asyncio.Task] = {}
+
+        async def run_step(step_name: str, step: PipelineStep):
+            dependencies = self._dependencies(step_name)
+            await asyncio.gather(*[tasks[d] for d in dependencies if d in tasks])
+            # The step sees outputs of its dependencies only, regardless of the timing
+            pipeline_out = dict(initial_out)
+            for dependency in dependencies:
+                if dependency in outputs:
+                    self._merge_output(pipeline_out, dependency, outputs[dependency])
+            logging.info(f"Running pipeline step: {step_name}")
+            try:
+                step_output = await step.arun(
+                    *args, **kwargs, **(vars(self.ctx) | {"pipeline_out": pipeline_out})
+                )
+                outputs[step_name] = step_output
+                if self.verbose and step_output:
+                    logging.info(f"Pipeline step {step_name} output: {repr(step_output)}")
+                if not step_output:
+                    logging.warning(
+                        f'Pipeline step "{step_name}" '
+                        f"returned no result ({repr(step_output)})."
+                    )
+            except Exception as e:
+                logging.error(f'Error in pipeline step "{step_name}": {e}')
+
         for step_name, step in self.enabled_steps.items():
+            if input_only is not None and step.input_only != input_only:
+                continue
             if cur_env in step.envs:
-                logging.info(f"Running pipeline step: {step_name}")
-                try:
-                    step_output = step.run(*args, **kwargs, **vars(self.ctx))
-                    if isinstance(step_output, dict):
-                        self.ctx.pipeline_out.update(step_output)
-                    self.ctx.pipeline_out[step_name] = step_output
-                    if self.verbose and step_output:
-                        logging.info(f"Pipeline step {step_name} output: {repr(step_output)}")
-                    if not step_output:
-                        logging.warning(
-                            f'Pipeline step "{step_name}" '
-                            f"returned no result ({repr(step_output)})."
-                        )
-                except Exception as e:
-                    logging.error(f'Error in pipeline step "{step_name}": {e}')
+                tasks[step_name] = asyncio.create_task(run_step(step_name, step))
             else:
                 logging.info(
                     f"Skipping pipeline step: {step_name}"
                     f" [env: {ui.yellow(cur_env)} not in {step.envs}]"
                 )
+        await asyncio.gather(*tasks.values())
+        for step_name in self.steps:
+            if step_name in outputs:
+                self._merge_output(self.ctx.pipeline_out, step_name, outputs[step_name])
         return self.ctx.pipeline_out
+
+    @staticmethod
+    def _merge_output(pipeline_out: dict, step_name: str, step_output):
+        if isinstance(step_output, dict):
+            pipeline_out.update(step_output)
+        pipeline_out[step_name] = step_output
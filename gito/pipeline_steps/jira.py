@@ -5,6 +5,7 @@ import git
 from jira import JIRA, JIRAError
 
 from gito.issue_trackers import IssueTrackerIssue, resolve_issue_key
+from gito.report_struct import Report
 
 
 def fetch_issue(
@@ -39,7 +40,12 @@ def fetch_issue(
 
 
 def fetch_associated_issue(
-    repo: git.Repo, jira_url=None, jira_username=None, jira_api_token=None, **kwargs
+    repo: git.Repo,
+    jira_url=None,
+    jira_username=None,
+    jira_api_token=None,
+    report: Report | None = None,
+    **kwargs,
 ):
     """
     Pipeline step to fetch a Jira issue based on the current branch name.
@@ -63,7 +69,7 @@ def fetch_associated_issue(
     except AssertionError as e:
         logging.error(f"Jira configuration error: {e}")
         return None
-    issue_key = resolve_issue_key(repo)
+    issue_key = resolve_issue_key(repo, report.target.active_branch if report else None)
     return (
         dict(associated_issue=fetch_issue(issue_key, jira_url, jira_username, jira_token))
         if issue_key
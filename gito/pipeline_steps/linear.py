@@ -5,6 +5,8 @@ import requests
 import git
 
 from gito.issue_trackers import IssueTrackerIssue, resolve_issue_key
+from gito.report_struct import Report
+from gito.utils.http_session import http_session
 
 
 def fetch_issue(issue_key: str, api_key: str = None) -> IssueTrackerIssue | None:
@@ -30,7 +32,7 @@ def fetch_issue(issue_key: str, api_key: str = None) -> IssueTrackerIssue | None
             }
         """
         team_key, issue_number = issue_key.split("-")
-        response = requests.post(
+        response = http_session().post(
             url,
             json={
                 "query": query,
@@ -61,7 +63,7 @@ def fetch_issue(issue_key: str, api_key: str = None) -> IssueTrackerIssue | None
         return None
 
 
-def fetch_associated_issue(repo: git.Repo, api_key=None, **kwargs):
+def fetch_associated_issue(repo: git.Repo, api_key=None, report: Report | None = None, **kwargs):
     """
     Pipeline step to fetch a Linear issue based on the current branch name.
     """
@@ -70,5 +72,5 @@ def fetch_associated_issue(repo: git.Repo, api_key=None, **kwargs):
         logging.error("LINEAR_API_KEY environment variable is not set")
         return
 
-    issue_key = resolve_issue_key(repo)
+    issue_key = resolve_issue_key(repo, report.target.active_branch if report else None)
     return dict(associated_issue=fetch_issue(issue_key, api_key)) if issue_key else None
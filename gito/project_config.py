@@ -1,3 +1,4 @@
+import copy
 import logging
 import tomllib
 from dataclasses import dataclass, field
@@ -11,6 +12,10 @@ from .constants import PROJECT_CONFIG_BUNDLED_DEFAULTS_FILE, PROJECT_CONFIG_FILE
 from .pipeline import PipelineStep
 from .utils.git_platform.github import detect_github_env
 
+# Parsed TOML of the loaded config files by resolved path: (file modification stamp, TOML data),
+# None for the bundled defaults
+_loaded_configs: dict[Path | None, tuple[tuple | None, dict | None]] = {}
+
 
 @dataclass
 class ProjectConfig:
@@ -29,7 +34,52 @@ class ProjectConfig:
     post_process: str = ""
     retries: int = 3
     """LLM retries for one request"""
+    llm_rpm_limit: int = 0
+    """LLM requests per minute allowed by the provider, 0 means unlimited."""
+    llm_tpm_limit: int = 0
+    """
+    LLM tokens per minute (input and estimated output) allowed by the provider,
+    0 means unlimited.
+    """
+    triage_model: str = ""
+    """
+    Fast / cheap model reviewing the files first (two-tier model cascade).
+    Only files where it found issues with severity up to triage_escalation_severity,
+    or failed, are reviewed again by the main model. Empty value disables the cascade.
+    """
+    triage_escalation_severity: int = 2
+    """Highest (numerically) severity of triage model findings escalated to the main model."""
+    hedge_after: float = 0
+    """
+    Seconds without LLM response after which a duplicate (hedged) review request is sent,
+    the first valid response wins. 0 disables hedging.
+    """
+    review_deadline: float = 0
+    """
+    Seconds after which outstanding LLM review requests are abandoned
+    and reported as processing warnings. 0 means no deadline.
+    """
     max_code_tokens: int = 32000
+    chunk_context_lines: int = 20
+    """
+    Number of file lines around the changes provided as context
+    when the diff of a file exceeds max_code_tokens and is reviewed in chunks.
+    """
+    pack_files_max_tokens: int = 0
+    """
+    Token budget of a single LLM request combining diffs of several small files,
+    0 disables packing (each file is reviewed in a separate request).
+    Requires the review prompt to support the `packed_files` variable.
+    """
+    review_cache: bool = True
+    """
+    Cache per-file LLM review results in ~/.gito/cache (GITO_CACHE_PATH env var),
+    unchanged file diffs are not sent to the LLM again.
+    """
+    review_cache_max_size_mb: int = 50
+    """Size limit of the review cache, least recently used entries are evicted first."""
+    compact_json_report: bool = False
+    """Write the JSON report without indentation."""
     prompt_vars: dict = field(default_factory=dict)
     mention_triggers: list[str] = field(default_factory=list)
     answer_github_comments: bool = field(default=True)
@@ -61,11 +111,12 @@ class ProjectConfig:
         Read the bundled default project configuration,
         typically located at <root>/gito/config.toml in the gito.bot distribution.
         Returns:
-            dict: The default project configuration.
+            dict: The default project configuration (a copy, safe to modify).
         """
-        return tomllib.loads(
-            Path(PROJECT_CONFIG_BUNDLED_DEFAULTS_FILE).read_text(encoding="utf-8-sig")
-        )
+        if None not in _loaded_configs:
+            text = Path(PROJECT_CONFIG_BUNDLED_DEFAULTS_FILE).read_text(encoding="utf-8-sig")
+            _loaded_configs[None] = (None, tomllib.loads(text))
+        return copy.deepcopy(_loaded_configs[None][1])
 
     @staticmethod
     def load_for_repo(repo: Repo) -> "ProjectConfig":
@@ -73,10 +124,14 @@ class ProjectConfig:
             config_path = Path(repo.working_tree_dir) / PROJECT_CONFIG_FILE_PATH
         else:
             config_path = None
-        return ProjectConfig.load(config_path)
+        return ProjectConfig.load(config_path, working_folder=repo.working_tree_dir)
 
     @staticmethod
-    def load(config_path: str | Path | None = None) -> "ProjectConfig":
+    def load(
+        config_path: str | Path | None = None,
+        use_cache: bool = True,
+        working_folder: str | Path | None = None,
+    ) -> "ProjectConfig":
         """
         Load the project configuration from the specified path.
         If no path is provided, it defaults to the standard project config file path
@@ -84,24 +139,74 @@ class ProjectConfig:
         If the file exists, it merges the project-specific
         configuration with the bundled defaults.
         If not found, it uses only the defaults.
+        Parsed config files are cached per process and reused until the file is modified;
+        each call returns a new instance, environment-dependent values (GitHub env vars)
+        are detected on each call.
         Args:
             config_path (str | Path | None): Alternative path to the project configuration file.
+            use_cache (bool): Reuse the previously parsed config file if it is unchanged.
+            working_folder (str | Path | None): Folder of the repository the configuration
+                is loaded for (used to detect the GitHub environment), see detect_github_env().
         Returns:
             ProjectConfig: The loaded project configuration instance.
         """
+        config_path = Path(config_path or PROJECT_CONFIG_FILE_PATH)
+        cache_key = config_path.resolve()
+        try:
+            stat = config_path.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        if use_cache and (cached := _loaded_configs.get(cache_key)) and cached[0] == stamp:
+            overrides = cached[1]
+        else:
+            overrides = ProjectConfig._read(config_path, exists=stamp is not None)
+            _loaded_configs[cache_key] = (stamp, overrides)
+        return ProjectConfig._merge_with_defaults(copy.deepcopy(overrides), working_folder)
+
+    @staticmethod
+    def invalidate_cache(config_path: str | Path | None = None):
+        """
+        Drop the cached configuration loaded from the given path
+        (all cached configurations if the path is not provided).
+        """
+        if config_path is None:
+            _loaded_configs.clear()
+        else:
+            _loaded_configs.pop(Path(config_path).resolve(), None)
+
+    @staticmethod
+    def loads(text: str) -> "ProjectConfig":
+        """
+        Make the project configuration from the TOML text of the project config file
+        (e.g. fetched from the remote repository), merged with the bundled defaults.
+        """
+        return ProjectConfig._merge_with_defaults(tomllib.loads(text.lstrip("\ufeff")))
+
+    @staticmethod
+    def _read(config_path: Path, exists: bool) -> dict | None:
+        """Parse the project config file, None if it does not exist."""
+        if not exists:
+            logging.info(f"No project config found at {ui.blue(config_path)}, using defaults")
+            return None
+        logging.info(
+            f"Loading project-specific configuration from {mc.utils.file_link(config_path)}..."
+        )
+        # utf-8-sig strips the BOM written by PowerShell / Notepad on Windows
+        return tomllib.loads(config_path.read_text(encoding="utf-8-sig"))
+
+    @staticmethod
+    def _merge_with_defaults(
+        overrides: dict | None, working_folder: str | Path | None = None
+    ) -> "ProjectConfig":
         config = ProjectConfig._read_bundled_defaults()
-        github_env = detect_github_env()
+        github_env = detect_github_env(working_folder)
         config["prompt_vars"] |= github_env | dict(github_env=github_env)
 
-        config_path = Path(config_path or PROJECT_CONFIG_FILE_PATH)
-        if config_path.exists():
-            logging.info(
-                f"Loading project-specific configuration from {mc.utils.file_link(config_path)}..."
-            )
+        if overrides is not None:
             default_prompt_vars = config["prompt_vars"]
             default_pipeline_steps = config["pipeline_steps"]
-            # utf-8-sig strips the BOM written by PowerShell / Notepad on Windows
-            config.update(tomllib.loads(config_path.read_text(encoding="utf-8-sig")))
+            config.update(overrides)
             # overriding prompt_vars config section will not empty default values
             config["prompt_vars"] = default_prompt_vars | config["prompt_vars"]
             # merge individual pipeline steps
@@ -109,7 +214,5 @@ class ProjectConfig:
                 config["pipeline_steps"][k] = default_pipeline_steps.get(k, {}) | v
             # merge pipeline steps dict
             config["pipeline_steps"] = default_pipeline_steps | config["pipeline_steps"]
-        else:
-            logging.info(f"No project config found at {ui.blue(config_path)}, using defaults")
 
         return ProjectConfig(**config)
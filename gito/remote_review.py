@@ -0,0 +1,262 @@
+"""
+Clone-free review of GitHub pull requests and GitLab merge requests:
+the diff and the contents of the changed files are fetched via the platform API
+(concurrently, one request per file) and reviewed without a git checkout.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from unidiff import PatchSet
+from unidiff.constants import DEV_NULL
+
+from .constants import GITHUB_MD_REPORT_FILE_NAME, JSON_REPORT_FILE_NAME, PROJECT_CONFIG_FILE_PATH
+from .core import review
+from .gh_api import get_gh_file_content, get_gh_pr_diff, get_gh_pr_info, resolve_gh_token
+from .gitlab_api import (
+    get_gl_file_raw,
+    get_gl_mr_diffs,
+    get_gl_mr_info,
+    gl_mr_diffs_to_unified,
+    resolve_gl_token,
+)
+from .project_config import ProjectConfig
+from .report_struct import Report, ReviewTarget
+from .review_changes import ReviewChanges
+from .utils.git_mirror import without_credentials
+from .utils.git_platform.platform_types import (
+    PlatformType,
+    extract_base_url,
+    identify_git_platform_from_remotes,
+)
+
+MAX_CONCURRENT_REQUESTS = 8
+
+
+@dataclass
+class RemotePullRequest:
+    """GitHub pull request or GitLab merge request reviewed via the platform API."""
+
+    platform: PlatformType
+    repo: str
+    """owner/repo on GitHub, project path on GitLab."""
+    number: int
+    """Pull request number or merge request IID."""
+    web_url: str
+    """Web URL of the repository."""
+    api_url: str | None = None
+    """
+    GitHub REST API URL or GitLab instance URL,
+    defaults to GITHUB_API_URL / GITLAB_BASE_URL env vars or the public instances.
+    """
+
+    @property
+    def project_id(self) -> str:
+        """GitLab project ID (URL-encoded project path)."""
+        return quote(self.repo, safe="")
+
+    @classmethod
+    def from_url(cls, url: str, number: int | str) -> "RemotePullRequest":
+        """
+        Describe the pull request of the repository by its URL (web or git, HTTPS or SSH).
+        Raises:
+            ValueError: If the platform is not GitHub / GitLab or the URL can't be parsed.
+        """
+        url = without_credentials(url.strip()).removesuffix("/").removesuffix(".git")
+        platform = identify_git_platform_from_remotes([url])
+        if platform not in (PlatformType.GITHUB, PlatformType.GITLAB):
+            raise ValueError(f"Remote review supports only GitHub and GitLab repositories: {url}")
+        if url.startswith("git@"):
+            path = url.split(":", 1)[1]
+        else:
+            path = urlsplit(url).path
+        path = path.strip("/")
+        if path.count("/") < 1:
+            raise ValueError(f"Could not extract the repository path from the URL: {url}")
+        base_url = extract_base_url(url)
+        if platform == PlatformType.GITHUB:
+            api_url = None if base_url == "https://github.com" else f"{base_url}/api/v3"
+        else:
+            api_url = None if base_url == "https://gitlab.com" else base_url
+        return cls(
+            platform=platform,
+            repo=path,
+            number=int(number),
+            web_url=f"{base_url}/{path}",
+            api_url=api_url,
+        )
+
+
+@dataclass(kw_only=True)
+class RemoteChanges(ReviewChanges):
+    """Changes of the pull / merge request fetched via the platform API."""
+
+    pull: RemotePullRequest
+    base_sha: str | None = None
+    head_ref: str | None = None
+
+    def review_target(self, filters: str | list[str] = "") -> ReviewTarget:
+        return ReviewTarget(
+            git_platform_type=self.pull.platform,
+            repo_url=self.pull.web_url,
+            pull_request_id=str(self.pull.number),
+            what=self.head_sha,
+            against=self.base_sha,
+            commit_sha=self.head_sha,
+            filters=filters,
+            active_branch=self.head_ref,
+        )
+
+
+def _decode(content: bytes) -> str | None:
+    """Text of the file, None for binary (not UTF-8 encoded) files."""
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+def _github_sources(pull: RemotePullRequest, token: str | None):
+    token = resolve_gh_token(token)
+
+    def pr_info():
+        info = get_gh_pr_info(pull.repo, pull.number, token, pull.api_url)
+        return info["head"]["sha"], info["base"]["sha"], info["head"]["ref"]
+
+    def diff():
+        return get_gh_pr_diff(pull.repo, pull.number, token, pull.api_url)
+
+    def read_raw(path: str, ref: str) -> bytes | None:
+        return get_gh_file_content(pull.repo, path, ref, token, pull.api_url)
+
+    return pr_info, diff, read_raw
+
+
+def _gitlab_sources(pull: RemotePullRequest, token: str | None):
+    token = resolve_gl_token(token)
+    project_ids = {}
+
+    def mr_info():
+        info = get_gl_mr_info(pull.project_id, pull.number, token, pull.api_url)
+        if not info:
+            raise RuntimeError(f"Could not fetch the merge request !{pull.number} of {pull.repo}")
+        # Contents of the merge requests from forks are read from the source project
+        project_ids["source"] = info.get("source_project_id") or pull.project_id
+        diff_refs = info.get("diff_refs") or {}
+        head_sha = diff_refs.get("head_sha") or info["sha"]
+        return head_sha, diff_refs.get("base_sha"), info.get("source_branch")
+
+    def diff():
+        return gl_mr_diffs_to_unified(
+            get_gl_mr_diffs(pull.project_id, pull.number, token, pull.api_url)
+        )
+
+    def read_raw(path: str, ref: str) -> bytes | None:
+        return get_gl_file_raw(project_ids["source"], path, ref, token, pull.api_url)
+
+    return mr_info, diff, read_raw
+
+
+async def fetch_remote_changes(
+    pull: RemotePullRequest,
+    token: str | None = None,
+    max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+) -> RemoteChanges:
+    """
+    Fetch the diff and the contents of the changed files of the pull / merge request
+    via the platform API, without cloning the repository.
+    Binary files are excluded from the diff.
+    """
+    sources = _github_sources if pull.platform == PlatformType.GITHUB else _gitlab_sources
+    get_info, get_diff, read_raw = sources(pull, token)
+    (head_sha, base_sha, head_ref), diff_text = await asyncio.gather(
+        asyncio.to_thread(get_info), asyncio.to_thread(get_diff)
+    )
+    diff = PatchSet.from_string(diff_text)
+    for file_diff in diff:
+        if file_diff.is_binary_file:
+            logging.info(f"Skipping binary file: {file_diff.path}")
+    paths = [
+        file_diff.path
+        for file_diff in diff
+        if not file_diff.is_binary_file and file_diff.target_file != DEV_NULL
+    ]
+    slots = asyncio.Semaphore(max_concurrent_requests)
+
+    async def fetch(path: str) -> bytes | None:
+        async with slots:
+            return await asyncio.to_thread(read_raw, path, head_sha)
+
+    logging.info(f"Fetching {len(paths)} changed file(s) of {pull.repo}#{pull.number}...")
+    config_content, *contents = await asyncio.gather(
+        fetch(PROJECT_CONFIG_FILE_PATH.as_posix()), *map(fetch, paths)
+    )
+    files = {}
+    for path, content in zip(paths, contents):
+        if content is None:
+            logging.warning(f"File {path} not found at {head_sha}, skipping")
+        elif (text := _decode(content)) is None:
+            logging.info(f"Skipping binary file: {path}")
+        else:
+            files[path] = text
+    text_diff = PatchSet([])
+    text_diff.extend(
+        file_diff
+        for file_diff in diff
+        if not file_diff.is_binary_file
+        and (file_diff.target_file == DEV_NULL or file_diff.path in files)
+    )
+    return RemoteChanges(
+        pull=pull,
+        diff=text_diff,
+        files=files,
+        config=ProjectConfig.loads(_decode(config_content or b"") or ""),
+        head_sha=head_sha,
+        base_sha=base_sha,
+        head_ref=head_ref,
+    )
+
+
+def post_remote_review_comment(pull: RemotePullRequest, out_folder: str | os.PathLike):
+    """Leave a comment with the review on the pull / merge request."""
+    out_folder = Path(out_folder)
+    if pull.platform == PlatformType.GITHUB:
+        from .commands.gh_post_review_comment import post_github_cr_comment
+
+        post_github_cr_comment(
+            md_report_file=str(out_folder / GITHUB_MD_REPORT_FILE_NAME),
+            pr=pull.number,
+            gh_repo=pull.repo,
+            token="",
+        )
+    else:
+        from .commands.gitlab_post_review_comment import post_gitlab_cr_comment
+
+        post_gitlab_cr_comment(
+            md_report_file=str(out_folder / GITHUB_MD_REPORT_FILE_NAME),
+            json_report_file=str(out_folder / JSON_REPORT_FILE_NAME),
+            project_id=pull.project_id,
+            merge_request_iid=pull.number,
+            token="",
+            base_url=pull.api_url,
+            inline=False,
+        )
+
+
+async def review_remote(
+    pull: RemotePullRequest,
+    out_folder: str | os.PathLike | None = None,
+    filters: str | list[str] = "",
+    token: str | None = None,
+) -> Report | None:
+    """Review the pull / merge request fetched via the platform API."""
+    changes = await fetch_remote_changes(pull, token)
+    return await review(
+        target=changes.review_target(filters),
+        changes=changes,
+        out_folder=out_folder,
+    )
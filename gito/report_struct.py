@@ -1,6 +1,8 @@
+import gzip
 import json
 import logging
-from dataclasses import field, asdict, is_dataclass
+from collections.abc import MutableMapping
+from dataclasses import field, fields, asdict, is_dataclass
 from datetime import datetime
 from enum import StrEnum
 from pathlib import Path
@@ -10,6 +12,7 @@ from pkgutil import resolve_name
 import textwrap
 import microcore as mc
 from microcore.utils import file_link
+import pydantic_core
 from colorama import Fore, Style, Back
 from pydantic.dataclasses import dataclass
 
@@ -163,6 +166,65 @@ class ProcessingWarning:
     file: str | None = field(default=None)
 
 
+class LazyIssues(MutableMapping):
+    """
+    Issues grouped by file as loaded from the JSON report,
+    converted to Issue objects (validated) on the first access to the issues of the file.
+    """
+
+    def __init__(self, raw_issues: dict[str, list[dict]]):
+        self._data: dict[str, list] = dict(raw_issues)
+        self._validated: set[str] = set()
+        self._files_by_id: dict | None = None
+
+    def __getitem__(self, file: str) -> list[Issue]:
+        issues = self._data[file]
+        if file not in self._validated:
+            issues = self._data[file] = [Issue(**i) for i in issues]
+            self._validated.add(file)
+        return issues
+
+    def __setitem__(self, file: str, issues: list[Issue]):
+        self._data[file] = issues
+        self._validated.add(file)
+        self._files_by_id = None
+
+    def __delitem__(self, file: str):
+        del self._data[file]
+        self._validated.discard(file)
+        self._files_by_id = None
+
+    def __contains__(self, file) -> bool:
+        return file in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __reversed__(self):
+        return reversed(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def count(self) -> int:
+        """Total number of issues (without validating them)."""
+        return sum(len(issues) for issues in self._data.values())
+
+    def file_of(self, issue_id: int | str) -> str | None:
+        """Find the file containing the issue with the given ID (without validating issues)."""
+        if self._files_by_id is None:
+            self._files_by_id = {}
+            for file, issues in self._data.items():
+                for issue in issues:
+                    key = issue.id if isinstance(issue, Issue) else issue.get("id")
+                    self._files_by_id.setdefault(key, file)
+        return self._files_by_id.get(issue_id)
+
+    def to_json_data(self) -> dict[str, list]:
+        """Issues for serialization, not accessed issues are kept in the loaded form."""
+        return dict(self._data)
+
+
 @dataclass
 class Report:
     """
@@ -185,11 +247,17 @@ class Report:
     pipeline_out: dict = field(default_factory=dict)
     processing_warnings: list[ProcessingWarning] = field(default_factory=list)
     target: Optional[ReviewTarget] = field(default=None)
+    head_sha: Optional[str] = field(default=None)
+    """SHA of the reviewed commit, used as a starting point for incremental reviews."""
+    stats: dict = field(default_factory=dict)
+    """Review run statistics, e.g. LLM review cache hits and misses."""
 
     @property
     def plain_issues(self) -> list[Issue]:
         """Return a flat list of all issues, without grouping by file."""
-        return [issue for file, issues in self.issues.items() for issue in issues]
+        if self._plain_issues is None:
+            self._plain_issues = [issue for issues in self.issues.values() for issue in issues]
+        return list(self._plain_issues)
 
     def get_issue_by_id(self, issue_id: int | str) -> Issue | None:
         """
@@ -199,10 +267,13 @@ class Report:
         Returns:
             Issue | None: The issue with the specified ID, or None if not found.
         """
-        for issue in self.plain_issues:
-            if issue.id == issue_id:
-                return issue
-        return None
+        issue = self._issues_by_id.get(issue_id)
+        if issue is None and isinstance(self.issues, LazyIssues):
+            if (file := self.issues.file_of(issue_id)) is not None:
+                for file_issue in self.issues[file]:
+                    self._issues_by_id.setdefault(file_issue.id, file_issue)
+                issue = self._issues_by_id.get(issue_id)
+        return issue
 
     def register_issues(self, issues: dict[str, list[RawIssue | dict]]):
         for file, file_issues in issues.items():
@@ -213,27 +284,76 @@ class Report:
         """Register a single issue for a file, converting from RawIssue if necessary."""
         if file not in self.issues:
             self.issues[file] = []
-        total = len(self.plain_issues)
-        self.issues[file].append(Issue.from_raw_issue(file, issue, issue_id=total + 1))
-        self.total_issues = total + 1
+        # Appending to the file that is not the last one changes the order of the flat list
+        if self._plain_issues is not None and file != next(reversed(self.issues)):
+            self._plain_issues = None
+        issue = Issue.from_raw_issue(file, issue, issue_id=self.total_issues + 1)
+        self.issues[file].append(issue)
+        if self._plain_issues is not None:
+            self._plain_issues.append(issue)
+        self._issues_by_id.setdefault(issue.id, issue)
+        self.total_issues += 1
+
+    def reindex(self):
+        """
+        Rebuild the issue index (flat list, ID map and total count),
+        required after modifying the issues dict directly.
+        """
+        self._plain_issues = None
+        self._issues_by_id = {}
+        if isinstance(self.issues, LazyIssues):
+            # Issues are indexed on access
+            self.total_issues = self.issues.count()
+            return
+        for issue in self.plain_issues:
+            self._issues_by_id.setdefault(issue.id, issue)
+        self.total_issues = len(self._plain_issues)
 
     def __post_init__(self):
-        self.total_issues = len(self.plain_issues)
+        self.reindex()
 
-    def save(self, file_name: str = ""):
-        """Save the report to a JSON file."""
+    def save(self, file_name: str | Path = "", compact: bool = False):
+        """
+        Save the report to a JSON file.
+        Args:
+            file_name (str | Path): Target file, gzip-compressed if the name ends with ".gz".
+            compact (bool): Write JSON without indentation.
+        """
         file_name = file_name or JSON_REPORT_FILE_NAME
-        with open(file_name, "w", encoding="utf-8") as f:
-            json.dump(asdict(self), f, indent=4)
+        content = self.to_json(compact)
+        opener = gzip.open if str(file_name).endswith(".gz") else open
+        with opener(file_name, "wb") as f:
+            f.write(content)
         logging.info(f"Report saved to {mc.utils.file_link(file_name)}")
 
+    def to_json(self, compact: bool = False) -> bytes:
+        """Serialize the report to JSON (UTF-8 encoded)."""
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        if isinstance(self.issues, LazyIssues):
+            data["issues"] = self.issues.to_json_data()
+        return pydantic_core.to_json(data, indent=None if compact else 4)
+
     @staticmethod
-    def load(file_name: str | Path = ""):
-        """Load the report from a JSON file."""
-        with open(file_name or JSON_REPORT_FILE_NAME, "r", encoding="utf-8-sig") as f:
-            data = json.load(f)
+    def load(file_name: str | Path = "", lazy: bool = False) -> "Report":
+        """
+        Load the report from a JSON file (optionally gzip-compressed).
+        Args:
+            file_name (str | Path): Source file, defaults to JSON_REPORT_FILE_NAME.
+            lazy (bool): Validate issues only when they are accessed,
+                speeds up loading of large reports when only a few issues are needed.
+        """
+        with open(file_name or JSON_REPORT_FILE_NAME, "rb") as f:
+            content = f.read()
+        if content[:2] == b"\x1f\x8b":
+            content = gzip.decompress(content)
+        data = json.loads(content.decode("utf-8-sig"))
         data.pop("total_issues", None)
-        return Report(**data)
+        if not lazy:
+            return Report(**data)
+        report = Report(**{k: v for k, v in data.items() if k != "issues"})
+        report.issues = LazyIssues(data.get("issues") or {})
+        report.reindex()
+        return report
 
     def render(
         self,
@@ -283,3 +403,49 @@ class Report:
         output = self.render(report_format=report_format)
         print("")
         print(output)
+
+
+class PartialReport:
+    """
+    JSON-lines log of the files reviewed so far, flushed after each file,
+    so that the results survive interruption of the review.
+    Each line contains the file path, issues as returned by the LLM (before post-processing)
+    and processing warnings for the file.
+    """
+
+    def __init__(self, file_name: str | Path):
+        self.file_name = Path(file_name)
+        self._file = None
+
+    def __enter__(self) -> "PartialReport":
+        self._file = open(self.file_name, "w", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc_info):
+        self._file.close()
+        self._file = None
+
+    def add_file(self, file: str, issues: list[dict], warnings: list[ProcessingWarning] = None):
+        record = dict(
+            file=file,
+            issues=issues,
+            processing_warnings=[asdict(w) for w in warnings or []],
+        )
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    @staticmethod
+    def load(file_name: str | Path) -> list[dict]:
+        """Read records of the reviewed files, skipping the incomplete last line if any."""
+        records = []
+        with open(file_name, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+        return records
+
+    def remove(self):
+        """Remove the partial report once the complete report is saved."""
+        self.file_name.unlink(missing_ok=True)
@@ -0,0 +1,106 @@
+"""
+On-disk cache of per-file LLM review results.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import microcore as mc
+
+CACHE_PATH_ENV = "GITO_CACHE_PATH"
+DEFAULT_CACHE_PATH = Path("~/.gito/cache").expanduser()
+
+
+def cache_path() -> Path:
+    """Folder of the review caches (GITO_CACHE_PATH env var or ~/.gito/cache)."""
+    return Path(os.getenv(CACHE_PATH_ENV) or DEFAULT_CACHE_PATH).expanduser()
+
+
+class ReviewCache:
+    """
+    Content-addressed cache of parsed LLM review responses (issue lists).
+    Entries are keyed by the hash of the rendered prompt and the model,
+    so identical file diffs reviewed with the same prompt and model are not sent again.
+    The least recently used entries are evicted when the cache exceeds max_size bytes.
+    """
+
+    def __init__(self, folder: str | os.PathLike, max_size: int):
+        self.folder = Path(folder)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def for_git_dir(git_dir: str | os.PathLike, max_size: int) -> "ReviewCache":
+        """
+        Cache of the repository kept outside of its working tree, in the user cache folder.
+        Keyed by the (common) git directory, so worktrees of a repository share the cache.
+        """
+        git_dir = Path(git_dir).resolve()
+        name = git_dir.parent.name if git_dir.name == ".git" else git_dir.name
+        digest = hashlib.sha1(str(git_dir).encode("utf-8")).hexdigest()[:12]
+        return ReviewCache(cache_path() / f"{name}-{digest}", max_size)
+
+    @staticmethod
+    def current_model() -> str:
+        """Identifier of the configured LLM used in cache keys."""
+        return f"{mc.config().LLM_API_TYPE}:{mc.config().MODEL}"
+
+    @staticmethod
+    def make_key(prompt: str, model: str | None = None) -> str:
+        """Build the cache key for the rendered prompt and the model (current one by default)."""
+        if model is None:
+            model = ReviewCache.current_model()
+        return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.folder / f"{key}.json"
+
+    def get(self, key: str) -> list[dict] | None:
+        """Return the cached issue list or None on cache miss."""
+        path = self._path(key)
+        try:
+            issues = json.loads(path.read_text(encoding="utf-8"))
+            # Refresh the access time used for LRU eviction
+            os.utime(path)
+        except (FileNotFoundError, ValueError, OSError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return issues
+
+    def put(self, key: str, issues: list[dict]):
+        """Store the issue list under the given key."""
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(issues), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logging.warning(f"Could not save LLM review results to cache: {e}")
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits into max_size."""
+        try:
+            entries = [(p, p.stat()) for p in self.folder.glob("*.json")]
+        except OSError:
+            return
+        total = sum(st.st_size for _, st in entries)
+        if total <= self.max_size:
+            return
+        for path, st in sorted(entries, key=lambda e: e[1].st_mtime):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= st.st_size
+            if total <= self.max_size:
+                break
+
+    @property
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,37 @@
+"""
+Changes reviewed without a local git repository:
+the diff and, optionally, the contents of the changed files after the change.
+"""
+
+from dataclasses import dataclass
+
+from unidiff import PatchSet
+
+from .project_config import ProjectConfig
+
+
+@dataclass
+class ReviewChanges:
+    diff: PatchSet
+    config: ProjectConfig
+    """Project configuration applied to the review."""
+    files: dict[str, str] | None = None
+    """
+    Contents of the changed files after the change (deleted files are absent),
+    None to review the diff alone.
+    """
+    head_sha: str | None = None
+    """Reviewed commit, if known."""
+
+    @property
+    def has_file_contents(self) -> bool:
+        return self.files is not None
+
+    def read_file(self, path: str) -> str:
+        """
+        Content of the changed file, raises KeyError if not available (like core.read_file).
+        Without file contents (diff-only review) returns an empty string.
+        """
+        if self.files is None:
+            return ""
+        return self.files[path]
@@ -0,0 +1,261 @@
+"""
+Long-running review server (`gito serve`).
+Accepts review / ask jobs as JSON over HTTP on a localhost port or a Unix socket
+and runs them concurrently in a single process with the LLM configured once
+and one LLM scheduler (concurrency and rate limit budget) shared by all jobs.
+
+Endpoints:
+    POST /review  {"path" | "url", "refs", "what", "against", "filters", "merge_base", "all",
+                   "pr", "out", "incremental"} -> Report JSON (null if there are no changes)
+    POST /ask     {"question", "path" | "url", "refs", "what", "against", "filters",
+                   "merge_base", "all", "pr", "use_pipeline"} -> {"answer": "..."}
+    GET  /health  -> {"status": "ok", "active_jobs": ..., "completed_jobs": ...,
+                      "llm_scheduler": {...}}
+
+With the job queue enabled (see gito.webhooks):
+    POST /webhook/github  GitHub `pull_request` event -> {"status": "queued", "job_id": ...}
+    POST /webhook/gitlab  GitLab `merge_request` event -> {"status": "queued", "job_id": ...}
+"""
+
+import asyncio
+import json
+import logging
+import os
+from contextlib import contextmanager, ExitStack
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import typer
+from microcore import ui
+
+from .cli_base import args_to_target, consider_arg_all, get_repo_context, make_review_target
+from .core import review, answer
+from .llm_scheduler import LLMScheduler, tenant
+from .utils.git_platform.platform_types import PlatformType
+from .webhooks import WebhookReceiver
+
+DEFAULT_PORT = 8765
+MAX_REQUEST_BODY_SIZE = 10 * 2**20
+
+
+class ReviewServer:
+    def __init__(
+        self,
+        max_jobs: int = 4,
+        max_llm_concurrency: int | None = None,
+        webhooks: WebhookReceiver | None = None,
+        roots: list[str | os.PathLike] | None = None,
+    ):
+        """
+        Args:
+            max_jobs (int): Number of jobs running concurrently, others wait in the queue.
+            max_llm_concurrency (int | None): Concurrent LLM requests of all jobs,
+                defaults to the MAX_CONCURRENT_TASKS setting of the LLM configuration.
+            webhooks (WebhookReceiver | None): Enables the webhook endpoints.
+            roots (list[str | os.PathLike] | None): Folders containing the repositories
+                and the output folders the jobs may use, defaults to the current folder.
+        """
+        self.webhooks = webhooks
+        self.roots = [Path(root).resolve() for root in roots or [Path.cwd()]]
+        self.job_slots = asyncio.Semaphore(max_jobs)
+        # Reviews of all jobs (including webhook jobs) share the LLM requests budget
+        self.scheduler = LLMScheduler.from_config()
+        if max_llm_concurrency:
+            self.scheduler.max_concurrency = max_llm_concurrency
+            self.scheduler.concurrency = min(self.scheduler.concurrency, max_llm_concurrency)
+        if webhooks:
+            webhooks.scheduler = self.scheduler
+        # Jobs writing to the same output folder run one at a time
+        self.folder_locks: dict[Path, asyncio.Lock] = {}
+        self.active_jobs = 0
+        self.completed_jobs = 0
+
+    @contextmanager
+    def _job(self):
+        self.active_jobs += 1
+        try:
+            yield
+        finally:
+            self.active_jobs -= 1
+            self.completed_jobs += 1
+
+    def _check_path(self, path: str | os.PathLike, name: str) -> Path:
+        """Reject paths outside of the configured roots."""
+        resolved = Path(path).resolve()
+        if not any(resolved.is_relative_to(root) for root in self.roots):
+            raise ValueError(f"{name} is outside of the allowed folders: {path}")
+        return resolved
+
+    async def _enter_repo(self, stack: ExitStack, params: dict, what: str | None):
+        if not params.get("url"):
+            self._check_path(params.get("path") or ".", "path")
+        # Cloning remote repositories blocks, keep the event loop serving other jobs
+        return await asyncio.to_thread(
+            stack.enter_context, get_repo_context(params.get("url"), what, params.get("path"))
+        )
+
+    @staticmethod
+    def _refs(params: dict) -> tuple[str | None, str | None, bool]:
+        refs, merge_base = consider_arg_all(
+            bool(params.get("all")), params.get("refs"), params.get("merge_base", True)
+        )
+        what, against = args_to_target(refs, params.get("what"), params.get("against"))
+        return what, against, merge_base
+
+    async def run_review(self, params: dict) -> bytes:
+        what, against, merge_base = self._refs(params)
+        async with self.job_slots:
+            with self._job(), ExitStack() as stack:
+                repo, out_folder = await self._enter_repo(stack, params, what)
+                # Reports of remote repositories are written to their temporary worktree
+                out_folder = (
+                    self._check_path(params["out"], "out")
+                    if params.get("out")
+                    else Path(out_folder).resolve()
+                )
+                lock = self.folder_locks.setdefault(out_folder, asyncio.Lock())
+                target = await asyncio.to_thread(
+                    make_review_target,
+                    repo,
+                    what,
+                    against,
+                    params.get("filters") or "",
+                    merge_base,
+                    params.get("pr"),
+                )
+                # LLM request slots are shared fairly between the repositories
+                async with lock:
+                    with tenant(params.get("url") or repo.working_tree_dir):
+                        report = await review(
+                            repo=repo,
+                            target=target,
+                            out_folder=out_folder,
+                            incremental=bool(params.get("incremental")),
+                            scheduler=self.scheduler,
+                        )
+        return report.to_json(compact=True) if report else b"null"
+
+    async def run_ask(self, params: dict) -> bytes:
+        if not params.get("question"):
+            raise ValueError("Missing question")
+        what, against, merge_base = self._refs(params)
+        async with self.job_slots:
+            with self._job(), ExitStack() as stack:
+                repo, _ = await self._enter_repo(stack, params, what)
+                # answer() uses synchronous LLM calls
+                out = await asyncio.to_thread(
+                    answer,
+                    question=params["question"],
+                    repo=repo,
+                    what=what,
+                    against=against,
+                    filters=params.get("filters") or "",
+                    use_merge_base=merge_base,
+                    use_pipeline=params.get("use_pipeline", True),
+                    pr=params.get("pr"),
+                )
+        return json.dumps({"answer": out}).encode()
+
+    async def handle(
+        self, method: str, path: str, body: bytes, headers: dict[str, str] | None = None
+    ) -> tuple[int, bytes]:
+        """Process the request, returns the HTTP status and the JSON response body."""
+        webhook_routes = {
+            ("POST", "/webhook/github"): PlatformType.GITHUB,
+            ("POST", "/webhook/gitlab"): PlatformType.GITLAB,
+        }
+        if self.webhooks and (method, path) in webhook_routes:
+            try:
+                status, response = self.webhooks.receive(
+                    webhook_routes[(method, path)], headers or {}, body
+                )
+            except ValueError as e:
+                status, response = 400, {"error": str(e)}
+            return status, json.dumps(response).encode()
+        routes = {
+            ("POST", "/review"): self.run_review,
+            ("POST", "/ask"): self.run_ask,
+        }
+        if (method, path) == ("GET", "/health"):
+            health = {
+                "status": "ok",
+                "active_jobs": self.active_jobs,
+                "completed_jobs": self.completed_jobs,
+                "llm_scheduler": self.scheduler.stats,
+            }
+            if self.webhooks:
+                health["webhook_jobs"] = self.webhooks.queue.counts()
+            return 200, json.dumps(health).encode()
+        if (method, path) not in routes:
+            return 404, json.dumps({"error": f"Unknown endpoint: {method} {path}"}).encode()
+        try:
+            params = json.loads(body or b"{}")
+            if not isinstance(params, dict):
+                raise ValueError("Request body must be a JSON object")
+            return 200, await routes[(method, path)](params)
+        except (ValueError, typer.BadParameter) as e:
+            return 400, json.dumps({"error": str(e)}).encode()
+        except Exception as e:
+            logging.exception(f"Error processing {method} {path}")
+            return 500, json.dumps({"error": f"[{type(e).__name__}] {e}"}).encode()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = (await reader.readline()).decode("latin-1")
+            method, target, _ = request_line.split(" ", 2)
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            size = int(headers.get("content-length") or 0)
+            if size > MAX_REQUEST_BODY_SIZE:
+                raise ValueError("Request body is too large")
+            body = await reader.readexactly(size)
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            status, response = 400, json.dumps({"error": f"Bad request: {e}"}).encode()
+        else:
+            status, response = await self.handle(method, urlsplit(target).path, body, headers)
+        try:
+            writer.write(
+                f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(response)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1")
+                + response
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        socket_path: str | None = None,
+    ) -> asyncio.Server:
+        """Start accepting connections on the Unix socket (if provided) or the TCP port."""
+        if socket_path:
+            server = await asyncio.start_unix_server(self._handle_connection, path=socket_path)
+            logging.info(f"Gito server listening on {ui.green(socket_path)}")
+        else:
+            server = await asyncio.start_server(self._handle_connection, host, port)
+            address = server.sockets[0].getsockname()
+            logging.info(f"Gito server listening on {ui.green(f'http://{host}:{address[1]}')}")
+        return server
+
+    async def serve(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        socket_path: str | None = None,
+    ):
+        """Run the server until cancelled."""
+        server = await self.start(host, port, socket_path)
+        workers = asyncio.create_task(self.webhooks.run()) if self.webhooks else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if workers:
+                workers.cancel()
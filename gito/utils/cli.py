@@ -1,9 +1,8 @@
 import sys
 import textwrap
-from typing import Optional, Callable
+from typing import Optional, Callable, Iterable
 
 import typer
-import microcore as mc
 
 from .git_platform.github import is_running_in_github_action
 from .git_platform.gitlab import is_running_in_gitlab_ci
@@ -38,16 +37,23 @@ def make_streaming_function(handler: Optional[Callable] = None) -> Callable:
     return stream
 
 
-def no_subcommand(app: typer.Typer) -> bool:
+def no_subcommand(app: typer.Typer, lazy_commands: Iterable[str] = ()) -> bool:
     """
     Check if no subcommand was provided to the target Typer application.
+    Args:
+        app (typer.Typer): The Typer application.
+        lazy_commands (Iterable[str]): Names of commands not registered yet
+            (registered by modules imported on demand).
     """
     return not (
         (first_arg := next((a for a in sys.argv[1:] if not a.startswith("-")), ""))
-        and first_arg
-        in (
-            cmd.name or (cmd.callback.__name__.replace("_", "-") if cmd.callback else "")
-            for cmd in app.registered_commands
+        and (
+            first_arg in lazy_commands
+            or first_arg
+            in (
+                cmd.name or (cmd.callback.__name__.replace("_", "-") if cmd.callback else "")
+                for cmd in app.registered_commands
+            )
         )
         or "--help" in sys.argv
     )
@@ -55,7 +61,9 @@ def no_subcommand(app: typer.Typer) -> bool:
 
 def logo(indent=2) -> str:
     """Generate Gito ASCII art logo."""
-    r = mc.ui.reset
+    from microcore import ui
+
+    r = ui.reset
 
     # Character classifications
     CHAR_TYPES = {
@@ -0,0 +1,255 @@
+"""
+Batched access to Git blobs through long-lived `git cat-file --batch-check` / `--batch` processes.
+"""
+
+import logging
+import os
+import subprocess
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from functools import partial
+from typing import Callable, Iterable, Optional
+
+import git
+
+BlobKey = tuple[str, str]
+"""(ref, path) pair identifying a blob in the repository."""
+BlobInfo = tuple[bytes, bytes, int]
+"""(object id, object type, size) of a Git object."""
+
+MAX_CACHE_SIZE = 64 * 1024 * 1024
+"""Total size of the cached blob contents (bytes), least recently used blobs are evicted."""
+MAX_CACHED_BLOB_SIZE = 1024 * 1024
+"""Larger blobs are read on each request and never kept in the cache."""
+
+_readers: "weakref.WeakKeyDictionary[git.Repo, GitBlobReader]" = weakref.WeakKeyDictionary()
+
+
+class GitBlobReader:
+    """
+    Resolves (ref, path) pairs to blob contents using persistent `git cat-file` processes
+    (one pair per repository).
+    (ref, path) pairs are resolved to object ids on every read, so moved refs and checkouts
+    are always respected; contents are cached by object id, within the size limits.
+    """
+
+    def __init__(
+        self,
+        repo: git.Repo,
+        cache_size: int = MAX_CACHE_SIZE,
+        max_cached_blob_size: int = MAX_CACHED_BLOB_SIZE,
+    ):
+        # Keep only the path: shared readers are weakly keyed by the repo object
+        self.working_dir = repo.working_dir
+        # Reading contents missing in partial clones fetches them from the remote
+        self.env = repo.git.environment().copy()
+        self.cache_size = cache_size
+        self.max_cached_blob_size = max_cached_blob_size
+        # `git cat-file --batch-check`: resolves object names to ids, types and sizes
+        self._check_process: Optional[subprocess.Popen] = None
+        # `git cat-file --batch`: reads contents of the objects
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[bytes, bytes] = OrderedDict()
+        self._cached_bytes = 0
+
+    def _start(self, mode: str) -> subprocess.Popen:
+        return subprocess.Popen(
+            [git.Git.GIT_PYTHON_GIT_EXECUTABLE or "git", "cat-file", mode],
+            cwd=self.working_dir,
+            env=os.environ | self.env if self.env else None,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
+        )
+
+    def _get_check_process(self) -> subprocess.Popen:
+        if self._check_process is None or self._check_process.poll() is not None:
+            self._check_process = self._start("--batch-check")
+        return self._check_process
+
+    def _get_process(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = self._start("--batch")
+        return self._process
+
+    @staticmethod
+    def _write_requests(process: subprocess.Popen, specs: list[bytes]):
+        # Runs in a separate thread: git writes responses while we keep feeding requests,
+        # so writing everything up front from the reading thread could deadlock on full pipes.
+        try:
+            for spec in specs:
+                process.stdin.write(spec)
+            process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            logging.error(f"Failed to send requests to git cat-file: {e}")
+
+    @staticmethod
+    def _read_header(process: subprocess.Popen) -> Optional[BlobInfo]:
+        """(object id, type, size) from the response header, None for missing objects."""
+        header = process.stdout.readline()
+        if not header:
+            raise RuntimeError("git cat-file process terminated unexpectedly")
+        if header.endswith((b" missing\n", b" ambiguous\n")):
+            return None
+        object_id, object_type, size = header.split()
+        return object_id, object_type, int(size)
+
+    @classmethod
+    def _read_content(
+        cls, process: subprocess.Popen, limit: Optional[int] = None
+    ) -> Optional[bytes]:
+        """Read the object content, only its first `limit` bytes are kept if provided."""
+        if (header := cls._read_header(process)) is None:
+            return None
+        size = header[2]
+        data = process.stdout.read(size if limit is None else min(size, limit))
+        # Skip the rest of the content in chunks, without holding it in memory
+        remaining = size - len(data)
+        while remaining > 0:
+            remaining -= len(process.stdout.read(min(remaining, 1024 * 1024)))
+        process.stdout.read(1)  # trailing LF
+        return data
+
+    def _round_trip(
+        self,
+        process: subprocess.Popen,
+        specs: list[bytes],
+        read_response: Callable[[subprocess.Popen], object],
+    ) -> list:
+        writer = threading.Thread(target=self._write_requests, args=(process, specs), daemon=True)
+        writer.start()
+        try:
+            return [read_response(process) for _ in specs]
+        except Exception:
+            # Response stream is out of sync, restart the processes on the next request
+            self._terminate()
+            raise
+        finally:
+            writer.join()
+
+    def _store(self, object_id: bytes, data: bytes):
+        if len(data) > self.max_cached_blob_size or object_id in self._cache:
+            return
+        self._cache[object_id] = data
+        self._cached_bytes += len(data)
+        while self._cached_bytes > self.cache_size:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+
+    @staticmethod
+    def _requested(items: list[BlobKey]) -> list[BlobKey]:
+        return [(ref, path) for ref, path in items if "\n" not in ref + path]
+
+    def _resolve(self, requested: list[BlobKey]) -> dict[BlobKey, Optional[BlobInfo]]:
+        headers = self._round_trip(
+            self._get_check_process(),
+            [f"{ref}:{path}\n".encode("utf-8") for ref, path in requested],
+            self._read_header,
+        )
+        return dict(zip(requested, headers))
+
+    def read_many(
+        self, items: Iterable[BlobKey], limit: Optional[int] = None
+    ) -> dict[BlobKey, Optional[bytes]]:
+        """
+        Read multiple blobs in a single round-trip to each git process.
+        Args:
+            items: (ref, path) pairs to read.
+            limit: Read only the first `limit` bytes of each blob
+                (bounded memory use, e.g. to sniff the content type).
+        Returns:
+            dict mapping each requested (ref, path) pair to the blob content,
+            or None if there is no such blob.
+        """
+        items = list(dict.fromkeys(items))
+        result: dict[BlobKey, Optional[bytes]] = dict.fromkeys(items)
+        if not (requested := self._requested(items)):
+            return result
+        with self._lock:
+            object_ids = {
+                key: header[0]
+                for key, header in self._resolve(requested).items()
+                if header and header[1] == b"blob"
+            }
+            to_read = [i for i in dict.fromkeys(object_ids.values()) if i not in self._cache]
+            contents = {}
+            if to_read:
+                data = self._round_trip(
+                    self._get_process(),
+                    [i + b"\n" for i in to_read],
+                    partial(self._read_content, limit=limit),
+                )
+                contents = dict(zip(to_read, data))
+            for key, object_id in object_ids.items():
+                if object_id in contents:
+                    result[key] = contents[object_id]
+                else:
+                    self._cache.move_to_end(object_id)
+                    result[key] = self._cache[object_id][:limit]
+            if limit is None:
+                for object_id, data in contents.items():
+                    if data is not None:
+                        self._store(object_id, data)
+        return result
+
+    def read(self, ref: str, path: str) -> Optional[bytes]:
+        """
+        Read a single blob.
+        Returns:
+            The blob content or None if `path` does not exist in `ref`.
+        """
+        return self.read_many([(ref, path)])[(ref, path)]
+
+    def prefetch(self, items: Iterable[BlobKey]):
+        """Load blobs into the cache in bulk ahead of individual reads."""
+        self.read_many(items)
+
+    @staticmethod
+    def _stop(process: subprocess.Popen):
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
+    def _terminate(self):
+        processes = [self._check_process, self._process]
+        self._check_process = self._process = None
+        for process in processes:
+            if process is not None:
+                self._stop(process)
+
+    def close(self):
+        """Stop the git processes and drop cached blobs."""
+        with self._lock:
+            self._terminate()
+            self._cache.clear()
+            self._cached_bytes = 0
+
+    def __del__(self):
+        try:
+            self._terminate()
+        except Exception:
+            pass
+
+
+def get_blob_reader(repo: git.Repo) -> GitBlobReader:
+    """Return the blob reader shared by all callers working with the given repository."""
+    if (reader := _readers.get(repo)) is None:
+        reader = _readers[repo] = GitBlobReader(repo)
+    return reader
+
+
+def close_blob_reader(repo: git.Repo):
+    """Close the shared blob reader of the repository, if any."""
+    if (reader := _readers.pop(repo, None)) is not None:
+        reader.close()
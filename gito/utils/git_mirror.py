@@ -0,0 +1,254 @@
+"""
+Persistent cache of remote repositories (shallow partial bare clones) used to review remote
+repositories without cloning them from scratch: the cached clone is fetched incrementally,
+deepened on demand to reach the merge base of the reviewed refs,
+and each review works in a temporary worktree of it.
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+import weakref
+from pathlib import Path
+from urllib.parse import unquote, urlsplit, urlunsplit
+
+import git
+from microcore import ui
+
+MIRRORS_PATH_ENV = "GITO_MIRRORS_PATH"
+DEFAULT_MIRRORS_PATH = Path("~/.gito/mirrors").expanduser()
+# Fetch commits and trees only, file contents are fetched on demand
+PARTIAL_CLONE_FILTER = "blob:none"
+# Commits fetched from the tip of each branch when caching the repository,
+# the history is deepened on demand to reach the merge base of the reviewed refs
+MIRROR_DEPTH = 100
+# Deepening steps (doubling the depth) before fetching the whole history
+MAX_DEEPEN_STEPS = 5
+# Local branches and remote-tracking branches, so refs like "main" and "origin/main" resolve
+FETCH_REFSPECS = ["+refs/heads/*:refs/heads/*", "+refs/heads/*:refs/remotes/origin/*"]
+
+_locks: dict[Path, threading.Lock] = {}
+_locks_guard = threading.Lock()
+_partial_clones: "weakref.WeakKeyDictionary[git.Repo, bool]" = weakref.WeakKeyDictionary()
+
+
+def mirrors_path() -> Path:
+    """Folder of the cached repositories (GITO_MIRRORS_PATH env var or ~/.gito/mirrors)."""
+    return Path(os.getenv(MIRRORS_PATH_ENV) or DEFAULT_MIRRORS_PATH).expanduser()
+
+
+def without_credentials(url: str) -> str:
+    parts = urlsplit(url)
+    if "@" not in parts.netloc or not parts.scheme:
+        return url
+    return urlunsplit(parts._replace(netloc=parts.netloc.rsplit("@", 1)[1]))
+
+
+def http_auth_env(url: str, username: str, password: str) -> dict[str, str]:
+    """
+    Environment of the Git commands sending the credentials as the authorization header
+    of the HTTP requests to the host of the URL.
+    Unlike credentials in the remote URL, they are neither stored in the repository config
+    nor visible in the command line of the Git processes.
+    """
+    parts = urlsplit(without_credentials(url))
+    credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return {
+        "GIT_CONFIG_COUNT": "1",
+        "GIT_CONFIG_KEY_0": f"http.{parts.scheme}://{parts.netloc}/.extraheader",
+        "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials}",
+    }
+
+
+def credentials_env(url: str) -> dict[str, str]:
+    """Environment of the Git commands passing the credentials of the URL (if any)."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or parts.username is None:
+        return {}
+    return http_auth_env(url, unquote(parts.username), unquote(parts.password or ""))
+
+
+def mirror_path(url: str) -> Path:
+    """Location of the cached repository, the same for URLs differing only by credentials."""
+    url = without_credentials(url)
+    name = "-".join(re.split(r"[/:\\]", url.rstrip("/").removesuffix(".git"))[-2:])
+    name = re.sub(r"[^\w.-]+", "-", name).strip("-.")
+    return mirrors_path() / f"{name}-{hashlib.sha1(url.encode()).hexdigest()[:12]}"
+
+
+def _lock(path: Path) -> threading.Lock:
+    # The same for the mirror path and the common dir of its worktrees
+    path = path.resolve()
+    with _locks_guard:
+        return _locks.setdefault(path, threading.Lock())
+
+
+def _set_origin_head(mirror: git.Git):
+    """Point origin/HEAD to the default branch (used to find the base branch of reviews)."""
+    head = mirror.symbolic_ref("HEAD").removeprefix("refs/heads/")
+    mirror.symbolic_ref("refs/remotes/origin/HEAD", f"refs/remotes/origin/{head}")
+
+
+def _clone(url: str, path: Path, env: dict[str, str]):
+    logging.info(f"Caching the repository {ui.green(url)} in {path}...")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Clone next to the target and rename, interrupted clones don't leave broken caches
+    tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    try:
+        git.Git().clone(
+            "--bare",
+            f"--filter={PARTIAL_CLONE_FILTER}",
+            f"--depth={MIRROR_DEPTH}",
+            "--no-single-branch",
+            url,
+            str(tmp_path),
+            env=env,
+        )
+        mirror = git.Git(tmp_path)
+        mirror.update_environment(**env)
+        mirror.config("--unset-all", "remote.origin.fetch", with_exceptions=False)
+        for refspec in FETCH_REFSPECS:
+            mirror.config("--add", "remote.origin.fetch", refspec)
+        # Later fetches get new commits only (down to the known ones), keeping deepened history
+        mirror.fetch("--tags", f"--depth={MIRROR_DEPTH}", "origin")
+        _set_origin_head(mirror)
+        os.replace(tmp_path, path)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def update_mirror(url: str, env: dict[str, str] | None = None) -> Path:
+    """
+    Create the cached repository or fetch new commits into it, returns its path.
+    Args:
+        url (str): URL of the remote repository.
+        env (dict[str, str] | None): Environment of the Git commands accessing the remote
+            repository (see http_auth_env()), defaults to passing the credentials of the URL.
+    """
+    path = mirror_path(url)
+    env = env if env is not None else credentials_env(url)
+    url = without_credentials(url)
+    with _lock(path):
+        if not (path / "HEAD").exists():
+            _clone(url, path, env)
+            return path
+        logging.info(f"Fetching {ui.green(url)} into {path}...")
+        mirror = git.Git(path)
+        mirror.update_environment(**env)
+        # Caches created by older versions stored the credentials in the remote URL
+        mirror.remote("set-url", "origin", url)
+        mirror.worktree("prune")
+        # Branches may be checked out in worktrees of concurrent reviews
+        mirror.fetch("--prune", "--tags", "--update-head-ok", "origin")
+        _set_origin_head(mirror)
+    return path
+
+
+def add_worktree(mirror: Path, path: str | Path, rev: str | None = None):
+    """Check out the revision (default branch by default) of the cached repository to the path."""
+    with _lock(mirror):
+        git.Git(mirror).worktree("add", "--detach", str(path), rev or "HEAD")
+
+
+def remove_worktree(mirror: Path, path: str | Path):
+    with _lock(mirror):
+        git.Git(mirror).worktree("remove", "--force", str(path), with_exceptions=False)
+        git.Git(mirror).worktree("prune")
+
+
+def is_partial_clone(repo: git.Repo) -> bool:
+    """Whether the repository is a partial clone, checked once per repository."""
+    if (partial := _partial_clones.get(repo)) is None:
+        partial = _partial_clones[repo] = bool(
+            repo.git.config("--get", "remote.origin.promisor", with_exceptions=False)
+        )
+    return partial
+
+
+def is_shallow(repo: git.Repo) -> bool:
+    return (Path(repo.common_dir) / "shallow").exists()
+
+
+def deepen_to_merge_base(repo: git.Repo, base: str, what: str):
+    """
+    Deepen the history of the shallow clone (see MIRROR_DEPTH) until the merge base
+    of the refs is reachable, fetching the whole history as the last resort.
+    """
+    if not is_shallow(repo):
+        return
+    depth = MIRROR_DEPTH
+    for _ in range(MAX_DEEPEN_STEPS):
+        if repo.git.merge_base(base, what, with_exceptions=False):
+            return
+        logging.info(f"Deepening the history by {depth} commits to reach the merge base...")
+        with _lock(Path(repo.common_dir)):
+            repo.git.fetch("--deepen", str(depth), "origin")
+        if not is_shallow(repo):
+            return
+        depth *= 2
+    if not repo.git.merge_base(base, what, with_exceptions=False):
+        logging.info("Fetching the whole history to reach the merge base...")
+        with _lock(Path(repo.common_dir)):
+            repo.git.fetch("--unshallow", "origin")
+
+
+def prefetch_diff_blobs(repo: git.Repo, base: str, what: str, pathspecs: list[str] = None):
+    """
+    Fetch the file contents needed to diff the commits of the partial clone in a single request
+    (instead of fetching them one by one on access).
+    Failures are only logged: Git fetches missing contents on access anyway.
+    """
+    if not is_partial_clone(repo):
+        return
+    cwd = repo.working_tree_dir or repo.git_dir
+    try:
+        output = repo.git.diff(
+            "--raw", "--no-abbrev", "--no-renames", base, what, "--", *(pathspecs or [])
+        )
+        blobs = set()
+        for line in output.splitlines():
+            # :<old mode> <new mode> <old blob> <new blob> <status>\t<path>
+            fields = line.split("\t", 1)[0].split()
+            if len(fields) == 5:
+                blobs.update(oid for oid in fields[2:4] if oid.strip("0"))
+        if not blobs:
+            return
+        # Listing the objects of the trees doesn't fetch the missing ones
+        listing = repo.git.rev_list(
+            "--objects", "--missing=print", f"{base}^{{tree}}", f"{what}^{{tree}}"
+        )
+        missing = [
+            line[1:] for line in listing.splitlines() if line.startswith("?") and line[1:] in blobs
+        ]
+        if not missing:
+            return
+        logging.info(f"Prefetching {len(missing)} blob(s) of the changed files...")
+        subprocess.run(
+            [
+                git.Git.GIT_PYTHON_GIT_EXECUTABLE or "git",
+                "-c",
+                "fetch.negotiationAlgorithm=noop",
+                "fetch",
+                "origin",
+                "--no-tags",
+                "--no-write-fetch-head",
+                "--recurse-submodules=no",
+                f"--filter={PARTIAL_CLONE_FILTER}",
+                "--stdin",
+            ],
+            cwd=cwd,
+            input="\n".join(missing) + "\n",
+            # Credentials of the remote repository, see get_repo_context()
+            env=os.environ | repo.git.environment(),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (git.GitCommandError, subprocess.CalledProcessError) as e:
+        logging.warning(f"Could not prefetch the changed files: {getattr(e, 'stderr', e)}")
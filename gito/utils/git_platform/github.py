@@ -73,10 +73,13 @@ def get_gh_file_link(
     return get_repo_web_url(repo_or_base_url, url_path)
 
 
-def detect_github_env() -> dict:
+def detect_github_env(working_folder: str | os.PathLike | None = None) -> dict:
     """
     Try to detect GitHub repository/PR info from environment variables (for GitHub Actions).
     Returns a dict with github_repo, github_pr_sha, github_pr_number, github_ref, etc.
+    Args:
+        working_folder: Folder of the local repository used as a fallback
+            for local usage, defaults to Env.working_folder.
     """
     repo = os.environ.get("GITHUB_REPOSITORY", "")
     pr_sha = os.environ.get("GITHUB_SHA", "")
@@ -104,7 +107,9 @@ def detect_github_env() -> dict:
     if not repo or repo == "octocat/Hello-World":
         git_repo = None
         try:
-            git_repo = git.Repo(Env.working_folder, search_parent_directories=True)
+            git_repo = git.Repo(
+                working_folder or Env.working_folder, search_parent_directories=True
+            )
             origin = git_repo.remotes.origin.url
             # e.g. git@github.com:Nayjest/ai-code-review.git -> Nayjest/ai-code-review
             match = re.search(r"[:/]([\w\-]+)/([\w\-\.]+?)(\.git)?$", origin)
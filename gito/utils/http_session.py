@@ -0,0 +1,200 @@
+"""
+HTTP session shared by the git platform and issue tracker integrations:
+keep-alive connection pooling, retries with exponential backoff on 429 / 5xx responses
+(honoring the Retry-After and X-RateLimit-* headers) and per-host concurrency limits.
+"""
+
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 30
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+"""Delay before the retry N (from 0) is BACKOFF_FACTOR * 2 ** N seconds (with jitter)."""
+MAX_RETRY_WAIT = 60
+"""Longer waits (e.g. rate limit reset in an hour) are not awaited, the response is returned."""
+MAX_CONCURRENT_REQUESTS_PER_HOST = 8
+# Requests that are safe to repeat after a failure of unknown outcome (5xx, connection error)
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Responses sent without processing the request, retried for any method
+RETRY_ANY_METHOD_STATUSES = {429, 503}
+RETRY_IDEMPOTENT_STATUSES = {500, 502, 504}
+
+
+def _retry_after(resp: requests.Response) -> float | None:
+    """Seconds to wait from the Retry-After header (delay in seconds or HTTP date)."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _rate_limit_reset(resp: requests.Response) -> float | None:
+    """
+    Seconds until the rate limit resets if it is exhausted (X-RateLimit-Remaining: 0),
+    X-RateLimit-Reset is a UNIX timestamp on GitHub and GitLab.
+    """
+    headers = resp.headers
+    remaining = headers.get("X-RateLimit-Remaining") or headers.get("RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset") or headers.get("RateLimit-Reset")
+    if remaining != "0" or not reset:
+        return None
+    try:
+        return max(0.0, float(reset) - time.time())
+    except ValueError:
+        return None
+
+
+def _is_rate_limited(resp: requests.Response) -> bool:
+    """
+    GitHub responds to exceeded (primary or secondary) rate limits with 403
+    and X-RateLimit-Remaining: 0 or Retry-After headers.
+    """
+    return resp.status_code == 403 and (
+        _rate_limit_reset(resp) is not None or "Retry-After" in resp.headers
+    )
+
+
+class HttpSession(requests.Session):
+    """
+    requests.Session with retries, rate limit handling and per-host concurrency limits.
+    Safe to share between threads; a default timeout is applied to all requests.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = MAX_RETRIES,
+        backoff_factor: float = BACKOFF_FACTOR,
+        max_retry_wait: float = MAX_RETRY_WAIT,
+        max_concurrent_per_host: int = MAX_CONCURRENT_REQUESTS_PER_HOST,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        super().__init__()
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_retry_wait = max_retry_wait
+        self.max_concurrent_per_host = max_concurrent_per_host
+        self.timeout = timeout
+        # Keep as many connections per host as requests may run concurrently
+        adapter = HTTPAdapter(pool_maxsize=max_concurrent_per_host)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        # Hosts not accepting requests until the time.monotonic() value (rate limited)
+        self._blocked_until: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.retries = 0
+
+    @contextmanager
+    def _host_slot(self, host: str):
+        with self._lock:
+            slot = self._host_slots.setdefault(
+                host, threading.BoundedSemaphore(self.max_concurrent_per_host)
+            )
+        with slot:
+            yield
+
+    def _wait_for_host(self, host: str):
+        with self._lock:
+            blocked_until = self._blocked_until.get(host, 0)
+        delay = blocked_until - time.monotonic()
+        if 0 < delay <= self.max_retry_wait:
+            logging.info(f"Waiting {delay:.1f}s for the rate limit of {host}")
+            time.sleep(delay)
+
+    def _block_host(self, host: str, delay: float):
+        with self._lock:
+            until = time.monotonic() + delay
+            self._blocked_until[host] = max(self._blocked_until.get(host, 0), until)
+
+    def retry_delay(
+        self, method: str, resp: requests.Response | None, attempt: int
+    ) -> float | None:
+        """
+        Seconds to wait before retrying the request, None if it should not be retried.
+        Args:
+            resp: The response, None if the request failed to complete (connection error).
+            attempt: Number of the failed attempt, from 0.
+        """
+        if attempt >= self.max_retries:
+            return None
+        backoff = self.backoff_factor * 2**attempt * random.uniform(0.5, 1.5)
+        if resp is None:
+            return backoff if method in IDEMPOTENT_METHODS else None
+        rate_limit_reset = _rate_limit_reset(resp)
+        if resp.status_code in RETRY_ANY_METHOD_STATUSES or _is_rate_limited(resp):
+            delay = _retry_after(resp)
+            delay = rate_limit_reset if delay is None else delay
+        elif resp.status_code in RETRY_IDEMPOTENT_STATUSES and method in IDEMPOTENT_METHODS:
+            delay = _retry_after(resp)
+        else:
+            return None
+        delay = backoff if delay is None else delay
+        return delay if delay <= self.max_retry_wait else None
+
+    def request(self, method: str, url: str, *args, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        method = method.upper()
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            self._wait_for_host(host)
+            resp, error = None, None
+            with self._host_slot(host):
+                try:
+                    resp = super().request(method, url, *args, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+            if resp is not None and (reset := _rate_limit_reset(resp)) is not None:
+                # Following requests to the host wait for the rate limit reset
+                self._block_host(host, reset)
+            delay = self.retry_delay(method, resp, attempt)
+            if delay is None:
+                if error:
+                    raise error
+                return resp
+            logging.warning(
+                f"{method} {urlsplit(url).path} failed "
+                f"({resp.status_code if resp is not None else type(error).__name__}), "
+                f"retrying in {delay:.1f}s"
+            )
+            if resp is not None:
+                resp.close()
+            if resp is not None and (
+                resp.status_code in RETRY_ANY_METHOD_STATUSES or _is_rate_limited(resp)
+            ):
+                # Rate limited: concurrent requests to the host wait too
+                self._block_host(host, delay)
+            else:
+                time.sleep(delay)
+            with self._lock:
+                self.retries += 1
+            attempt += 1
+
+
+_session: HttpSession | None = None
+_session_lock = threading.Lock()
+
+
+def http_session() -> HttpSession:
+    """HTTP session shared by all integrations of the process."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = HttpSession()
+        return _session
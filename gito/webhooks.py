@@ -0,0 +1,346 @@
+"""
+Reviewing pull requests on GitHub `pull_request` / GitLab `merge_request` webhook events.
+Events are persisted in the job queue and processed by a pool of workers;
+a newer head SHA of the same pull request cancels the review of the previous one.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+from contextlib import ExitStack
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from git import Repo
+from microcore import ui
+
+from .cli_base import get_repo_context
+from .constants import GITHUB_MD_REPORT_FILE_NAME, JSON_REPORT_FILE_NAME
+from .core import review
+from .gh_api import resolve_gh_token
+from .gitlab_api import resolve_gl_token
+from .job_queue import JobQueue, JobStatus, QueuedJob
+from .llm_scheduler import LLMScheduler, tenant
+from .report_struct import Report, ReviewTarget
+from .utils.git_mirror import http_auth_env
+from .utils.git_platform.platform_types import PlatformType
+
+GITHUB_ACTIONS = ("opened", "synchronize", "reopened", "ready_for_review")
+GITLAB_ACTIONS = ("open", "reopen", "update")
+# Workers poll the queue when not notified (e.g. jobs queued by another process)
+POLL_INTERVAL = 5
+
+
+@dataclass
+class PullRequestEvent:
+    platform: PlatformType
+    repo: str
+    """owner/repo on GitHub, project path on GitLab."""
+    number: int
+    """Pull request number or merge request IID."""
+    head_sha: str
+    head_ref: str
+    base_ref: str
+    clone_url: str
+    web_url: str
+    """Web URL of the repository."""
+    project_id: str | None = None
+    """GitLab project ID."""
+    base_url: str | None = None
+    """GitLab instance URL."""
+
+    @property
+    def key(self) -> str:
+        return f"{self.platform}:{self.repo}#{self.number}"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PullRequestEvent":
+        return cls(**(data | {"platform": PlatformType(data["platform"])}))
+
+
+def verify_github_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """Check the X-Hub-Signature-256 header of the GitHub webhook delivery."""
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature or "")
+
+
+def verify_gitlab_token(secret: str, token: str | None) -> bool:
+    """Check the X-Gitlab-Token header of the GitLab webhook delivery."""
+    return hmac.compare_digest(secret, token or "")
+
+
+def parse_github_event(headers: dict[str, str], payload: dict) -> PullRequestEvent | None:
+    """Pull request to review from the GitHub webhook payload, None for irrelevant events."""
+    if headers.get("x-github-event") != "pull_request":
+        return None
+    if payload.get("action") not in GITHUB_ACTIONS:
+        return None
+    pr = payload["pull_request"]
+    if pr.get("draft") or pr.get("state", "open") != "open":
+        return None
+    repository = payload["repository"]
+    return PullRequestEvent(
+        platform=PlatformType.GITHUB,
+        repo=repository["full_name"],
+        number=int(payload.get("number") or pr["number"]),
+        head_sha=pr["head"]["sha"],
+        head_ref=pr["head"]["ref"],
+        base_ref=pr["base"]["ref"],
+        clone_url=repository["clone_url"],
+        web_url=repository["html_url"],
+    )
+
+
+def parse_gitlab_event(headers: dict[str, str], payload: dict) -> PullRequestEvent | None:
+    """Merge request to review from the GitLab webhook payload, None for irrelevant events."""
+    if payload.get("object_kind") != "merge_request":
+        return None
+    attrs = payload["object_attributes"]
+    action = attrs.get("action")
+    if action not in GITLAB_ACTIONS or attrs.get("state", "opened") != "opened":
+        return None
+    # Updates without "oldrev" change the title, labels, etc., not the code
+    if action == "update" and not attrs.get("oldrev"):
+        return None
+    if attrs.get("draft") or attrs.get("work_in_progress"):
+        return None
+    project = payload["project"]
+    web_url = project["web_url"]
+    return PullRequestEvent(
+        platform=PlatformType.GITLAB,
+        repo=project["path_with_namespace"],
+        number=int(attrs["iid"]),
+        head_sha=attrs["last_commit"]["id"],
+        head_ref=attrs["source_branch"],
+        base_ref=attrs["target_branch"],
+        clone_url=project["git_http_url"],
+        web_url=web_url,
+        project_id=str(project["id"]),
+        base_url=web_url.removesuffix("/" + project["path_with_namespace"]),
+    )
+
+
+def platform_host(platform: PlatformType) -> str:
+    """Host of the configured GitHub / GitLab instance, the access token is issued for it."""
+    if platform == PlatformType.GITHUB:
+        return urlsplit(os.getenv("GITHUB_SERVER_URL") or "https://github.com").hostname
+    return (
+        os.getenv("CI_SERVER_HOST")
+        or urlsplit(os.getenv("GITLAB_BASE_URL") or "https://gitlab.com").hostname
+    )
+
+
+def clone_env(event: PullRequestEvent) -> dict[str, str]:
+    """
+    Environment of the Git commands passing the access token of the platform (if available).
+    The token is sent only to the configured platform host, not to the hosts of other clone URLs.
+    """
+    parts = urlsplit(event.clone_url)
+    if parts.scheme != "https" or parts.hostname != platform_host(event.platform):
+        return {}
+    if event.platform == PlatformType.GITHUB:
+        token, user = resolve_gh_token(), "x-access-token"
+    else:
+        token, user = resolve_gl_token(None), "oauth2"
+    return http_auth_env(event.clone_url, user, token) if token else {}
+
+
+def checkout_head(repo: Repo, event: PullRequestEvent):
+    """
+    Check out the head commit of the pull request,
+    fetching it first if it is not in the clone (e.g. pull requests from forks).
+    """
+    try:
+        repo.commit(event.head_sha)
+    except ValueError:
+        ref = (
+            f"refs/pull/{event.number}/head"
+            if event.platform == PlatformType.GITHUB
+            else f"refs/merge-requests/{event.number}/head"
+        )
+        repo.remotes.origin.fetch(ref)
+    repo.git.checkout(event.head_sha)
+
+
+def post_review_comment(event: PullRequestEvent, out_folder: Path):
+    """Leave a comment with the review on the pull request."""
+    if event.platform == PlatformType.GITHUB:
+        from .commands.gh_post_review_comment import post_github_cr_comment
+
+        post_github_cr_comment(
+            md_report_file=str(out_folder / GITHUB_MD_REPORT_FILE_NAME),
+            pr=event.number,
+            gh_repo=event.repo,
+            token="",
+        )
+    else:
+        from .commands.gitlab_post_review_comment import post_gitlab_cr_comment
+
+        post_gitlab_cr_comment(
+            md_report_file=str(out_folder / GITHUB_MD_REPORT_FILE_NAME),
+            json_report_file=str(out_folder / JSON_REPORT_FILE_NAME),
+            project_id=event.project_id,
+            merge_request_iid=event.number,
+            token="",
+            base_url=event.base_url,
+            inline=False,
+        )
+
+
+async def _complete_in_thread(func, *args):
+    """
+    Run the blocking call in a thread; when cancelled, wait for the thread
+    so that its result (e.g. entered context) is cleaned up by the caller.
+    """
+    task = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        await asyncio.wait([task])
+        raise
+
+
+async def review_pull_request(
+    event: PullRequestEvent,
+    post_comment: bool = True,
+    scheduler: LLMScheduler | None = None,
+) -> Report | None:
+    """
+    Clone the repository, review the pull request and post the review comment.
+    Args:
+        scheduler (LLMScheduler | None): Scheduler shared with other reviews (see gito.server).
+    """
+    with ExitStack() as stack:
+        repo, folder = await _complete_in_thread(
+            stack.enter_context,
+            get_repo_context(event.clone_url, None, git_env=clone_env(event)),
+        )
+        await _complete_in_thread(checkout_head, repo, event)
+        target = ReviewTarget(
+            git_platform_type=event.platform,
+            repo_url=event.web_url,
+            pull_request_id=str(event.number),
+            what=event.head_sha,
+            against=f"origin/{event.base_ref}",
+            commit_sha=event.head_sha,
+            filters="",
+            use_merge_base=True,
+            active_branch=event.head_ref,
+        )
+        with tenant(event.web_url):
+            report = await review(repo=repo, target=target, out_folder=folder, scheduler=scheduler)
+        if report and post_comment:
+            await asyncio.to_thread(post_review_comment, event, Path(folder))
+        return report
+
+
+class WebhookReceiver:
+    """Queues the reviews requested by webhook events and runs them."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        workers: int = 2,
+        secret: str | None = None,
+        post_comments: bool = True,
+        scheduler: LLMScheduler | None = None,
+    ):
+        """
+        Args:
+            queue (JobQueue): Persistent job queue.
+            workers (int): Number of pull requests reviewed concurrently.
+            secret (str | None): Webhook secret verifying the deliveries,
+                defaults to the GITO_WEBHOOK_SECRET env var.
+            post_comments (bool): Post the reviews to the pull requests.
+            scheduler (LLMScheduler | None): Scheduler shared by the reviews,
+                set by the ReviewServer to the one of its other jobs.
+        Raises:
+            ValueError: If the webhook secret is not configured.
+        """
+        self.queue = queue
+        self.workers = workers
+        self.secret = secret or os.getenv("GITO_WEBHOOK_SECRET")
+        if not self.secret:
+            # Unverified deliveries would let anyone run reviews of arbitrary repositories
+            raise ValueError("Webhook secret is required (GITO_WEBHOOK_SECRET)")
+        self.post_comments = post_comments
+        self.scheduler = scheduler
+        # Pull request key -> (job ID, task) of the running reviews
+        self.running: dict[str, tuple[int, asyncio.Task]] = {}
+        self.job_queued = asyncio.Event()
+
+    def receive(
+        self, platform: PlatformType, headers: dict[str, str], body: bytes
+    ) -> tuple[int, dict]:
+        """Queue the review requested by the webhook delivery, returns the HTTP status and body."""
+        verified = (
+            verify_github_signature(self.secret, body, headers.get("x-hub-signature-256"))
+            if platform == PlatformType.GITHUB
+            else verify_gitlab_token(self.secret, headers.get("x-gitlab-token"))
+        )
+        if not verified:
+            return 401, {"error": "Invalid webhook signature"}
+        payload = json.loads(body or b"{}")
+        if not isinstance(payload, dict):
+            raise ValueError("Webhook payload must be a JSON object")
+        parse = parse_github_event if platform == PlatformType.GITHUB else parse_gitlab_event
+        try:
+            event = parse(headers, payload)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Malformed {platform} webhook payload: missing {e}")
+        if not event:
+            return 200, {"status": "ignored"}
+        job_id, superseded = self.queue.enqueue(event.key, event.head_sha, asdict(event))
+        if job_id is None:
+            return 200, {"status": "duplicate"}
+        for superseded_id in superseded:
+            running_id, task = self.running.get(event.key, (None, None))
+            if running_id == superseded_id:
+                logging.info(f"Cancelling the outdated review of {event.key}")
+                task.cancel()
+        self.job_queued.set()
+        logging.info(f"Queued review of {ui.green(event.key)} at {event.head_sha[:8]}")
+        return 202, {"status": "queued", "job_id": job_id, "superseded": superseded}
+
+    async def run_job(self, job: QueuedJob):
+        event = PullRequestEvent.from_dict(job.payload)
+        task = asyncio.create_task(
+            review_pull_request(event, self.post_comments, self.scheduler)
+        )
+        self.running[job.key] = (job.id, task)
+        try:
+            await asyncio.wait([task])
+        finally:
+            if self.running.get(job.key, (None,))[0] == job.id:
+                del self.running[job.key]
+            if not task.done():
+                # The worker itself is cancelled
+                task.cancel()
+        if task.cancelled():
+            logging.info(f"Review of {job.key} at {job.head_sha[:8]} was superseded")
+        elif e := task.exception():
+            logging.error(f"Review of {job.key} at {job.head_sha[:8]} failed: {e!r}", exc_info=e)
+            self.queue.complete(job.id, JobStatus.FAILED, f"[{type(e).__name__}] {e}")
+        else:
+            self.queue.complete(job.id, JobStatus.DONE)
+
+    async def worker(self):
+        while True:
+            if job := self.queue.claim():
+                await self.run_job(job)
+                continue
+            self.job_queued.clear()
+            try:
+                await asyncio.wait_for(self.job_queued.wait(), POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self):
+        """Process the queued jobs until cancelled."""
+        if recovered := self.queue.recover():
+            logging.info(f"Resuming {recovered} interrupted review job(s)")
+        await asyncio.gather(*[self.worker() for _ in range(self.workers)])
@@ -1,5 +1,88 @@
+import copy
 import os
+from pathlib import Path
+from unittest.mock import AsyncMock
 
+import git
 import microcore as mc
+import pytest
 
 os.environ["LLM_API_TYPE"] = str(mc.ApiType.NONE)
+
+FAKE_ISSUE = {
+    "title": "Issue",
+    "severity": 1,
+    "confidence": 1,
+    "affected_lines": [{"start_line": 1, "end_line": 1}],
+}
+
+
+@pytest.fixture(autouse=True, scope="session")
+def mirrors_path(tmp_path_factory):
+    """Keep remote repositories cached by tests out of ~/.gito/mirrors."""
+    os.environ["GITO_MIRRORS_PATH"] = str(tmp_path_factory.mktemp("mirrors"))
+
+
+@pytest.fixture(autouse=True)
+def review_cache_path(tmp_path_factory, monkeypatch):
+    """Keep review results cached by tests out of ~/.gito/cache."""
+    monkeypatch.setenv("GITO_CACHE_PATH", str(tmp_path_factory.mktemp("review-cache")))
+
+
+def commit_files(repo: git.Repo, files: dict[str, str], message: str) -> git.Commit:
+    for path, content in files.items():
+        file = Path(repo.working_tree_dir) / path
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(content, encoding="utf-8")
+    repo.index.add(list(files))
+    return repo.index.commit(message)
+
+
+@pytest.fixture
+def make_repo(tmp_path):
+    """
+    Factory of test repositories: "main" branch, committer configured and the initial commit
+    of the project config disabling the review cache (not shared between tests).
+    Returns a function creating the repository in the folder (default: <tmp_path>/repo).
+    """
+    repos = []
+
+    def make(path: str | Path | None = None) -> git.Repo:
+        repo = git.Repo.init(path or tmp_path / "repo", initial_branch="main")
+        repos.append(repo)
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "Gito tests")
+            config.set_value("user", "email", "gito-tests@example.invalid")
+        commit_files(repo, {".gito/config.toml": "review_cache = false\n"}, "initial")
+        return repo
+
+    yield make
+    for repo in repos:
+        repo.close()
+
+
+@pytest.fixture(name="commit_files")
+def commit_files_fixture():
+    """Function writing the files (path -> content) to the repository and committing them."""
+    return commit_files
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """
+    Replace the LLM requests of the reviews.
+    Returns a function installing the replacement of mc.llm_parallel, by default reporting
+    an issue at the first line of each reviewed file (`issue` overrides its fields),
+    and returning its mock.
+    """
+
+    def install(llm_parallel=None, issue: dict | None = None) -> AsyncMock:
+        async def report_issue(prompts, **kwargs):
+            return [[copy.deepcopy(FAKE_ISSUE | (issue or {}))] for _ in prompts]
+
+        mock = AsyncMock(side_effect=llm_parallel or report_issue)
+        monkeypatch.setattr("gito.core.mc.llm_parallel", mock)
+        monkeypatch.setattr("gito.core.make_cr_summary", AsyncMock(return_value=""))
+        return mock
+
+    return install
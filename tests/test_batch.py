@@ -0,0 +1,160 @@
+import json
+import textwrap
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from git import Repo
+from typer.testing import CliRunner
+
+from gito.batch import BATCH_SUMMARY_FILE_NAME, load_manifest
+from gito.bootstrap import bootstrap
+from gito.cli import app
+from gito.utils.git_blobs import close_blob_reader
+
+
+@pytest.fixture
+def make_remote(make_repo, commit_files):
+    def make(path: Path, branches: dict[str, dict[str, str]]) -> Path:
+        """Repository with the main branch and the branches committing the files."""
+        repo = make_repo(path)
+        for branch, files in branches.items():
+            repo.create_head(branch).checkout()
+            commit_files(repo, files, f"{branch}: {', '.join(files)}")
+            repo.heads.main.checkout()
+        return path
+
+    return make
+
+
+@pytest.fixture
+def remotes(tmp_path, make_remote):
+    return [
+        make_remote(
+            tmp_path / "one", {"feature": {"a.py": "x = 1\n"}, "feature2": {"b.py": "x = 1\n"}}
+        ),
+        make_remote(tmp_path / "two", {"feature": {"c.py": "x = 1\n"}}),
+    ]
+
+
+def test_load_manifest(tmp_path):
+    manifest = tmp_path / "batch.toml"
+    manifest.write_text(
+        textwrap.dedent(
+            """
+            [[targets]]
+            url = "https://github.com/owner/repo.git"
+            refs = "feature..main"
+            pr = 12
+
+            [[targets]]
+            path = "."
+            what = "HEAD"
+            name = "local"
+            """
+        )
+    )
+    targets = load_manifest(manifest)
+    assert targets[0].default_name() == "owner-repo-pr12"
+    assert (targets[1].what, targets[1].name) == ("HEAD", "local")
+
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(json.dumps([{"url": "x", "branch": "y"}]))
+    with pytest.raises(ValueError, match="Unknown fields"):
+        load_manifest(manifest)
+
+
+def test_review_batch(remotes, tmp_path, fake_llm):
+    bootstrap()
+    one, two = remotes
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "targets": [
+                    {"url": str(one), "refs": "feature..main", "pr": 1, "name": "one-1"},
+                    {"url": str(one), "refs": "feature2..main", "name": "one-2"},
+                    {"url": str(two), "refs": "feature..main", "name": "two"},
+                    {"path": str(two), "refs": "main..main", "name": "unchanged"},
+                    {"path": str(tmp_path / "missing"), "refs": "a..b", "name": "missing"},
+                ]
+            }
+        )
+    )
+
+    out = tmp_path / "out"
+    fake_llm()
+    result = CliRunner().invoke(app, ["review-batch", str(manifest), "--out", str(out)])
+    assert result.exit_code == 1, result.output
+    summary = json.loads((out / BATCH_SUMMARY_FILE_NAME).read_text())
+    statuses = {t["name"]: t["status"] for t in summary["targets"]}
+    assert statuses == {
+        "one-1": "reviewed",
+        "one-2": "reviewed",
+        "two": "reviewed",
+        "unchanged": "no_changes",
+        "missing": "failed",
+    }
+    assert summary["totals"]["issues"] == 3
+    for name, file in [("one-1", "a.py"), ("one-2", "b.py"), ("two", "c.py")]:
+        report = json.loads((out / name / "code-review-report.json").read_text())
+        assert list(report["issues"]) == [file]
+    assert json.loads((out / "one-1" / "code-review-report.json").read_text())["target"][
+        "pull_request_id"
+    ] == "1"
+
+
+def test_review_batch_targets_of_the_same_repo(tmp_path, make_remote, fake_llm):
+    bootstrap()
+    path = make_remote(
+        tmp_path / "repo", {"feature": {"a.py": "x = 1\n"}, "feature2": {"a.py": "x = 2\n"}}
+    )
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(
+        json.dumps(
+            [
+                {"url": str(path), "refs": "feature..main", "name": "first"},
+                {"url": str(path), "refs": "feature2..main", "name": "second"},
+            ]
+        )
+    )
+
+    out = tmp_path / "out"
+    mock_llm = fake_llm()
+    with patch("gito.batch.close_blob_reader", wraps=close_blob_reader) as close_reader:
+        result = CliRunner().invoke(app, ["review-batch", str(manifest), "--out", str(out)])
+    assert result.exit_code == 0, result.output
+    assert close_reader.call_count == 2
+    prompts = [str(p) for call in mock_llm.await_args_list for p in call.args[0]]
+    assert ["x = 1" in p and "x = 2" not in p for p in prompts] == [True, False]
+    assert ["x = 2" in p and "x = 1" not in p for p in prompts] == [False, True]
+    for name, code in [("first", "1: x = 1"), ("second", "1: x = 2")]:
+        report = json.loads((out / name / "code-review-report.json").read_text())
+        assert report["issues"]["a.py"][0]["affected_lines"][0]["affected_code"] == code
+
+
+def test_review_batch_fetches_pull_request_head(tmp_path, make_remote, fake_llm):
+    bootstrap()
+    path = make_remote(tmp_path / "repo", {"feature": {"a.py": "x = 1\n"}})
+    remote = Repo(path)
+    # Pull requests from forks are reachable only by the pull request refs
+    head_sha = remote.heads.feature.commit.hexsha
+    remote.git.update_ref("refs/pull/5/head", head_sha)
+    remote.delete_head("feature", force=True)
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(json.dumps([{"url": str(path), "pr": 5, "name": "pr"}]))
+
+    out = tmp_path / "out"
+    fake_llm()
+    result = CliRunner().invoke(app, ["review-batch", str(manifest), "--out", str(out)])
+    assert result.exit_code == 0, result.output
+    report = json.loads((out / "pr" / "code-review-report.json").read_text())
+    assert list(report["issues"]) == ["a.py"]
+    assert (report["target"]["what"], report["target"]["pull_request_id"]) == (head_sha, "5")
+
+
+def test_manifest_rejects_pull_request_of_local_repo(tmp_path):
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(json.dumps([{"path": ".", "pr": 5}]))
+    with pytest.raises(ValueError, match="pull requests are fetched for url targets only"):
+        load_manifest(manifest)
@@ -0,0 +1,95 @@
+"""
+CLI startup time regression benchmark based on `python -X importtime`.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Modules that must not be imported until the command using them is invoked
+DEFERRED_MODULES = [
+    "ghapi",
+    "jira",
+    "yaml",
+    "gito.commands.deploy",
+    "gito.commands.linear_comment",
+    "gito.commands.fix",
+    "gito.commands.gh_post_review_comment",
+    "gito.commands.gh_react_to_comment",
+    "gito.commands.gitlab_post_review_comment",
+    "gito.commands.repl",
+    "gito.commands.review_batch",
+    "gito.commands.serve",
+    "gito.core",
+    "gito.patch_review",
+    "gito.project_config",
+    "gito.remote_review",
+    "gito.report_struct",
+    "microcore",
+]
+
+
+def import_times(code: str | None = None, args: list[str] = ()) -> dict[str, int]:
+    """
+    Cumulative import time (microseconds) of each module imported by the code
+    or by running python with the arguments (e.g. ["-m", "gito", "version"]).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *(["-c", code] if code else args)],
+        capture_output=True,
+        text=True,
+        env=os.environ | {"LLM_API_TYPE": "none"},
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_startup_defers_command_modules():
+    times = import_times("import gito.cli")
+    print(f"\ngito.cli import time: {times['gito.cli'] / 1000:.0f} ms")
+    assert [m for m in DEFERRED_MODULES if m in times] == []
+
+
+def test_cli_startup_defers_llm_client_and_review_logic():
+    code = (
+        "import sys; import gito.cli; "
+        "loaded = [m for m in ('microcore', 'gito.core') if m in sys.modules]; "
+        "assert not loaded, loaded"
+    )
+    # Assertions are checked in the subprocess
+    import_times(code)
+
+
+def test_command_module_imported_on_dispatch():
+    code = (
+        "import sys; from typer.testing import CliRunner; import gito.cli; "
+        "from gito.cli_base import app; "
+        "result = CliRunner().invoke(app, ['version']); "
+        "assert result.exit_code == 0, result.output; "
+        "assert 'gito.commands.version' in sys.modules; "
+        "assert 'gito.commands.deploy' not in sys.modules"
+    )
+    # Assertions are checked in the subprocess
+    import_times(code)
+
+
+@pytest.mark.parametrize(
+    "command",
+    [["version"], ["render", "--help"], ["review", "--help"]],
+)
+def test_cli_dispatch_skips_microcore(command):
+    started = time.perf_counter()
+    times = import_times(args=["-m", "gito", *command])
+    elapsed = time.perf_counter() - started
+    print(f"\ngito {' '.join(command)}: {elapsed * 1000:.0f} ms (including -X importtime overhead)")
+    assert "microcore" not in times
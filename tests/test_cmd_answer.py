@@ -35,11 +35,11 @@ def test_cmd_answer_none_with_linear(monkeypatch):
     """cmd_answer must not crash when answer() returns None
     (no changes in context) and --post-to linear is requested."""
     monkeypatch.setattr(
-        "gito.cli.answer", lambda *args, **kwargs: None
+        "gito.core.answer", lambda *args, **kwargs: None
     )
     posted = {}
     monkeypatch.setattr(
-        "gito.cli.linear_comment",
+        "gito.commands.linear_comment.linear_comment",
         lambda text: posted.setdefault("text", text),
     )
     out = cmd_answer(
@@ -64,7 +64,7 @@ def test_cmd_answer_none_with_save_to(monkeypatch, tmp_path):
     """cmd_answer must not crash when answer() returns None
     and --save-to is provided."""
     monkeypatch.setattr(
-        "gito.cli.answer", lambda *args, **kwargs: None
+        "gito.core.answer", lambda *args, **kwargs: None
     )
     save_file = tmp_path / "answer.md"
     out = cmd_answer(
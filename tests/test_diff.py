@@ -3,7 +3,18 @@ from pathlib import Path
 import git
 import pytest
 
-from gito.core import MergeBaseError, get_diff
+from gito import core
+from gito.constants import BINARY_FILE_SNIFF_SIZE
+from gito.core import (
+    AllChangesExcludedError,
+    MergeBaseError,
+    NoChangesInContextError,
+    filters_to_pathspecs,
+    get_diff,
+    get_target_diff,
+    is_binary_working_tree_file,
+)
+from gito.project_config import ProjectConfig
 
 
 def commit_file(repo, path, content, message):
@@ -70,3 +81,91 @@ def test_merge_base_failure_does_not_fall_back_to_direct_diff(diverged_repo):
 
     with pytest.raises(MergeBaseError, match="Cannot determine a merge base"):
         get_diff(diverged_repo, what="feature", against="unrelated")
+
+
+def test_binary_files_are_skipped_without_reading_content(diverged_repo, monkeypatch):
+    diverged_repo.git.checkout("feature")
+    root = Path(diverged_repo.working_tree_dir)
+    (root / "data.bin").write_bytes(b"\0\1\2" * 1000)
+    # Large text files are reviewed (in chunks if needed)
+    (root / "large.txt").write_text("a\n" * BINARY_FILE_SNIFF_SIZE * 100)
+    diverged_repo.index.add(["data.bin", "large.txt"])
+    diverged_repo.index.commit("Add binary data")
+    monkeypatch.setattr(core, "is_binary_content", lambda prefix: pytest.fail("Content read"))
+
+    diff = get_diff(diverged_repo, what="feature", against="main")
+
+    assert sorted(patched_file.path for patched_file in diff) == [
+        "feature_only.txt",
+        "large.txt",
+    ]
+
+
+def test_working_copy_files_are_sniffed(diverged_repo, monkeypatch):
+    root = Path(diverged_repo.working_tree_dir)
+    (root / "shared.txt").write_bytes("café".encode("latin-1"))
+    (root / "base_only.txt").write_bytes(b"a" * BINARY_FILE_SNIFF_SIZE + "é".encode("latin-1"))
+    (root / "data.bin").write_bytes(b"\0" * 10)
+    diverged_repo.index.add(["data.bin"])
+    sniffed = []
+    original = core.is_binary_content
+    monkeypatch.setattr(
+        core, "is_binary_content", lambda prefix: sniffed.append(len(prefix)) or original(prefix)
+    )
+
+    diff = get_diff(diverged_repo, against="HEAD", use_merge_base=False)
+
+    # Invalid UTF-8 is looked for within the sniffed prefix only
+    assert [patched_file.path for patched_file in diff] == ["base_only.txt"]
+    assert sorted(sniffed) == [4, BINARY_FILE_SNIFF_SIZE]
+
+
+def test_working_tree_binary_sniff_is_bounded(diverged_repo):
+    root = Path(diverged_repo.working_tree_dir)
+    (root / "late_nul.txt").write_bytes(b"a" * BINARY_FILE_SNIFF_SIZE + b"\0")
+    (root / "early_nul.txt").write_bytes(b"a\0b")
+    (root / "latin1.txt").write_bytes("café au lait".encode("latin-1"))
+
+    assert not is_binary_working_tree_file(diverged_repo, "late_nul.txt")
+    assert is_binary_working_tree_file(diverged_repo, "early_nul.txt")
+    assert is_binary_working_tree_file(diverged_repo, "latin1.txt")
+    assert is_binary_working_tree_file(diverged_repo, "missing.txt")
+
+
+def test_filters_to_pathspecs(monkeypatch):
+    monkeypatch.setattr(core.os.path, "normcase", lambda p: p)
+    assert filters_to_pathspecs("*.py, src/*") == ["*.py", "src/*"]
+    assert filters_to_pathspecs(["*.py", "a\\b"]) == []
+    assert filters_to_pathspecs(["vendor/*", "poetry.lock", "[^a]*"], exclude=True) == [
+        ":(exclude)vendor/*"
+    ]
+    assert filters_to_pathspecs("") == []
+
+
+def test_excluded_files_are_not_diffed(diverged_repo, monkeypatch):
+    diverged_repo.git.checkout("feature")
+    (Path(diverged_repo.working_tree_dir) / "vendor").mkdir()
+    commit_file(diverged_repo, "vendor/lib.js", "lib\n", "Add vendored lib")
+    diffed = []
+    original = core.get_diff
+    monkeypatch.setattr(
+        core, "get_diff", lambda **kwargs: diffed.extend(result := original(**kwargs)) or result
+    )
+    config = ProjectConfig(exclude_files=["vendor/*"])
+
+    diff = get_target_diff(diverged_repo, config, what="feature", against="main")
+
+    assert [patched_file.path for patched_file in diff] == ["feature_only.txt"]
+    assert "vendor/lib.js" not in [patched_file.path for patched_file in diffed]
+
+
+def test_all_changes_excluded(diverged_repo):
+    config = ProjectConfig(exclude_files=["*.txt"])
+
+    with pytest.raises(AllChangesExcludedError):
+        get_target_diff(diverged_repo, config, what="feature", against="main")
+    with pytest.raises(AllChangesExcludedError):
+        get_target_diff(diverged_repo, config, what="feature", against="main", filters="feat*")
+    with pytest.raises(NoChangesInContextError) as e:
+        get_target_diff(diverged_repo, config, what="feature", against="main", filters="*.py")
+    assert not isinstance(e.value, AllChangesExcludedError)
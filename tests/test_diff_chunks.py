@@ -0,0 +1,161 @@
+import asyncio
+import difflib
+import json
+from pathlib import Path
+
+from unidiff import PatchSet
+
+from gito.bootstrap import bootstrap
+from gito.core import review
+from gito.diff_chunks import (
+    merge_issue_lists,
+    num_tokens,
+    numbered_lines_window,
+    pack_review_inputs,
+    split_file_diff,
+    split_hunk,
+    split_packed_issues,
+)
+from gito.report_struct import ReviewTarget
+
+
+def build_diff(old: list[str], new: list[str], context: int = 1):
+    text = "".join(
+        line
+        for line in difflib.unified_diff(
+            [f"{line}\n" for line in old],
+            [f"{line}\n" for line in new],
+            "a/f.py",
+            "b/f.py",
+            n=context,
+        )
+    )
+    return PatchSet(text)[0]
+
+
+OLD = [f"line {i}" for i in range(1, 201)]
+NEW = [f"line {i} changed" if i % 20 == 0 else f"line {i}" for i in range(1, 201)]
+
+
+def test_split_file_diff_groups_hunks():
+    file_diff = build_diff(OLD, NEW)
+    assert len(file_diff) == 10
+    max_tokens = num_tokens(file_diff) // 3
+    chunks = split_file_diff(file_diff, max_tokens)
+    assert len(chunks) > 1
+    assert all(num_tokens(c) <= max_tokens for c in chunks)
+    assert [h for c in chunks for h in c] == list(file_diff)
+    assert all(c.path == "f.py" for c in chunks)
+
+
+def test_split_hunk_keeps_headers_consistent():
+    new = [f"line {i} changed" for i in range(1, 101)] + OLD[100:]
+    hunk = build_diff(OLD, new)[0]
+    parts = split_hunk(hunk, num_tokens(hunk) // 4)
+    assert len(parts) > 3
+    assert sum(len(p) for p in parts) == len(hunk)
+    # Each part is a valid hunk that can be parsed back
+    for part in parts:
+        reparsed = PatchSet(f"--- a/f.py\n+++ b/f.py\n{part}")[0][0]
+        assert (reparsed.source_start, reparsed.target_start) == (
+            part.source_start,
+            part.target_start,
+        )
+    assert parts[1].target_start == parts[0].target_start + parts[0].target_length
+
+
+def test_numbered_lines_window():
+    file_diff = build_diff(OLD, NEW)
+    text = numbered_lines_window(NEW, split_file_diff(file_diff, 10**6)[0], 2, 10**6)
+    assert text.startswith("...\n17: line 17\n")
+    assert "20: line 20 changed\n" in text
+    assert "30: line 30\n" not in text
+    limited = numbered_lines_window(NEW, file_diff, 2, 20)
+    assert "DUE TO LARGE FILE SIZE" in limited
+
+
+def test_merge_issue_lists_drops_duplicates():
+    a = {"title": "Bug", "affected_lines": [{"start_line": 1, "end_line": 2}]}
+    b = {"title": "bug ", "affected_lines": [{"start_line": 1, "end_line": 2}]}
+    c = {"title": "Bug", "affected_lines": [{"start_line": 5, "end_line": 5}]}
+    assert merge_issue_lists([[a], [b, c]]) == [a, c]
+
+
+def test_review_oversized_file_in_chunks(tmp_path, make_repo, commit_files, fake_llm):
+    bootstrap()
+    repo = make_repo()
+    commit_files(repo, {"f.py": "\n".join(OLD) + "\n"}, "add f.py")
+    commit_files(repo, {"f.py": "\n".join(NEW) + "\n"}, "change")
+    config_file = Path(repo.working_tree_dir) / ".gito" / "config.toml"
+    config_file.write_text("review_cache = false\nmax_code_tokens = 300\n")
+
+    mock_llm = fake_llm(
+        issue={"title": "Bug", "affected_lines": [{"start_line": 20, "end_line": 20}]}
+    )
+    target = ReviewTarget(what="HEAD", against="HEAD~1", use_merge_base=False, filters="")
+    asyncio.run(review(target=target, repo=repo, out_folder=tmp_path / "out"))
+
+    prompts = [p for call in mock_llm.await_args_list for p in call.args[0]]
+    assert len(prompts) > 1
+    assert sum("line 200 changed" in str(p) for p in prompts) == 1
+    report = json.loads((tmp_path / "out" / "code-review-report.json").read_text())
+    assert report["total_issues"] == 1
+
+
+def test_pack_review_inputs():
+    inputs = [
+        [("a" * 40, None)],
+        [("b " * 500, None)],  # too large to be packed
+        [("c" * 40, "c")],
+        [("d", None), ("d", None)],  # reviewed in chunks
+        [("e" * 40, None)],
+    ]
+    sizes = [num_tokens(i[0][0]) + num_tokens(i[0][1] or "") for i in inputs]
+    budget = sizes[0] + sizes[2] + 1
+    assert pack_review_inputs(inputs, budget) == [[0, 2]]
+    assert pack_review_inputs(inputs, budget + sizes[4]) == [[0, 2, 4]]
+    assert pack_review_inputs(inputs, 0) == []
+
+
+def test_split_packed_issues():
+    issues = [
+        {"file": "a.py", "title": "A"},
+        {"file": "b/b.py", "title": "B"},
+        {"file": "other.py", "title": "Unknown"},
+    ]
+    assert split_packed_issues(issues, ["a.py", "b.py", "c.py"]) == [
+        [{"title": "A"}],
+        [{"title": "B"}],
+        [],
+    ]
+
+
+def test_review_packs_small_files(tmp_path, make_repo, commit_files, fake_llm):
+    bootstrap()
+    repo = make_repo()
+    names = ["a.cfg", "b.cfg", "c.cfg"]
+    commit_files(repo, {name: "version = 1\n" for name in names}, "add files")
+    commit_files(repo, {name: "version = 2\n" for name in names}, "bump")
+    config_file = Path(repo.working_tree_dir) / ".gito" / "config.toml"
+    config_file.write_text("review_cache = false\npack_files_max_tokens = 4000\n")
+
+    async def respond(prompts, **kwargs):
+        return [
+            [
+                {"file": name, "title": f"Issue in {name}", "severity": 1, "confidence": 1}
+                for name in ("a.cfg", "c.cfg")
+            ]
+            for _ in prompts
+        ]
+
+    mock_llm = fake_llm(respond)
+    target = ReviewTarget(what="HEAD", against="HEAD~1", use_merge_base=False, filters="")
+    asyncio.run(review(target=target, repo=repo, out_folder=tmp_path / "out"))
+
+    prompts = [p for call in mock_llm.await_args_list for p in call.args[0]]
+    assert len(prompts) == 1
+    assert all(name in str(prompts[0]) for name in names)
+    report = json.loads((tmp_path / "out" / "code-review-report.json").read_text())
+    assert list(report["issues"]) == ["a.cfg", "c.cfg"]
+    assert report["issues"]["c.cfg"][0]["title"] == "Issue in c.cfg"
+    assert report["issues"]["c.cfg"][0]["file"] == "c.cfg"
@@ -0,0 +1,117 @@
+from pathlib import Path
+
+import git
+import pytest
+
+from gito.utils.git_blobs import GitBlobReader, get_blob_reader, close_blob_reader
+
+
+def commit_file(repo, path, content, message):
+    (Path(repo.working_tree_dir) / path).write_text(content, encoding="utf-8")
+    repo.index.add([path])
+    return repo.index.commit(message)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = git.Repo.init(tmp_path)
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Gito tests")
+        config.set_value("user", "email", "gito-tests@example.invalid")
+    commit_file(repo, "a.txt", "first\n", "First commit")
+    (tmp_path / "dir").mkdir()
+    commit_file(repo, "dir/b.txt", "second\n", "Second commit")
+    commit_file(repo, "a.txt", "changed\n", "Third commit")
+    yield repo
+    close_blob_reader(repo)
+    repo.close()
+
+
+def test_read_blob_from_refs(repo):
+    reader = GitBlobReader(repo)
+    try:
+        assert reader.read("HEAD", "a.txt") == b"changed\n"
+        assert reader.read("HEAD~2", "a.txt") == b"first\n"
+        assert reader.read("HEAD", "dir/b.txt") == b"second\n"
+    finally:
+        reader.close()
+
+
+def test_read_missing_or_non_blob(repo):
+    reader = GitBlobReader(repo)
+    try:
+        assert reader.read("HEAD", "missing.txt") is None
+        assert reader.read("HEAD~2", "dir/b.txt") is None
+        assert reader.read("no-such-ref", "a.txt") is None
+        assert reader.read("HEAD", "dir") is None
+        # The process stays usable after misses
+        assert reader.read("HEAD", "a.txt") == b"changed\n"
+    finally:
+        reader.close()
+
+
+def test_read_many_uses_single_process(repo):
+    reader = GitBlobReader(repo)
+    try:
+        result = reader.read_many([("HEAD", "a.txt"), ("HEAD", "dir/b.txt"), ("HEAD", "x")])
+        assert result == {
+            ("HEAD", "a.txt"): b"changed\n",
+            ("HEAD", "dir/b.txt"): b"second\n",
+            ("HEAD", "x"): None,
+        }
+        pid = reader._process.pid
+        assert reader.read("HEAD~1", "a.txt") == b"first\n"
+        assert reader._process.pid == pid
+    finally:
+        reader.close()
+    assert reader._process is None
+
+
+def test_read_many_large_batch(repo):
+    reader = GitBlobReader(repo)
+    try:
+        items = [(f"HEAD~{i % 3}", "a.txt") for i in range(3)] + [
+            ("HEAD", f"missing-{i}.txt") for i in range(5000)
+        ]
+        result = reader.read_many(items)
+        assert result[("HEAD~2", "a.txt")] == b"first\n"
+        assert result[("HEAD", "missing-4999.txt")] is None
+    finally:
+        reader.close()
+
+
+def test_shared_reader_per_repo(repo):
+    reader = get_blob_reader(repo)
+    assert get_blob_reader(repo) is reader
+    assert reader.read("HEAD", "a.txt") == b"changed\n"
+    close_blob_reader(repo)
+    assert reader._process is None
+    assert get_blob_reader(repo) is not reader
+
+
+def test_cache_follows_moved_refs(repo):
+    reader = GitBlobReader(repo)
+    try:
+        assert reader.read("HEAD", "a.txt") == b"changed\n"
+        commit_file(repo, "a.txt", "after checkout\n", "Fourth commit")
+        assert reader.read("HEAD", "a.txt") == b"after checkout\n"
+        # Same contents under different refs are cached once
+        commit_file(repo, "c.txt", "changed\n", "Fifth commit")
+        reader.read_many([("HEAD", "c.txt"), ("HEAD~2", "a.txt")])
+        assert len(reader._cache) == 2
+    finally:
+        reader.close()
+
+
+def test_cache_size_limits(repo):
+    commit_file(repo, "big.txt", "x" * 100, "Big file")
+    reader = GitBlobReader(repo, cache_size=10, max_cached_blob_size=50)
+    try:
+        assert reader.read("HEAD", "big.txt") == b"x" * 100
+        assert reader.read("HEAD", "a.txt") == b"changed\n"
+        assert reader.read("HEAD", "dir/b.txt") == b"second\n"
+        # The big blob is not cached, the least recently used one is evicted
+        assert list(reader._cache.values()) == [b"second\n"]
+        assert reader.read("HEAD", "a.txt") == b"changed\n"
+    finally:
+        reader.close()
@@ -1,4 +1,5 @@
 import json
+from types import SimpleNamespace
 
 import pytest
 
@@ -226,9 +227,8 @@ def test_post_gitlab_inline_review(monkeypatch, report_file):
         calls.append(("PUT", url, json))
         return FakeResponse(200, {"resolved": True})
 
-    monkeypatch.setattr(gl_api.requests, "get", fake_get)
-    monkeypatch.setattr(gl_api.requests, "post", fake_post)
-    monkeypatch.setattr(gl_api.requests, "put", fake_put)
+    session = SimpleNamespace(get=fake_get, post=fake_post, put=fake_put)
+    monkeypatch.setattr(gl_api, "http_session", lambda: session)
     monkeypatch.setattr(gl_cmd, "sleep", lambda seconds: None)
 
     post_gitlab_cr_comment(
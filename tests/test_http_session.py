@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gito.utils.http_session import HttpSession
+
+
+class ScriptedServer(ThreadingHTTPServer):
+    """Responds to each path with the scripted statuses / headers, then with 200."""
+
+    daemon_threads = True
+
+    def __init__(self, script: dict[str, list[tuple[int, dict]]]):
+        super().__init__(("127.0.0.1", 0), ScriptedHandler)
+        self.script = script
+        self.hits = Counter()
+        self.client_ports = set()
+        self.active = self.max_active = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    server: ScriptedServer
+    # Keep-alive connections
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def handle_request(self):
+        if length := int(self.headers.get("Content-Length") or 0):
+            self.rfile.read(length)
+        with self.server.lock:
+            self.server.hits[self.path] += 1
+            self.server.client_ports.add(self.client_address[1])
+            self.server.active += 1
+            self.server.max_active = max(self.server.max_active, self.server.active)
+            responses = self.server.script.get(self.path, [])
+            status, headers = responses.pop(0) if responses else (200, {})
+        if self.path == "/slow":
+            time.sleep(0.05)
+        with self.server.lock:
+            self.server.active -= 1
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    do_GET = do_POST = handle_request
+
+
+@pytest.fixture
+def server():
+    server = ScriptedServer({})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_retries(server):
+    session = HttpSession(backoff_factor=0)
+    server.script = {
+        "/flaky": [(503, {"Retry-After": "0"}), (502, {})],
+        "/post-502": [(502, {})],
+        "/post-429": [(429, {"Retry-After": "0"})],
+        "/down": [(503, {})] * 10,
+    }
+    assert session.get(f"{server.url}/flaky").status_code == 200
+    assert server.hits["/flaky"] == 3
+    # The outcome of the failed POST is unknown, it is not repeated
+    assert session.post(f"{server.url}/post-502", json={}).status_code == 502
+    assert server.hits["/post-502"] == 1
+    # Rate limited requests are not processed, safe to repeat
+    assert session.post(f"{server.url}/post-429", json={}).status_code == 200
+    assert server.hits["/post-429"] == 2
+    assert session.get(f"{server.url}/down").status_code == 503
+    assert server.hits["/down"] == 1 + session.max_retries
+    # Connections are reused
+    assert len(server.client_ports) == 1
+
+
+def test_rate_limit_headers(server):
+    session = HttpSession(backoff_factor=0)
+    reset = str(int(time.time()) + 1)
+    server.script = {
+        "/limited": [(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset})],
+        "/long-limited": [(429, {"Retry-After": "3600"})],
+    }
+    started = time.time()
+    assert session.get(f"{server.url}/limited").status_code == 200
+    # Waited for the rate limit reset
+    assert time.time() >= int(reset) - 0.01 and time.time() - started < 5
+    # Waiting longer than max_retry_wait is left to the caller
+    assert session.get(f"{server.url}/long-limited").status_code == 429
+    assert session.retries == 1
+
+
+def test_per_host_concurrency(server):
+    session = HttpSession(max_concurrent_per_host=2)
+    with ThreadPoolExecutor(8) as pool:
+        statuses = list(pool.map(lambda _: session.get(f"{server.url}/slow").status_code, range(8)))
+    assert statuses == [200] * 8
+    assert server.max_active == 2
+    assert len(server.client_ports) <= 2
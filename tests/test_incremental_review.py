@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+import pytest
+
+from gito.bootstrap import bootstrap
+from gito.core import review, plan_incremental_review, get_diff
+from gito.report_struct import Report, ReviewTarget
+
+
+@pytest.fixture
+def repo(make_repo, commit_files):
+    repo = make_repo()
+    commit_files(repo, {"a.py": "a = 1\n", "b.py": "b = 1\n"}, "add a and b")
+    repo.git.checkout("-b", "feature")
+    commit_files(repo, {"a.py": "a = 2\n", "b.py": "b = 2\n"}, "change a and b")
+    return repo
+
+
+async def fake_llm_parallel(prompts, **kwargs):
+    return [
+        [
+            {
+                "title": "Issue in a.py" if "a.py" in str(p) else "Issue in b.py",
+                "severity": 1,
+                "confidence": 1,
+                "affected_lines": [{"start_line": 1, "end_line": 1}],
+            }
+        ]
+        for p in prompts
+    ]
+
+
+def run_review(repo, out_folder, incremental=False):
+    target = ReviewTarget(what="HEAD", against="main", filters="")
+    asyncio.run(review(target=target, repo=repo, out_folder=out_folder, incremental=incremental))
+
+
+def test_incremental_review_carries_forward_unchanged_files(repo, tmp_path, commit_files, fake_llm):
+    bootstrap()
+    out = tmp_path / "out"
+    fake_llm(fake_llm_parallel)
+    run_review(repo, out)
+    first = Report.load(out / "code-review-report.json")
+    assert first.head_sha == repo.head.commit.hexsha
+
+    commit_files(repo, {"a.py": "a = 3\n"}, "change a again")
+    mock_llm = fake_llm(fake_llm_parallel)
+    run_review(repo, out, incremental=True)
+
+    prompts = [p for call in mock_llm.await_args_list for p in call.args[0]]
+    assert len(prompts) == 1 and "a.py" in str(prompts[0])
+    data = json.loads((out / "code-review-report.json").read_text(encoding="utf-8"))
+    assert data["head_sha"] == repo.head.commit.hexsha
+    assert data["stats"]["incremental"] == {
+        "since_sha": first.head_sha,
+        "reviewed_files": 1,
+        "unchanged_files": 1,
+    }
+    assert list(data["issues"]) == ["a.py", "b.py"]
+    assert data["issues"]["b.py"][0]["title"] == "Issue in b.py"
+    assert data["issues"]["b.py"][0]["affected_lines"][0]["affected_code"] == "1: b = 2"
+
+
+def test_incremental_review_without_previous_report_is_full(repo, tmp_path, fake_llm):
+    bootstrap()
+    mock_llm = fake_llm()
+    run_review(repo, tmp_path / "out", incremental=True)
+    assert mock_llm.await_count == 2
+
+
+def test_plan_follows_pure_renames(repo):
+    previous = Report(
+        head_sha=repo.head.commit.hexsha,
+        target=ReviewTarget(filters=""),
+        issues={"b.py": [{"id": 1, "title": "T", "file": "b.py"}]},
+    )
+    repo.git.mv("b.py", "c.py")
+    repo.index.commit("rename b.py")
+    diff = get_diff(repo, what="HEAD", against="main")
+
+    to_review, carried = plan_incremental_review(repo, diff, previous, repo.head.commit.hexsha, "")
+
+    assert [f.path for f in to_review] == []
+    assert carried["c.py"][0]["file"] == "c.py"
+    assert "id" not in carried["c.py"][0]
+
+
+def test_plan_requires_known_previous_commit(repo):
+    diff = get_diff(repo, what="HEAD", against="main")
+    assert plan_incremental_review(repo, diff, Report(), repo.head.commit.hexsha) is None
+    assert (
+        plan_incremental_review(
+            repo, diff, Report(head_sha="0" * 40, target=ReviewTarget()), repo.head.commit.hexsha
+        )
+        is None
+    )
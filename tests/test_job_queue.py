@@ -0,0 +1,31 @@
+from gito.job_queue import JobQueue, JobStatus
+
+
+def test_job_queue(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db")
+    first, superseded = queue.enqueue("pr#1", "sha1", {"n": 1})
+    assert superseded == []
+    assert queue.enqueue("pr#1", "sha1", {"n": 1}) == (None, [])
+    other, _ = queue.enqueue("pr#2", "sha1", {"n": 2})
+
+    job = queue.claim()
+    assert (job.id, job.payload, job.status) == (first, {"n": 1}, JobStatus.RUNNING)
+    # Newer revision supersedes the running job
+    second, superseded = queue.enqueue("pr#1", "sha2", {"n": 3})
+    assert superseded == [first]
+    queue.complete(first, JobStatus.DONE)
+    assert queue.get(first).status == JobStatus.SUPERSEDED
+
+    assert queue.claim().id == other
+    assert queue.claim().id == second
+    assert queue.claim() is None
+    queue.complete(other, JobStatus.FAILED, "error")
+    assert queue.get(other).error == "error"
+    queue.close()
+
+    # Jobs interrupted by a restart are queued again
+    queue = JobQueue(tmp_path / "jobs.db")
+    assert queue.recover() == 1
+    assert queue.claim().id == second
+    assert queue.counts() == {"superseded": 1, "failed": 1, "running": 1}
+    queue.close()
@@ -0,0 +1,259 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import microcore as mc
+import pytest
+
+from gito.bootstrap import bootstrap
+from gito.core import review
+from gito.llm_scheduler import (
+    LLMScheduler,
+    TokenBucket,
+    estimate_makespan,
+    get_retry_after,
+    is_rate_limit_error,
+    tenant,
+)
+from gito.report_struct import ReviewTarget
+
+
+class RateLimitError(Exception):
+    def __init__(self, headers=None):
+        super().__init__("Too many requests")
+        self.status_code = 429
+        self.response = SimpleNamespace(status_code=429, headers=headers or {})
+
+
+def test_rate_limit_error_detection():
+    assert is_rate_limit_error(RateLimitError())
+    assert not is_rate_limit_error(ValueError("Bad request"))
+    assert get_retry_after(RateLimitError({"retry-after": "2"})) == 2
+    assert get_retry_after(RateLimitError({"retry-after-ms": "150"})) == 0.15
+    assert get_retry_after(RateLimitError()) is None
+    assert get_retry_after(ValueError()) is None
+
+
+def test_token_bucket():
+    bucket = TokenBucket(60)
+    assert bucket.wait_time(60) == 0
+    bucket.consume(60)
+    assert 0.9 < bucket.wait_time(1) <= 1
+    # Requests larger than the bucket are admitted once it is full
+    assert bucket.wait_time(1000) <= 60
+
+
+def test_scheduler_limits_concurrency():
+    scheduler = LLMScheduler(max_concurrency=3, initial_concurrency=2)
+    running, peak = 0, 0
+
+    async def llm(prompt, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return prompt
+
+    async def main():
+        return await asyncio.gather(*[scheduler.run(llm, f"p{i}") for i in range(12)])
+
+    assert asyncio.run(main()) == [f"p{i}" for i in range(12)]
+    assert peak == 3
+    assert scheduler.stats == {
+        "requests": 12,
+        "rate_limited": 0,
+        "peak_concurrency": 3,
+        "final_concurrency": 3,
+        "hedged_requests": 0,
+        "hedge_wins": 0,
+    }
+
+
+def test_scheduler_retries_rate_limited_requests():
+    scheduler = LLMScheduler(max_concurrency=8, initial_concurrency=8)
+    failures = {"p0": 2, "p1": 1}
+
+    async def llm(prompt, **kwargs):
+        if failures.get(prompt):
+            failures[prompt] -= 1
+            raise RateLimitError({"retry-after": "0.01"})
+        return prompt
+
+    async def main():
+        return await asyncio.gather(*[scheduler.run(llm, f"p{i}") for i in range(4)])
+
+    assert asyncio.run(main()) == ["p0", "p1", "p2", "p3"]
+    assert scheduler.rate_limited == 3
+    assert scheduler.concurrency < 8
+    assert not scheduler.slow_start
+
+
+def test_scheduler_gives_up_after_max_rate_limit_retries():
+    scheduler = LLMScheduler(max_concurrency=1, max_rate_limit_retries=1)
+
+    async def llm(prompt, **kwargs):
+        raise RateLimitError({"retry-after": "0"})
+
+    with pytest.raises(RateLimitError):
+        asyncio.run(scheduler.run(llm, "p"))
+    assert scheduler.rate_limited == 1
+    assert scheduler.in_flight == 0
+
+
+def test_run_hedged_returns_first_valid_result():
+    scheduler = LLMScheduler(max_concurrency=4)
+    delays = iter([1, 0.01])
+
+    async def attempt():
+        delay = next(delays)
+        await asyncio.sleep(delay)
+        return delay
+
+    assert asyncio.run(scheduler.run_hedged(attempt, hedge_after=0.05)) == 0.01
+    assert (scheduler.hedged_requests, scheduler.hedge_wins) == (1, 1)
+
+
+def test_run_hedged_waits_for_valid_result():
+    scheduler = LLMScheduler(max_concurrency=4)
+    results = iter([(0.1, None), (0.2, "valid")])
+
+    async def attempt():
+        delay, result = next(results)
+        await asyncio.sleep(delay)
+        return result
+
+    result = asyncio.run(scheduler.run_hedged(attempt, 0.05, is_valid=lambda r: r is not None))
+    assert result == "valid"
+    assert (scheduler.hedged_requests, scheduler.hedge_wins) == (1, 1)
+
+
+def test_run_hedged_does_not_hedge_fast_or_queued_requests():
+    scheduler = LLMScheduler(max_concurrency=4)
+
+    async def attempt():
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    assert asyncio.run(scheduler.run_hedged(attempt, hedge_after=1)) == "ok"
+    scheduler.in_flight = 4  # All request slots are busy
+
+    async def slow_attempt():
+        await asyncio.sleep(0.1)
+        return "slow"
+
+    assert asyncio.run(scheduler.run_hedged(slow_attempt, hedge_after=0.01)) == "slow"
+    assert scheduler.hedged_requests == 0
+
+
+def test_install_routes_llm_requests():
+    bootstrap()
+    scheduler = LLMScheduler(max_concurrency=2)
+    original = mc.env().llm_async_function
+    with scheduler.install():
+        assert mc.env().llm_async_function is not original
+    assert mc.env().llm_async_function is original
+
+
+def test_estimate_makespan():
+    assert estimate_makespan([], 4) == 0
+    assert estimate_makespan([1, 1, 1, 1], 2) == 2
+    # The longest job submitted last runs alone at the end
+    assert estimate_makespan([1, 1, 1, 1, 4], 2) == 6
+    assert estimate_makespan([4, 1, 1, 1, 1], 2) == 4
+
+
+def test_review_submits_longest_prompts_first(tmp_path, make_repo, commit_files, fake_llm):
+    bootstrap()
+    repo = make_repo()
+    commit_files(
+        repo,
+        {"a_small.py": "x = 1\n", "b_large.py": "".join(f"y{i} = {i}\n" for i in range(300))},
+        "add files",
+    )
+
+    async def respond(prompts, **kwargs):
+        return [
+            [
+                {
+                    "title": "Large" if "b_large.py" in str(p) else "Small",
+                    "severity": 1,
+                    "confidence": 1,
+                }
+            ]
+            for p in prompts
+        ]
+
+    mock_llm = fake_llm(respond)
+    target = ReviewTarget(what="HEAD", against="HEAD~1", use_merge_base=False, filters="")
+    asyncio.run(review(target=target, repo=repo, out_folder=tmp_path / "out"))
+
+    prompts = [p for call in mock_llm.await_args_list for p in call.args[0]]
+    assert "b_large.py" in str(prompts[0])
+    report = json.loads((tmp_path / "out" / "code-review-report.json").read_text())
+    assert list(report["issues"]) == ["a_small.py", "b_large.py"]
+    assert report["issues"]["a_small.py"][0]["title"] == "Small"
+
+
+def test_concurrently_installed_schedulers_are_isolated():
+    bootstrap()
+    original = mc.env().llm_async_function
+    schedulers = [LLMScheduler(max_concurrency=2) for _ in range(2)]
+
+    async def fake_llm(prompt, **kwargs):
+        await asyncio.sleep(0.01)
+        return prompt
+
+    async def review(scheduler, prompts):
+        with scheduler.install():
+            await asyncio.sleep(0.01)
+            return [await mc.env().llm_async_function(p) for p in prompts]
+
+    async def main():
+        return await asyncio.gather(review(schedulers[0], ["a"]), review(schedulers[1], "bcd"))
+
+    mc.env().llm_async_function = fake_llm
+    try:
+        assert asyncio.run(main()) == [["a"], ["b", "c", "d"]]
+        assert mc.env().llm_async_function is fake_llm
+    finally:
+        mc.env().llm_async_function = original
+    assert [s.requests for s in schedulers] == [1, 3]
+
+
+def test_scheduler_shares_slots_fairly_between_tenants():
+    scheduler = LLMScheduler(max_concurrency=1, initial_concurrency=1)
+    order = []
+
+    async def llm(prompt, **kwargs):
+        await asyncio.sleep(0.001)
+        order.append(prompt[0])
+        return prompt
+
+    async def requests(name: str, count: int):
+        with tenant(name):
+            await asyncio.gather(*[scheduler.run(llm, f"{name}{i}") for i in range(count)])
+
+    async def main():
+        await asyncio.gather(requests("a", 6), requests("b", 2))
+
+    asyncio.run(main())
+    # Tenants take turns instead of "b" waiting for all requests of "a"
+    assert "".join(order) == "ababaaaa"
+
+
+def test_concurrency_grows_with_mixed_request_sizes():
+    scheduler = LLMScheduler(max_concurrency=100, initial_concurrency=4)
+    # Latency proportional to the request size: no queueing
+    for i in range(20):
+        tokens = 100 if i % 2 else 20000
+        scheduler._on_success(latency=tokens / 1000, tokens=tokens)
+    assert scheduler.concurrency == 24
+
+    # Requests of the same size getting much slower: the limit is held
+    scheduler._on_success(latency=100, tokens=100)
+    assert scheduler.concurrency == 24
+    # A stale fast average does not hold the growth forever
+    for _ in range(20):
+        scheduler._on_success(latency=100, tokens=100)
+    assert scheduler.concurrency > 24
@@ -0,0 +1,42 @@
+import asyncio
+import json
+from pathlib import Path
+
+from gito.bootstrap import bootstrap
+from gito.core import needs_escalation, review
+from gito.report_struct import ReviewTarget
+
+
+def test_needs_escalation():
+    assert needs_escalation(None, 2)
+    assert needs_escalation(ValueError(), 2)
+    assert not needs_escalation([], 2)
+    assert not needs_escalation([{"severity": 3}, {"severity": None}], 2)
+    assert needs_escalation([{"severity": 3}, {"severity": "2"}], 2)
+
+
+def test_review_escalates_risky_files_only(tmp_path, make_repo, commit_files, fake_llm):
+    bootstrap()
+    repo = make_repo()
+    commit_files(repo, {"risky.py": "eval(input())\n", "trivial.py": "x = 1\n"}, "add files")
+    config_file = Path(repo.working_tree_dir) / ".gito" / "config.toml"
+    config_file.write_text('review_cache = false\ntriage_model = "cheap"\n')
+
+    async def llm_parallel(prompts, model=None, **kwargs):
+        risky = "risky.py" in str(prompts[0])
+        if model == "cheap":
+            issue = {"title": "Cheap", "severity": 1 if risky else 3, "confidence": 1}
+        else:
+            issue = {"title": "Main", "severity": 1, "confidence": 1}
+        return [[issue]]
+
+    mock_llm = fake_llm(llm_parallel)
+    target = ReviewTarget(what="HEAD", against="HEAD~1", use_merge_base=False, filters="")
+    asyncio.run(review(target=target, repo=repo, out_folder=tmp_path / "out"))
+
+    models = sorted(str(call.kwargs.get("model")) for call in mock_llm.await_args_list)
+    assert models == ["None", "cheap", "cheap"]
+    report = json.loads((tmp_path / "out" / "code-review-report.json").read_text())
+    assert report["issues"]["risky.py"][0]["title"] == "Main"
+    assert report["issues"]["trivial.py"][0]["title"] == "Cheap"
+    assert report["stats"]["model_cascade"] == {"triaged": 2, "escalated": 1}
@@ -0,0 +1,92 @@
+import asyncio
+import io
+import json
+import tarfile
+import textwrap
+
+from typer.testing import CliRunner
+
+from gito.bootstrap import bootstrap
+from gito.cli import app
+from gito.patch_review import load_patch_changes, review_patch
+
+PATCH = textwrap.dedent(
+    """\
+    diff --git a/src/app.py b/src/app.py
+    index 1111111..2222222 100644
+    --- a/src/app.py
+    +++ b/src/app.py
+    @@ -1,3 +1,4 @@
+     def main():
+    -    print("hello")
+    +    name = input()
+    +    print("hello " + name)
+         return 0
+    diff --git a/docs/new.md b/docs/new.md
+    new file mode 100644
+    index 0000000..3333333
+    --- /dev/null
+    +++ b/docs/new.md
+    @@ -0,0 +1,2 @@
+    +# New
+    +Documentation
+    diff --git a/logo.png b/logo.png
+    index 5555555..6666666 100644
+    Binary files a/logo.png and b/logo.png differ
+    """
+)
+APP_PY = 'def main():\n    name = input()\n    print("hello " + name)\n    return 0\n'
+
+
+def test_review_patch_from_stdin(tmp_path, monkeypatch, fake_llm):
+    bootstrap()
+    monkeypatch.chdir(tmp_path)
+    llm = fake_llm()
+    result = CliRunner().invoke(app, ["review", "--patch", "-", "--out", "out"], input=PATCH)
+    assert result.exit_code == 0, result.output
+    report = json.loads((tmp_path / "out" / "code-review-report.json").read_text())
+    assert list(report["issues"]) == ["src/app.py", "docs/new.md"]
+    # Diff-only review: the diff is the input of added files too
+    prompts = [str(call.args[0][0]) for call in llm.await_args_list]
+    assert '+    print("hello " + name)' in prompts[0]
+    assert "+Documentation" in prompts[1]
+    assert not (tmp_path / ".git").exists()
+
+
+def test_review_patch_api_defaults(tmp_path, fake_llm):
+    bootstrap()
+    patch_file = tmp_path / "change.patch"
+    patch_file.write_text(PATCH)
+    llm = fake_llm()
+    report = asyncio.run(review_patch(patch_file, out_folder=tmp_path / "out"))
+    assert list(report.issues) == ["src/app.py", "docs/new.md"]
+    assert llm.await_count == 2
+
+
+def test_patch_file_contents(tmp_path):
+    patch_file = tmp_path / "change.patch"
+    patch_file.write_text(PATCH)
+
+    folder = tmp_path / "tree"
+    (folder / "src").mkdir(parents=True)
+    (folder / "src" / "app.py").write_text(APP_PY)
+    changes = load_patch_changes(patch_file, folder)
+    # Files missing in the folder are not reviewed
+    assert [file.path for file in changes.diff] == ["src/app.py"]
+    assert changes.read_file("src/app.py") == APP_PY
+
+    # Tarballs of source archives have a top-level folder
+    tarball = tmp_path / "tree.tar.gz"
+    with tarfile.open(tarball, "w:gz") as tar:
+        for name, text in [
+            ("project-1.0/src/app.py", APP_PY),
+            ("project-1.0/docs/new.md", "# New\nDocumentation\n"),
+            ("project-1.0/.gito/config.toml", 'exclude_files = ["docs/*"]\n'),
+        ]:
+            info = tarfile.TarInfo(name)
+            info.size = len(text.encode())
+            tar.addfile(info, io.BytesIO(text.encode()))
+    changes = load_patch_changes(patch_file, tarball)
+    assert [file.path for file in changes.diff] == ["src/app.py", "docs/new.md"]
+    assert changes.read_file("docs/new.md") == "# New\nDocumentation\n"
+    assert changes.config.exclude_files == ["docs/*"]
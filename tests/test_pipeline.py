@@ -1,3 +1,6 @@
+import asyncio
+import time
+
 import pytest
 from unittest.mock import patch, MagicMock
 import microcore as mc
@@ -136,3 +139,126 @@ def test_pipelineenv_unknown_value_raises():
 def test_pipelineenv_gh_action_warns():
     with pytest.warns(DeprecationWarning):
         assert PipelineEnv("gh-action") == PipelineEnv.CI
+
+
+# --- Dependencies and concurrent execution ---
+
+
+def make_ctx():
+    mc.configure(
+        LLM_API_TYPE=mc.ApiType.NONE,
+    )
+    return Context(
+        report=Report(),
+        config=ProjectConfig.load(),
+        diff=[],
+        repo=None,
+    )
+
+
+def test_pipeline_runs_independent_steps_concurrently(patch_github_action_env):
+    patch_github_action_env(False)
+    step1 = PipelineStep(call="func1", depends_on=[])
+    step2 = PipelineStep(call="func2", depends_on=[])
+    step1.run = lambda *a, **k: time.sleep(0.3) or {"a": 1}
+    step2.run = lambda *a, **k: time.sleep(0.3) or {"b": 2}
+    pipeline = Pipeline(make_ctx(), steps={"step1": step1, "step2": step2})
+
+    started = time.monotonic()
+    result = pipeline.run()
+    assert time.monotonic() - started < 0.55
+    assert result["a"] == 1 and result["b"] == 2
+
+
+def test_pipeline_dependencies(patch_github_action_env):
+    patch_github_action_env(False)
+    seen = {}
+
+    def fetch(*a, **k):
+        time.sleep(0.1)
+        return {"issue": "PRJ-1"}
+
+    async def use(*a, pipeline_out, **k):
+        seen.update(pipeline_out)
+        return {"issue_title": f"Title of {pipeline_out['issue']}"}
+
+    fetch_step = PipelineStep(call="fetch", depends_on=[])
+    use_step = PipelineStep(call="use", depends_on=["fetch"])
+    other_step = PipelineStep(call="other", depends_on=[])
+    fetch_step.run, use_step.run = fetch, use
+    other_step.run = lambda *a, **k: {"other": True}
+    pipeline = Pipeline(
+        make_ctx(), steps={"use": use_step, "fetch": fetch_step, "other": other_step}
+    )
+
+    result = pipeline.run()
+    assert result["issue_title"] == "Title of PRJ-1"
+    # Only outputs of dependencies are visible to the step
+    assert seen == {"issue": "PRJ-1", "fetch": {"issue": "PRJ-1"}}
+    assert list(result) == ["issue_title", "use", "issue", "fetch", "other"]
+
+
+def test_pipeline_merges_outputs_in_declaration_order(patch_github_action_env):
+    patch_github_action_env(False)
+    slow = PipelineStep(call="slow", depends_on=[])
+    fast = PipelineStep(call="fast", depends_on=[])
+    slow.run = lambda *a, **k: time.sleep(0.1) or {"value": "slow"}
+    fast.run = lambda *a, **k: {"value": "fast"}
+    assert Pipeline(make_ctx(), steps={"fast": fast, "slow": slow}).run()["value"] == "slow"
+    assert Pipeline(make_ctx(), steps={"slow": slow, "fast": fast}).run()["value"] == "fast"
+
+
+def test_pipeline_invalid_dependencies():
+    steps = {
+        "a": PipelineStep(call="a", depends_on=["b"]),
+        "b": PipelineStep(call="b", depends_on=["a"]),
+    }
+    with pytest.raises(ValueError, match="Circular"):
+        Pipeline(ctx=None, steps=steps).run()
+    with pytest.raises(ValueError, match="unknown"):
+        Pipeline(ctx=None, steps={"a": PipelineStep(call="a", depends_on=["x"])}).run()
+
+
+def test_pipeline_runs_input_only_steps_separately(patch_github_action_env):
+    patch_github_action_env(False)
+    fetch = PipelineStep(call="fetch", input_only=True)
+    use = PipelineStep(call="use", depends_on=["fetch"])
+    fetch.run = lambda *a, **k: {"issue": "PRJ-1"}
+    use.run = lambda *a, pipeline_out, **k: {"issue_title": f"Title of {pipeline_out['issue']}"}
+    pipeline = Pipeline(make_ctx(), steps={"fetch": fetch, "use": use})
+
+    assert pipeline.run(input_only=True) == {"issue": "PRJ-1", "fetch": {"issue": "PRJ-1"}}
+    # Outputs of the input-only steps are available to the dependent steps
+    assert pipeline.run(input_only=False)["issue_title"] == "Title of PRJ-1"
+
+
+def test_pipeline_input_only_step_cant_depend_on_result_step():
+    steps = {
+        "a": PipelineStep(call="a", input_only=True, depends_on=["b"]),
+        "b": PipelineStep(call="b"),
+    }
+    with pytest.raises(ValueError, match="Input-only"):
+        Pipeline(ctx=None, steps=steps).run(input_only=True)
+
+
+def test_pipeline_steps_depend_on_previous_steps_by_default(patch_github_action_env):
+    patch_github_action_env(False)
+    first = PipelineStep(call="first")
+    second = PipelineStep(call="second")
+    first.run = lambda *a, **k: time.sleep(0.1) or {"value": 1}
+    second.run = lambda *a, pipeline_out, **k: {"value": pipeline_out["value"] + 1}
+    pipeline = Pipeline(make_ctx(), steps={"first": first, "second": second})
+
+    assert pipeline.run()["value"] == 2
+
+
+def test_pipeline_run_inside_event_loop(patch_github_action_env):
+    patch_github_action_env(False)
+    step = PipelineStep(call="func")
+    step.run = lambda *a, **k: {"value": 1}
+    pipeline = Pipeline(make_ctx(), steps={"step": step})
+
+    async def main():
+        return pipeline.run()
+
+    assert asyncio.run(main())["value"] == 1
@@ -1,6 +1,8 @@
 import logging
 import textwrap
+import tomllib
 from pathlib import Path
+from unittest.mock import patch
 
 from gito.project_config import ProjectConfig
 from gito.pipeline import PipelineStep
@@ -68,3 +70,39 @@ def test_post_init_coerces_dict_steps_to_pipeline_step():
     assert isinstance(cfg.pipeline_steps["from_dict"], PipelineStep)
     assert cfg.pipeline_steps["from_dict"].call == "x"
     assert cfg.pipeline_steps["kept"] is existing
+
+
+def test_load_is_cached_until_file_changes(tmp_path):
+    toml_path = tmp_path / "config.toml"
+    toml_path.write_text("retries = 7\n")
+    cfg = ProjectConfig.load(config_path=toml_path)
+    with patch("gito.project_config.tomllib.loads") as loads:
+        cached = ProjectConfig.load(config_path=str(toml_path))
+    loads.assert_not_called()
+    # Each call returns a new instance
+    assert cached is not cfg and cached.retries == 7
+    cached.prompt_vars["extra"] = "changed"
+    assert "extra" not in ProjectConfig.load(config_path=toml_path).prompt_vars
+
+    toml_path.write_text("retries = 8\n")
+    assert ProjectConfig.load(config_path=toml_path).retries == 8
+
+    ProjectConfig.invalidate_cache(toml_path)
+    with patch("gito.project_config.tomllib.loads", wraps=tomllib.loads) as loads:
+        assert ProjectConfig.load(config_path=toml_path).retries == 8
+    loads.assert_called_once()
+    toml_path.unlink()
+    assert ProjectConfig.load(config_path=toml_path).retries == 3
+
+
+def test_cached_config_detects_github_env(tmp_path, monkeypatch):
+    toml_path = tmp_path / "config.toml"
+    toml_path.write_text("retries = 7\n")
+    monkeypatch.setenv("GITHUB_REPOSITORY", "owner/first")
+    assert ProjectConfig.load(config_path=toml_path).prompt_vars["github_env"]["github_repo"] == (
+        "owner/first"
+    )
+    monkeypatch.setenv("GITHUB_REPOSITORY", "owner/second")
+    assert ProjectConfig.load(config_path=toml_path).prompt_vars["github_env"]["github_repo"] == (
+        "owner/second"
+    )
@@ -1,5 +1,6 @@
 import json
 import os
+from dataclasses import asdict
 from gito.bootstrap import bootstrap
 from gito.report_struct import Report, Issue
 
@@ -206,3 +207,69 @@ def test_get_issue_by_id():
     assert found is not None
     assert found.id == 1
     assert report.get_issue_by_id(999) is None
+
+
+def test_issue_index_consistency(tmp_path):
+    report = Report()
+    report.register_issues({"a.py": [{"title": "A1"}], "b.py": [{"title": "B1"}]})
+    report.register_issue("a.py", {"title": "A2"})
+    # The flat list keeps issues grouped by file
+    assert [i.title for i in report.plain_issues] == ["A1", "A2", "B1"]
+    assert report.get_issue_by_id(3).title == "A2"
+    assert report.total_issues == 3
+
+    file_name = tmp_path / "report.json"
+    report.save(file_name)
+    loaded = Report.load(file_name)
+    assert [i.id for i in loaded.plain_issues] == [1, 3, 2]
+    assert loaded.get_issue_by_id(2).title == "B1"
+    loaded.register_issue("c.py", {"title": "C1"})
+    assert loaded.get_issue_by_id(4).file == "c.py"
+
+    del loaded.issues["a.py"]
+    loaded.reindex()
+    assert loaded.total_issues == 2
+    assert loaded.get_issue_by_id(1) is None
+    assert [i.title for i in loaded.plain_issues] == ["B1", "C1"]
+
+
+def make_report_with_issues():
+    report = Report(summary="Summary")
+    report.register_issues(
+        {
+            "a.py": [{"title": "A1", "affected_lines": [{"start_line": 1, "proposal": "x"}]}],
+            "b.py": [{"title": "B1"}, {"title": "B2"}],
+        }
+    )
+    return report
+
+
+def test_report_compact_gzip_round_trip(tmp_path):
+    report = make_report_with_issues()
+    report.save(tmp_path / "report.json")
+    report.save(tmp_path / "report.json.gz", compact=True)
+    with open(tmp_path / "report.json", encoding="utf-8") as f:
+        assert json.load(f) == asdict(report)
+    loaded = Report.load(tmp_path / "report.json.gz")
+    assert loaded == report
+    assert loaded.total_issues == 3
+
+
+def test_report_lazy_load(tmp_path):
+    file_name = tmp_path / "report.json"
+    make_report_with_issues().save(file_name, compact=True)
+    report = Report.load(file_name, lazy=True)
+    assert report.total_issues == 3
+    issue = report.get_issue_by_id(3)
+    assert isinstance(issue, Issue) and issue.title == "B2"
+    # Issues of other files are not validated until accessed
+    assert report.issues.to_json_data()["a.py"] == [
+        json.loads(file_name.read_text())["issues"]["a.py"][0]
+    ]
+    assert report.get_issue_by_id(1).affected_lines[0].file == "a.py"
+    assert report.get_issue_by_id(999) is None
+    report.register_issue("c.py", {"title": "C1"})
+    assert [i.id for i in report.plain_issues] == [1, 2, 3, 4]
+
+    report.save(file_name)
+    assert Report.load(file_name) == Report.load(file_name, lazy=True)
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import git
+import pytest
+
+from gito.bootstrap import bootstrap
+from gito.core import review
+from gito.report_struct import ReviewTarget
+from gito.review_cache import ReviewCache
+
+
+def test_cache_put_get(tmp_path):
+    cache = ReviewCache(tmp_path / "cache", max_size=2**20)
+    key = ReviewCache.make_key("prompt", model="model")
+    assert cache.get(key) is None
+    cache.put(key, [{"title": "Bug"}])
+    assert cache.get(key) == [{"title": "Bug"}]
+    assert cache.stats == {"hits": 1, "misses": 1}
+
+
+def test_cache_is_kept_outside_of_the_repository(make_repo, tmp_path):
+    repo = make_repo(tmp_path / "project")
+    worktree = tmp_path / "worktree"
+    repo.git.worktree("add", "--detach", str(worktree))
+    cache = ReviewCache.for_git_dir(repo.common_dir, max_size=2**20)
+    assert cache.folder.parent == Path(os.environ["GITO_CACHE_PATH"])
+    assert cache.folder.name.startswith("project-")
+    # Worktrees share the cache of the repository
+    assert ReviewCache.for_git_dir(git.Repo(worktree).common_dir, 0).folder == cache.folder
+
+
+def test_cache_key_depends_on_model_and_prompt():
+    assert ReviewCache.make_key("p", "m1") != ReviewCache.make_key("p", "m2")
+    assert ReviewCache.make_key("p1", "m") != ReviewCache.make_key("p2", "m")
+    assert ReviewCache.make_key("p", "m") == ReviewCache.make_key("p", "m")
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ReviewCache(tmp_path, max_size=250)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, [{"title": "x" * 90}])
+        os.utime(tmp_path / f"{key}.json", (1000 + i, 1000 + i))
+    os.utime(tmp_path / "a.json", (2000, 2000))  # recently used
+    cache.evict()
+    assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["a", "c"]
+
+
+@pytest.fixture
+def repo(make_repo, commit_files):
+    repo = make_repo()
+    # Enabled for the tests of the cache
+    commit_files(repo, {".gito/config.toml": "", "app.py": 'print("hello")\n'}, "add app.py")
+    repo.git.checkout("-b", "feature")
+    commit_files(repo, {"app.py": 'print("hello")\nprint("world")\n'}, "add world")
+    return repo
+
+
+def test_review_uses_cache_on_rerun(repo, tmp_path, fake_llm):
+    bootstrap()
+    target = ReviewTarget(what="HEAD", against="main", use_merge_base=False, filters="")
+    mock_llm = fake_llm()
+    asyncio.run(review(target=target, repo=repo, out_folder=tmp_path / "out1"))
+    asyncio.run(review(target=target, repo=repo, out_folder=tmp_path / "out2"))
+    mock_llm.assert_awaited_once()
+
+    first = json.loads(Path(tmp_path / "out1" / "code-review-report.json").read_text())
+    second = json.loads(Path(tmp_path / "out2" / "code-review-report.json").read_text())
+    assert first["stats"]["review_cache"] == {"hits": 0, "misses": 1}
+    assert second["stats"]["review_cache"] == {"hits": 1, "misses": 0}
+    assert second["total_issues"] == first["total_issues"] == 1
+    assert [p.name for p in (Path(repo.working_tree_dir) / ".gito").iterdir()] == ["config.toml"]
@@ -12,7 +12,7 @@ runner = CliRunner()
 
 def test_review_command_calls_review(monkeypatch):
     mock_review = AsyncMock()
-    monkeypatch.setattr("gito.cli.review", mock_review)
+    monkeypatch.setattr("gito.core.review", mock_review)
     result = runner.invoke(
         app,
         ["review", "--what", "HEAD", "--against", "HEAD~1"],
@@ -39,12 +39,13 @@ def test_review_command_calls_review(monkeypatch):
         repo=repo,
         target=review_target,
         out_folder=".",
+        incremental=False,
     )
 
 
 def test_calls_review(monkeypatch):
     mock_review = AsyncMock()
-    monkeypatch.setattr("gito.cli.review", mock_review)
+    monkeypatch.setattr("gito.core.review", mock_review)
     result = runner.invoke(
         app_no_subcommand,
         ["HEAD", "--filters", "*.py,*.md"],
@@ -71,4 +72,5 @@ def test_calls_review(monkeypatch):
         repo=repo,
         target=review_target,
         out_folder=".",
+        incremental=False,
     )
@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+import microcore as mc
+import pytest
+
+from gito.bootstrap import bootstrap
+from gito.server import ReviewServer
+
+
+@pytest.fixture
+def repo(make_repo, commit_files):
+    repo = make_repo()
+    commit_files(repo, {"a.py": "a = 1\n"}, "add a.py")
+    return repo
+
+
+async def request(port: int, method: str, path: str, data=None) -> tuple[int, object]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(data).encode() if data is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content)
+
+
+def run_with_server(scenario, roots=None, **kwargs):
+    async def main():
+        server = ReviewServer(**{"max_jobs": 2, "roots": roots} | kwargs)
+        async with await server.start(port=0) as tcp_server:
+            return await scenario(server, tcp_server.sockets[0].getsockname()[1])
+
+    return asyncio.run(main())
+
+
+def test_serve_review_jobs(repo, tmp_path, fake_llm):
+    bootstrap()
+
+    async def scenario(server, port):
+        job = {"path": repo.working_tree_dir, "refs": "HEAD..HEAD~1", "merge_base": False}
+        return await asyncio.gather(
+            request(port, "POST", "/review", job | {"out": str(tmp_path / "out1")}),
+            request(port, "POST", "/review", job | {"out": str(tmp_path / "out2")}),
+            request(port, "POST", "/review", {"path": str(tmp_path / "missing")}),
+        ), await request(port, "GET", "/health")
+
+    fake_llm()
+    (first, second, missing), health = run_with_server(scenario, roots=[tmp_path])
+    assert first[0] == second[0] == 200
+    assert first[1]["issues"]["a.py"][0]["title"] == "Issue"
+    assert first[1]["target"]["what"] == "HEAD"
+    assert (tmp_path / "out2" / "code-review-report.json").exists()
+    assert missing[0] == 400 and "is not a git repository" in missing[1]["error"]
+    status, health = health
+    assert "requests" in health.pop("llm_scheduler")
+    assert (status, health) == (200, {"status": "ok", "active_jobs": 0, "completed_jobs": 3})
+
+
+def test_serve_rejects_paths_outside_of_roots(repo, tmp_path, fake_llm):
+    bootstrap()
+
+    async def scenario(server, port):
+        job = {"path": repo.working_tree_dir, "refs": "HEAD..HEAD~1"}
+        return [
+            await request(port, "POST", "/review", job | {"out": str(tmp_path.parent / "out")}),
+            await request(port, "POST", "/review", {"path": str(tmp_path.parent)}),
+            await request(port, "POST", "/ask", {"question": "?", "path": "/"}),
+        ]
+
+    mock_llm = fake_llm()
+    responses = run_with_server(scenario, roots=[tmp_path / "repo"])
+    assert [status for status, _ in responses] == [400, 400, 400]
+    assert "out is outside of the allowed folders" in responses[0][1]["error"]
+    assert "path is outside of the allowed folders" in responses[1][1]["error"]
+    mock_llm.assert_not_awaited()
+    assert not (tmp_path.parent / "out").exists()
+
+
+def test_serve_jobs_share_llm_scheduler(repo, tmp_path, fake_llm, monkeypatch):
+    bootstrap()
+    in_flight, peak = 0, 0
+
+    async def llm_async_function(prompt, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return []
+
+    async def llm_parallel(prompts, **kwargs):
+        # Requests go through the LLM function routed via the scheduler of the review
+        return [await mc.env().llm_async_function(prompt) for prompt in prompts]
+
+    async def scenario(server, port):
+        job = {"path": repo.working_tree_dir, "refs": "HEAD..HEAD~1", "merge_base": False}
+        await asyncio.gather(
+            request(port, "POST", "/review", job | {"out": str(tmp_path / "out1")}),
+            request(port, "POST", "/review", job | {"out": str(tmp_path / "out2")}),
+        )
+        return server.scheduler
+
+    monkeypatch.setattr(mc.env(), "llm_async_function", llm_async_function)
+    fake_llm(llm_parallel)
+    scheduler = run_with_server(scenario, roots=[tmp_path], max_llm_concurrency=1)
+    assert (scheduler.requests, peak) == (2, 1)
+
+
+def test_serve_bad_requests():
+    bootstrap()
+
+    async def scenario(server, port):
+        return [
+            await request(port, "GET", "/unknown"),
+            await request(port, "POST", "/review", ["not", "an", "object"]),
+            await request(port, "POST", "/ask", {}),
+            await request(port, "POST", "/review", {"refs": "a..b", "what": "c"}),
+        ]
+
+    responses = run_with_server(scenario)
+    assert [status for status, _ in responses] == [404, 400, 400, 400]
+    assert responses[2][1] == {"error": "Missing question"}
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from gito.bootstrap import bootstrap
+from gito.constants import JSON_REPORT_FILE_NAME, PARTIAL_REPORT_FILE_NAME
+from gito.core import review
+from gito.report_struct import PartialReport, ProcessingWarning, ReviewTarget
+
+
+def test_partial_report(tmp_path):
+    file_name = tmp_path / "partial.jsonl"
+    with PartialReport(file_name) as partial_report:
+        partial_report.add_file("a.py", [{"title": "Bug"}])
+        partial_report.add_file("b.py", [], [ProcessingWarning(message="Failed", file="b.py")])
+        # Written records are available before the review completes
+        assert len(PartialReport.load(file_name)) == 2
+    with open(file_name, "a", encoding="utf-8") as f:
+        f.write('{"file": "c.py", "iss')  # interrupted write
+    assert PartialReport.load(file_name) == [
+        {"file": "a.py", "issues": [{"title": "Bug"}], "processing_warnings": []},
+        {
+            "file": "b.py",
+            "issues": [],
+            "processing_warnings": [{"message": "Failed", "file": "b.py"}],
+        },
+    ]
+    partial_report.remove()
+    assert not file_name.exists()
+
+
+@pytest.fixture
+def repo(make_repo, commit_files):
+    repo = make_repo()
+    commit_files(repo, {"fast.py": "a = 1\n", "slow.py": "b = 1\n"}, "add files")
+    return repo
+
+
+input_step_started = threading.Event()
+pipeline_step_calls = {}
+
+
+def input_step(report, **kwargs):
+    input_step_started.set()
+    pipeline_step_calls["input_step"] = report.total_issues
+    return {"input_data": True}
+
+
+def result_step(report, pipeline_out, **kwargs):
+    pipeline_step_calls["result_step"] = (report.total_issues, pipeline_out.get("input_data"))
+    return {"result_data": True}
+
+
+async def slow_input_step(**kwargs):
+    try:
+        await asyncio.sleep(60)
+    except asyncio.CancelledError:
+        pipeline_step_calls["slow_input_step"] = "cancelled"
+        raise
+
+
+def run_review(
+    repo, out_folder, fake_llm, slow_file_delay=0.0, timeout=None, wait_for_input_step=False
+):
+    async def llm_parallel(prompts, **kwargs):
+        if "slow.py" in str(prompts[0]):
+            await asyncio.sleep(slow_file_delay)
+            if wait_for_input_step:
+                # Completes only if the input-only step runs while the LLM requests are in flight
+                assert await asyncio.to_thread(input_step_started.wait, 10)
+        issue = {
+            "title": "Issue",
+            "severity": 1,
+            "confidence": 1,
+            "affected_lines": [{"start_line": 1, "end_line": 1}],
+        }
+        return [[issue]]
+
+    fake_llm(llm_parallel)
+
+    target = ReviewTarget(what="HEAD", against="HEAD~1", use_merge_base=False, filters="")
+
+    async def main():
+        try:
+            await asyncio.wait_for(review(target=target, repo=repo, out_folder=out_folder), timeout)
+        finally:
+            # Tasks left running by the review (checked before asyncio.run() cancels them)
+            pipeline_step_calls["leftover_tasks"] = len(asyncio.all_tasks()) - 1
+
+    asyncio.run(main())
+
+
+def test_partial_report_survives_interrupted_review(repo, tmp_path, fake_llm):
+    bootstrap()
+    out = tmp_path / "out"
+    with pytest.raises(asyncio.TimeoutError):
+        run_review(repo, out, fake_llm, slow_file_delay=60, timeout=1)
+    records = PartialReport.load(out / PARTIAL_REPORT_FILE_NAME)
+    assert [r["file"] for r in records] == ["fast.py"]
+    assert records[0]["issues"][0]["affected_lines"][0]["affected_code"] == "1: a = 1"
+    assert not (out / JSON_REPORT_FILE_NAME).exists()
+
+
+def test_partial_report_removed_after_review(repo, tmp_path, fake_llm):
+    bootstrap()
+    out = tmp_path / "out"
+    run_review(repo, out, fake_llm)
+    assert (out / JSON_REPORT_FILE_NAME).exists()
+    assert not (out / PARTIAL_REPORT_FILE_NAME).exists()
+
+
+def test_review_deadline(repo, tmp_path, fake_llm):
+    bootstrap()
+    out = tmp_path / "out"
+    config_file = Path(repo.working_tree_dir) / ".gito" / "config.toml"
+    config_file.write_text("review_cache = false\nreview_deadline = 0.5\n")
+    run_review(repo, out, fake_llm, slow_file_delay=60, timeout=30)
+    report = json.loads((out / JSON_REPORT_FILE_NAME).read_text())
+    assert list(report["issues"]) == ["fast.py"]
+    assert report["processing_warnings"] == [
+        {
+            "message": "File slow.py was skipped due to error: "
+            "[TimeoutError] review deadline of 0.5s exceeded.",
+            "file": "slow.py",
+        }
+    ]
+    assert report["stats"]["deadline_exceeded_requests"] == 1
+
+
+def test_input_only_pipeline_steps_overlap_llm_requests(repo, tmp_path, fake_llm):
+    bootstrap()
+    config_file = Path(repo.working_tree_dir) / ".gito" / "config.toml"
+    config_file.write_text(
+        "review_cache = false\n"
+        "[pipeline_steps.jira]\nenabled = false\n"
+        "[pipeline_steps.linear]\nenabled = false\n"
+        "[pipeline_steps.input]\n"
+        'call = "test_streaming_review.input_step"\ninput_only = true\n'
+        "[pipeline_steps.result]\n"
+        'call = "test_streaming_review.result_step"\n'
+    )
+    input_step_started.clear()
+    pipeline_step_calls.clear()
+    run_review(repo, tmp_path / "out", fake_llm, timeout=30, wait_for_input_step=True)
+    # The input-only step runs before the issues are registered,
+    # the other steps see the issues and the outputs of the input-only steps
+    assert pipeline_step_calls == {
+        "input_step": 0,
+        "result_step": (2, True),
+        "leftover_tasks": 0,
+    }
+
+
+def test_input_only_pipeline_steps_are_cancelled_with_review(repo, tmp_path, fake_llm):
+    bootstrap()
+    config_file = Path(repo.working_tree_dir) / ".gito" / "config.toml"
+    config_file.write_text(
+        "review_cache = false\n"
+        "[pipeline_steps.jira]\nenabled = false\n"
+        "[pipeline_steps.linear]\nenabled = false\n"
+        "[pipeline_steps.input]\n"
+        'call = "test_streaming_review.slow_input_step"\ninput_only = true\n'
+    )
+    pipeline_step_calls.clear()
+    with pytest.raises(asyncio.TimeoutError):
+        run_review(repo, tmp_path / "out", fake_llm, slow_file_delay=60, timeout=1)
+    assert pipeline_step_calls == {"slow_input_step": "cancelled", "leftover_tasks": 0}
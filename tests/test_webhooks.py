@@ -0,0 +1,161 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from gito.bootstrap import bootstrap
+from gito.job_queue import JobQueue, JobStatus
+from gito.server import ReviewServer
+from gito.utils.git_platform.platform_types import PlatformType
+from gito.webhooks import (
+    PullRequestEvent,
+    WebhookReceiver,
+    clone_env,
+    parse_github_event,
+    parse_gitlab_event,
+    verify_github_signature,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "webhooks"
+GITHUB_HEADERS = {"x-github-event": "pull_request"}
+GITLAB_HEADERS = {"x-gitlab-event": "Merge Request Hook"}
+
+
+def load_payload(name: str) -> dict:
+    return json.loads((FIXTURES / name).read_text())
+
+
+def test_parse_events():
+    payload = load_payload("github-pull-request-synchronize.json")
+    event = parse_github_event(GITHUB_HEADERS, payload)
+    assert event.key == "GitHub:octo-org/octo-repo#12"
+    assert (event.head_sha, event.base_ref) == ("2" * 40, "main")
+    assert parse_github_event({"x-github-event": "push"}, payload) is None
+    assert parse_github_event(GITHUB_HEADERS, payload | {"action": "closed"}) is None
+
+    payload = load_payload("gitlab-merge-request-update.json")
+    event = parse_gitlab_event(GITLAB_HEADERS, payload)
+    assert event.key == "GitLab:group/example#7"
+    assert (event.project_id, event.base_url) == ("42", "https://gitlab.example.com")
+    # Title changes etc. don't require a new review
+    attrs = payload["object_attributes"] | {"oldrev": None}
+    assert parse_gitlab_event(GITLAB_HEADERS, payload | {"object_attributes": attrs}) is None
+
+
+def test_webhook_verification(tmp_path):
+    body = json.dumps(load_payload("github-pull-request-synchronize.json")).encode()
+    signature = "sha256=" + hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+    assert verify_github_signature("secret", body, signature)
+    assert not verify_github_signature("secret", body + b" ", signature)
+
+    receiver = WebhookReceiver(JobQueue(tmp_path / "jobs.db"), secret="secret")
+    assert receiver.receive(PlatformType.GITHUB, GITHUB_HEADERS, body)[0] == 401
+    status, response = receiver.receive(
+        PlatformType.GITHUB, GITHUB_HEADERS | {"x-hub-signature-256": signature}, body
+    )
+    assert (status, response["status"]) == (202, "queued")
+    status, response = receiver.receive(
+        PlatformType.GITLAB,
+        GITLAB_HEADERS | {"x-gitlab-token": "secret"},
+        (FIXTURES / "gitlab-merge-request-update.json").read_bytes(),
+    )
+    assert (status, response["status"]) == (202, "queued")
+    receiver.queue.close()
+
+
+def test_webhook_secret_is_required(tmp_path, monkeypatch):
+    monkeypatch.delenv("GITO_WEBHOOK_SECRET", raising=False)
+    queue = JobQueue(tmp_path / "jobs.db")
+    with pytest.raises(ValueError, match="secret is required"):
+        WebhookReceiver(queue, secret="")
+    queue.close()
+
+
+def test_token_is_sent_only_to_platform_host(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "gh-token")
+    monkeypatch.delenv("GITHUB_SERVER_URL", raising=False)
+    monkeypatch.setenv("GITLAB_TOKEN", "gl-token")
+    monkeypatch.setenv("CI_SERVER_HOST", "gitlab.example.com")
+    event = parse_github_event(
+        GITHUB_HEADERS, load_payload("github-pull-request-synchronize.json")
+    )
+
+    def header(url: str, platform: PlatformType = PlatformType.GITHUB) -> str | None:
+        env = clone_env(PullRequestEvent(**vars(event) | {"clone_url": url, "platform": platform}))
+        return env.get("GIT_CONFIG_VALUE_0")
+
+    assert header("https://github.com/octo-org/octo-repo.git") == (
+        "Authorization: Basic " + base64.b64encode(b"x-access-token:gh-token").decode()
+    )
+    assert header("https://evil.example.com/octo-org/octo-repo.git") is None
+    assert header("https://github.com.evil.example.com/repo.git") is None
+    assert header("http://github.com/octo-org/octo-repo.git") is None
+    assert header("https://gitlab.example.com/group/example.git", PlatformType.GITLAB) == (
+        "Authorization: Basic " + base64.b64encode(b"oauth2:gl-token").decode()
+    )
+    assert header("https://gitlab.com/group/example.git", PlatformType.GITLAB) is None
+
+
+@pytest.fixture
+def remote(tmp_path, make_repo, commit_files):
+    """Stand-in of the GitHub repository with the pull request head outside of branches."""
+    repo = make_repo(tmp_path / "remote")
+    heads = [commit_files(repo, {"a.py": f"a = {i}\n"}, f"a = {i}").hexsha for i in range(2)]
+    repo.create_head("feature", heads[0])
+    repo.create_head("pr-head", heads[1])
+    repo.git.update_ref("refs/pull/12/head", heads[1])
+    repo.git.reset("--hard", "HEAD~2")
+    repo.delete_head("pr-head", force=True)
+    return repo, heads
+
+
+def test_superseded_review_is_cancelled(remote, tmp_path, fake_llm):
+    bootstrap()
+    repo, heads = remote
+    queue = JobQueue(tmp_path / "jobs.db")
+    posted = []
+
+    def delivery(sha: str) -> tuple[bytes, dict[str, str]]:
+        payload = load_payload("github-pull-request-synchronize.json")
+        payload["pull_request"]["head"]["sha"] = sha
+        payload["repository"]["clone_url"] = repo.working_tree_dir
+        body = json.dumps(payload).encode()
+        signature = "sha256=" + hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+        return body, GITHUB_HEADERS | {"x-hub-signature-256": signature}
+
+    first_review_started = asyncio.Event()
+
+    async def llm_parallel(prompts, **kwargs):
+        if not first_review_started.is_set():
+            first_review_started.set()
+            await asyncio.sleep(3600)
+        return [[] for _ in prompts]
+
+    async def main():
+        receiver = WebhookReceiver(queue, workers=1, secret="secret")
+        server = ReviewServer(webhooks=receiver)
+        workers = asyncio.create_task(receiver.run())
+        status, first = await server.handle("POST", "/webhook/github", *delivery(heads[0]))
+        await asyncio.wait_for(first_review_started.wait(), 30)
+        status, second = await server.handle("POST", "/webhook/github", *delivery(heads[1]))
+        assert status == 202 and json.loads(second)["superseded"] == [json.loads(first)["job_id"]]
+        second_id = json.loads(second)["job_id"]
+        while queue.get(second_id).status == JobStatus.QUEUED or receiver.running:
+            await asyncio.sleep(0.05)
+        workers.cancel()
+        return json.loads(first)["job_id"], second_id
+
+    fake_llm(llm_parallel)
+    with patch(
+        "gito.webhooks.post_review_comment", side_effect=lambda e, folder: posted.append(e)
+    ):
+        first_id, second_id = asyncio.run(main())
+    assert queue.get(first_id).status == JobStatus.SUPERSEDED
+    assert queue.get(second_id).status == JobStatus.DONE, queue.get(second_id).error
+    assert [(e.number, e.head_sha) for e in posted] == [(12, heads[1])]
+    queue.close()